@@ -0,0 +1,57 @@
+# assets.py - obrazki GUI (logo, flagi) przeskalowane raz i trzymane w cache jako PNG
+import os
+import sys
+import logging
+import tkinter as tk
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "asset_cache"
+
+
+def resource_path(relative_path: str) -> str:
+    """Plik dołączony do EXE (PyInstaller _MEIPASS) albo z bieżącego katalogu"""
+    base_path = getattr(sys, '_MEIPASS', os.path.abspath("."))
+    return os.path.join(base_path, relative_path)
+
+
+def _cache_path(source: str, size: Tuple[int, int]) -> str:
+    # Klucz z rozmiaru pliku, nie z mtime - w EXE onefile pliki są rozpakowywane
+    # przy każdym starcie, więc ich mtime zawsze jest nowy
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(CACHE_DIR, f"{name}_{size[0]}x{size[1]}_{os.path.getsize(source)}.png")
+
+
+def load_image(relative_path: str, size: Tuple[int, int]) -> Optional[tk.PhotoImage]:
+    """
+    Obrazek w zadanym rozmiarze jako PhotoImage.
+    Z cache: natywny odczyt PNG przez Tk, bez importu PIL.
+    Przy braku cache (pierwsze uruchomienie, nowy plik): PIL skaluje i zapisuje PNG do cache.
+    """
+    source = resource_path(relative_path)
+    try:
+        cached = _cache_path(source, size)
+    except OSError as e:
+        logger.warning(f"Brak pliku {relative_path}: {e}")
+        return None
+
+    if os.path.exists(cached):
+        try:
+            return tk.PhotoImage(file=cached)
+        except tk.TclError as e:
+            logger.warning(f"Uszkodzony cache {cached}, generuję ponownie: {e}")
+
+    try:
+        from PIL import Image, ImageTk
+
+        image = Image.open(source).convert("RGBA").resize(size, Image.LANCZOS)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            image.save(cached, "PNG")
+        except OSError as e:
+            logger.warning(f"Nie można zapisać cache {cached}: {e}")
+        return ImageTk.PhotoImage(image)
+    except Exception as e:
+        logger.warning(f"Nie można załadować obrazka {relative_path}: {e}")
+        return None
@@ -0,0 +1,306 @@
+# async_interface.py - asynchroniczny interfejs PM125 (wiele testerów z jednej pętli asyncio)
+import asyncio
+import os
+import time
+from typing import Optional, List, Dict, Callable, Awaitable
+
+from hardware_interface import (
+    DEFAULT_CONSOLE_PATH, ConsoleTransport, _popen_kwargs, parse_measurements, parse_serials,
+    parse_connection_status
+)
+
+
+class AsyncConsoleSession:
+    """Stały proces USBPDConsole sterowany z asyncio (protokół jak ConsoleSession)"""
+
+    def __init__(self, console_path: str, device_serial: str,
+                 session_args: List[str] = None, terminator: str = "END"):
+        self.console_path = console_path
+        self.device_serial = device_serial
+        self.session_args = list(session_args) if session_args is not None else ['-i']
+        self.terminator = terminator
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> bool:
+        await self.close()
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                self.console_path, '-d', self.device_serial, *self.session_args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                **_popen_kwargs()
+            )
+            return True
+        except Exception as e:
+            print(f"Błąd uruchamiania sesji konsoli: {e}")
+            self.process = None
+            return False
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def execute(self, args: List[str], timeout: float = 5) -> Optional[str]:
+        """Wyślij komendę i czekaj na terminator; timeout/anulowanie zamyka sesję"""
+        async with self._lock:
+            if not self.is_alive() and not await self.start():
+                return None
+            try:
+                return await asyncio.wait_for(self._exchange(args), timeout)
+            except asyncio.TimeoutError:
+                print(f"Timeout sesji konsoli: {' '.join(args)}")
+                await self.close()
+                return None
+            except asyncio.CancelledError:
+                # odpowiedź na przerwaną komendę rozsynchronizowałaby sesję
+                await self.close()
+                raise
+            except Exception as e:
+                print(f"Błąd sesji konsoli: {e}")
+                await self.close()
+                return None
+
+    async def _exchange(self, args: List[str]) -> Optional[str]:
+        self.process.stdin.write((' '.join(args) + '\n').encode())
+        await self.process.stdin.drain()
+
+        output_lines = []
+        while True:
+            raw = await self.process.stdout.readline()
+            if not raw:
+                print("Sesja konsoli zakończyła się nieoczekiwanie")
+                await self.close()
+                return None
+
+            line = raw.decode(errors='replace').rstrip('\r\n')
+            if line == self.terminator or line.startswith(self.terminator + ' '):
+                code = line[len(self.terminator):].strip()
+                if code and code != '0':
+                    print(f"Błąd komendy w sesji (kod {code}): {' '.join(output_lines)}")
+                    return None
+                return '\n'.join(output_lines).strip()
+
+            output_lines.append(line)
+
+    async def close(self):
+        process, self.process = self.process, None
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.stdin.close()
+            await asyncio.wait_for(process.wait(), 1)
+        except Exception:
+            process.kill()
+            await process.wait()
+
+
+class AsyncPM125Interface:
+    """
+    Asynchroniczny odpowiednik PM125Interface na asyncio.create_subprocess_exec.
+    Tworzenie: device = await AsyncPM125Interface.create(console_path, serial)
+    """
+
+    # jak w ConsoleTransport: po tylu padnięciach sesji z rzędu tylko per_call
+    SESSION_MAX_FAILURES = ConsoleTransport.SESSION_MAX_FAILURES
+
+    def __init__(self, console_path: str = None, device_serial: str = None,
+                 console_mode: str = "per_call", session_args: List[str] = None,
+                 session_terminator: str = "END", command_timeout: float = 5):
+        if console_path is None:
+            console_path = DEFAULT_CONSOLE_PATH
+
+        if not os.path.exists(console_path):
+            raise FileNotFoundError(f"Nie znaleziono USBPDConsole.exe: {console_path}")
+
+        if console_mode not in ("per_call", "session"):
+            raise ValueError(f"Nieznany tryb konsoli: {console_mode}")
+
+        self.console_path = console_path
+        self.device_serial = device_serial if device_serial else "Any"
+        self.command_timeout = command_timeout
+        self.connected = False
+        self.current_profile = None
+        self.session: Optional[AsyncConsoleSession] = None
+        self._session_failures = 0
+        if console_mode == "session":
+            self.session = AsyncConsoleSession(console_path, self.device_serial,
+                                               session_args=session_args, terminator=session_terminator)
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncPM125Interface":
+        """Utwórz i połącz (ConnectionError jeśli tester nie odpowiada)"""
+        device = cls(*args, **kwargs)
+        await device.connect()
+        return device
+
+    @classmethod
+    async def from_config(cls, config, device_serial: str = None) -> "AsyncPM125Interface":
+        return await cls.create(console_path=config.console_path,
+                                device_serial=device_serial or config.device_serial,
+                                console_mode=config.console_mode,
+                                session_args=config.console_session_args,
+                                session_terminator=config.console_session_terminator)
+
+    async def connect(self):
+        if self.session is not None and not await self.session.start():
+            print("⚠ Sesja konsoli niedostępna - tryb per_call")
+            self.session = None
+
+        status = await self.get_connection_status()
+        if not status.get('connected'):
+            await self._close_session()
+            raise ConnectionError(f"Nie można połączyć z PM125 ({self.device_serial})")
+        self.connected = True
+
+    async def _run_command(self, *args, timeout: float = None) -> Optional[str]:
+        """Komenda konsoli; anulowanie taska zabija proces konsoli"""
+        timeout = self.command_timeout if timeout is None else timeout
+
+        if self.session is not None:
+            output = await self.session.execute(list(args), timeout=timeout)
+            if output is not None or self.session.is_alive():
+                self._session_failures = 0
+                return output
+            self._session_failures += 1
+            if self._session_failures >= self.SESSION_MAX_FAILURES:
+                # konsola nie obsługuje sesji - bez podwójnego procesu na każdą komendę
+                print(f"⚠ Sesja konsoli padła {self._session_failures} razy z rzędu - "
+                      f"dalej tylko tryb per_call")
+                await self.session.close()
+                self.session = None
+            else:
+                print(f"⚠ Sesja konsoli niedostępna - fallback per_call: {' '.join(args)}")
+
+        return await self._run_command_once(*args, timeout=timeout)
+
+    async def _run_command_once(self, *args, timeout: float) -> Optional[str]:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self.console_path, '-d', self.device_serial, *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **_popen_kwargs()
+            )
+        except Exception as e:
+            print(f"Błąd wykonania komendy: {e}")
+            return None
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            print(f"Timeout wykonania komendy: {' '.join(args)}")
+            process.kill()
+            await process.wait()
+            return None
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+        if process.returncode == 0:
+            return stdout.decode(errors='replace').strip()
+
+        error_msg = stderr.decode(errors='replace').strip() if stderr else "Unknown error"
+        print(f"Błąd komendy (return code {process.returncode}): {error_msg}")
+        return None
+
+    async def _close_session(self):
+        if self.session is not None:
+            await self.session.close()
+
+    async def disconnect(self):
+        """Rozłącz urządzenie (ustaw obciążenie na 0)"""
+        if self.connected:
+            await self.set_load(0)
+            self.connected = False
+        await self._close_session()
+
+    async def set_profile(self, profile_index: int, settle_delay: float = 0.5) -> bool:
+        if await self._run_command('-v', str(profile_index)) is None:
+            print(f"✗ Nie udało się ustawić profilu #{profile_index}")
+            return False
+        self.current_profile = profile_index
+        if settle_delay > 0:
+            await asyncio.sleep(settle_delay)
+        return True
+
+    async def set_load(self, current_ma: int, instant: bool = True) -> bool:
+        if not 0 <= current_ma <= 5000:
+            print(f"✗ Prąd {current_ma}mA poza zakresem 0-5000mA")
+            return False
+
+        output = await self._run_command('-q' if instant else '-l', str(current_ma))
+        if output is None:
+            return False
+        await asyncio.sleep(0.05 if instant else 0.1)
+        return True
+
+    async def read_measurements(self) -> Optional[Dict[str, float]]:
+        output = await self._run_command('-s')
+        if not output:
+            return None
+        return parse_measurements(output)
+
+    async def get_device_info(self) -> Dict[str, str]:
+        info = {'serial': self.device_serial}
+        output = await self._run_command('-r')
+        if output:
+            info['config'] = output
+            serials = parse_serials(output)
+            if serials:
+                info['serial'] = serials[0]
+        return info
+
+    async def get_connection_status(self) -> Dict[str, any]:
+        output = await self._run_command('-c')
+        if not output:
+            return {'connected': False}
+        return parse_connection_status(output)
+
+    async def find_all_devices(self) -> List[str]:
+        output = await self._run_command('-f')
+        return parse_serials(output) if output else []
+
+
+async def poll_devices(devices: List[AsyncPM125Interface], interval: float,
+                       callback: Callable[[str, float, Optional[Dict[str, float]]], Optional[Awaitable]],
+                       duration: float = None, stop_event: asyncio.Event = None):
+    """
+    Odczytuj wszystkie testery równolegle w stałym rytmie (siatka time.monotonic()).
+    callback(serial, t, measurements) - measurements None przy błędzie/timeout.
+    Każdy tester ma własny task na wspólnej siatce: zawieszony odczyt (do command_timeout)
+    pomija zaległe sloty tylko tego testera, pozostałe trzymają rytm.
+    """
+    start = time.monotonic()
+
+    async def poll_one(device: AsyncPM125Interface):
+        slot = 0
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                break
+            t = time.monotonic() - start
+            if duration is not None and t >= duration:
+                break
+
+            measurements = await device.read_measurements()
+            ret = callback(device.device_serial, t, measurements)
+            if asyncio.iscoroutine(ret):
+                await ret
+
+            next_slot = max(slot + 1, int((time.monotonic() - start) / interval) + 1)
+            if next_slot > slot + 1:
+                print(f"⚠ {device.device_serial}: odczyt dłuższy niż interwał - "
+                      f"pominięto {next_slot - slot - 1} slot(y)")
+            slot = next_slot
+            delay = start + slot * interval - time.monotonic()
+            if delay > 0:
+                if stop_event is not None:
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await asyncio.sleep(delay)
+
+    await asyncio.gather(*(poll_one(device) for device in devices))
@@ -0,0 +1,121 @@
+# batch_runner.py - testy bez GUI (burn-in, linie automatyczne); bez importu tkinter/PIL
+import argparse
+import contextlib
+import json
+import os
+import logging
+import sys
+import time
+from typing import Iterator, List, TextIO
+
+from config import TestConfig
+from database import create_database
+from hardware_interface import PM125Interface
+from test_runner import TestRunner
+
+logger = logging.getLogger(__name__)
+
+
+def read_serials(stream: TextIO) -> Iterator[str]:
+    """Numery seryjne po jednym w linii (plik albo skaner na stdin); puste i '#...' pomijane"""
+    for line in stream:
+        serial = line.strip().upper()
+        if serial and not serial.startswith('#'):
+            yield serial
+
+
+def emit(event: str, **fields):
+    """Jedna linia JSON na stdout - postęp dla automatu"""
+    print(json.dumps({'event': event, 'time': time.strftime("%Y-%m-%d %H:%M:%S"), **fields},
+                     ensure_ascii=False), flush=True)
+
+
+def run_batch(config: TestConfig, hrid: str, serials: Iterator[str], repeat: int = 1,
+              runner_output: TextIO = None) -> dict:
+    """
+    Testuj jednostki po kolei na jednym testerze i zapisuj wyniki przez create_database(config).
+    Wyjście TestRunner trafia do runner_output (domyślnie stderr), stdout zostaje dla JSON.
+    """
+    runner_output = runner_output if runner_output is not None else sys.stderr
+    totals = {'total': 0, 'pass': 0, 'fail': 0, 'save_errors': 0}
+
+    with contextlib.redirect_stdout(runner_output):
+        hardware = PM125Interface.from_config(config)
+        # device_serial to "Any", gdy w konfiguracji nie ma numeru - faktyczny z urządzenia
+        device = hardware.get_device_info().get('serial', hardware.device_serial)
+
+    database = None
+    try:
+        database = create_database(config)
+        runner = TestRunner(config, hardware)
+        emit('connected', device=device, hrid=hrid)
+
+        for serial in serials:
+            for attempt in range(1, repeat + 1):
+                emit('start', serial=serial, attempt=attempt)
+                with contextlib.redirect_stdout(runner_output):
+                    result = runner.run_full_test(hrid=hrid, serial_number=serial)
+                # Ctrl-C w trakcie jednostki łapie TestRunner - bez zapisu i bez liczenia do limitu prób
+                if result.final_status == "CANCELLED":
+                    raise KeyboardInterrupt
+                with contextlib.redirect_stdout(runner_output):
+                    saved = database.save_result(result)
+
+                totals['total'] += 1
+                totals['pass' if result.final_status == "PASS" else 'fail'] += 1
+                totals['save_errors'] += not saved
+                emit('result', serial=serial, attempt=attempt, status=result.final_status,
+                     duration=round(result.test_duration, 2), saved=saved,
+                     profiles={name: r.status for name, r in result.profile_results.items()},
+                     cycle={name: round(seconds, 3) for name, seconds in result.cycle_profile.items()})
+    except KeyboardInterrupt:
+        emit('interrupted')
+    finally:
+        with contextlib.redirect_stdout(runner_output):
+            hardware.disconnect()
+        if database is not None:
+            database.close()
+
+    emit('summary', **totals)
+    return totals
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Testy PM125 bez GUI - wyniki jako JSON lines na stdout")
+    parser.add_argument('--hrid', required=True, help="HRID operatora/stanowiska zapisywany w raporcie")
+    parser.add_argument('--serials', default='-',
+                        help="plik z numerami seryjnymi, po jednym w linii ('-' = stdin/skaner)")
+    parser.add_argument('--config', default="test_config.json")
+    parser.add_argument('--transport', choices=['console', 'api', 'sim'], default=None,
+                        help="nadpisz config.transport (sim = bez sprzętu)")
+    parser.add_argument('--repeat', type=int, default=1, help="powtórzenia każdej jednostki (burn-in)")
+    parser.add_argument('--quiet', action='store_true', help="bez wyjścia TestRunner na stderr")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr,
+                        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+
+    with contextlib.redirect_stdout(sys.stderr):
+        config = TestConfig.load(args.config)
+    if args.transport:
+        config.transport = args.transport
+
+    runner_output = open(os.devnull, 'w') if args.quiet else sys.stderr
+    try:
+        if args.serials == '-':
+            totals = run_batch(config, args.hrid, read_serials(sys.stdin), args.repeat, runner_output)
+        else:
+            with open(args.serials, 'r', encoding='utf-8') as f:
+                totals = run_batch(config, args.hrid, read_serials(f), args.repeat, runner_output)
+    except ConnectionError as e:
+        emit('error', message=str(e))
+        return 2
+    finally:
+        if args.quiet:
+            runner_output.close()
+
+    return 0 if totals['fail'] == 0 and totals['save_errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
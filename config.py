@@ -36,6 +36,21 @@ class VoltageProfile:
 class TestConfig:
     console_path: str = r"C:\Users\kacper.urbanowicz\Downloads\USBPDAPI_1.0.1016 (1)\USBPDConsole Release\USBPDConsole.exe"
     device_serial: str = None
+    fixture_serials: List[str] = field(default_factory=list)  # kilka PM125 równolegle (FixturePool)
+
+    # "per_call" = nowy proces USBPDConsole na każdą komendę (stary tryb)
+    # "session"  = jeden długo żyjący proces, urządzenie otwarte między komendami
+    #              (ZAŁOŻONY protokół stdin: komenda na linię, odpowiedź zakończona "END";
+    #              jeśli konsola go nie obsługuje, po 3 nieudanych sesjach zostaje per_call)
+    console_mode: str = "per_call"
+    console_session_args: List[str] = field(default_factory=lambda: ['-i'])
+    console_session_terminator: str = "END"
+
+    # "console" = USBPDConsole.exe, "api" = USBPDAPI w procesie (ctypes), "sim" = symulator
+    # "api" ma zastępcze ABI (tylko atrapa stubs/usbpdapi_stub.c) - patrz usbpd_api.py
+    transport: str = "console"
+    api_library_path: str = None   # None = USBPDAPI.dll obok USBPDConsole.exe
+    simulator_settings: Dict[str, Any] = field(default_factory=dict)  # pola SimulatorSettings
 
     profiles: List[dict] = field(default_factory=lambda: [
         {
@@ -81,8 +96,55 @@ class TestConfig:
     ])
 
     measurement_interval: float = 0.05
+
+    # "fixed" = stałe sleep'y jak dotąd (domyślnie - bez zmiany czasów PASS/FAIL po aktualizacji),
+    # "adaptive" = czekaj aż napięcie się ustali (max settle_max_wait). Włączenie: "settle_mode": "adaptive"
+    # w test_config.json, dopiero po porównaniu wyników obu trybów na stanowisku z prawdziwym testerem.
+    settle_mode: str = "fixed"
+    settle_band_v: float = 0.05         # max rozrzut ostatnich odczytów [V]
+    settle_stable_samples: int = 3      # ile kolejnych odczytów musi się zmieścić w paśmie
+    settle_max_wait: float = 1.0        # [s]
+    settle_poll_interval: float = 0.02  # [s]
+
+    # Reakcja na pierwszą próbkę poza zakresem:
+    # "off" = test do końca (diagnostyka), "profile" = przerwij profil, "unit" = przerwij cały test
+    fail_fast: str = "off"
     max_csv_rows: int = 1_000_000
 
+    # Magazyn wyników: "csv" (raport Excel), "sqlite" albo "csv+sqlite" (oba)
+    results_backend: str = "csv"
+    sqlite_path: str = "wyniki_testow.db"
+    # Wyniki najpierw do lokalnego dziennika, do CSV w tle (Excel nie blokuje testu)
+    csv_journal: bool = True
+    # Surowe próbki każdej jednostki (float32) do analizy awarii; None = wyłączone
+    waveform_archive_dir: str = "waveforms"
+    # Trwały licznik testów per numer seryjny (limit 2 prób przetrwa wylogowanie i restart);
+    # "" = licznik tylko w pamięci (limit działa do zamknięcia aplikacji)
+    serial_index_path: str = "serial_index.json"
+
+    # SPC: liczność podgrupy karty X-średnie/R i liczba podgrup do wyznaczenia granic
+    spc_subgroup_size: int = 5
+    spc_baseline_subgroups: int = 20
+    # Stan kart SPC między uruchomieniami (bez niego baza 20 podgrup od zera w każdej sesji)
+    spc_state_path: str = "spc_state.json"
+
+    # Budżet czasu startu GUI [s] - przekroczenie jest logowane z podziałem na fazy
+    startup_budget: float = 1.0
+
+    # Połączenie z testerem w tle: ponawianie co reconnect_interval (podwajane do max)
+    # i sprawdzanie połączenia co connection_check_interval, gdy nic nie jest testowane [s]
+    reconnect_interval: float = 2.0
+    reconnect_max_interval: float = 30.0
+    connection_check_interval: float = 10.0
+
+    # Poziomy logowania per grupa modułów (log_setup.LOG_GROUPS); "root" = pozostałe biblioteki
+    log_levels: Dict[str, str] = field(default_factory=lambda: {
+        "root": "INFO", "hardware": "DEBUG", "runner": "DEBUG", "database": "DEBUG", "gui": "DEBUG"
+    })
+    # Rotacja psu19_log.txt po rozmiarze; starsze segmenty kompresowane do .gz
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 10
+
     valid_hrids: List[str] = field(default_factory=lambda: [
         "44963", "12100667", "81705", "45216", "45061", "12100171",
         "12100741", "81560", "81563", "81564", "45233", "12101333",
@@ -117,9 +179,28 @@ class TestConfig:
         errors = []
         import os
 
-        if not os.path.exists(self.console_path):
+        if self.transport not in ("console", "api", "sim"):
+            errors.append(f"Nieznany transport: {self.transport}")
+
+        if self.transport == "console" and not os.path.exists(self.console_path):
             errors.append(f"USBPDConsole.exe nie istnieje: {self.console_path}")
 
+        if self.console_mode not in ("per_call", "session"):
+            errors.append(f"Nieznany tryb konsoli: {self.console_mode}")
+
+        if self.settle_mode not in ("adaptive", "fixed"):
+            errors.append(f"Nieznany tryb stabilizacji: {self.settle_mode}")
+
+        if self.fail_fast not in ("off", "profile", "unit"):
+            errors.append(f"Nieznany tryb fail-fast: {self.fail_fast}")
+
+        if self.results_backend not in ("csv", "sqlite", "csv+sqlite"):
+            errors.append(f"Nieznany magazyn wyników: {self.results_backend}")
+
+        for group, level in self.log_levels.items():
+            if level not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+                errors.append(f"Nieznany poziom logowania {group}: {level}")
+
         if not self.profiles:
             errors.append("Brak profili")
 
@@ -0,0 +1,81 @@
+# cycle_profiler.py - rozkład czasu cyklu jednostki na fazy (przełączanie, stabilizacja, próbkowanie...)
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+class CycleProfiler:
+    """
+    Sumuje czas spędzony w nazwanych fazach jednego cyklu (perf_counter).
+    Czas poza fazami trafia do 'other', więc suma zgadza się z 'total'.
+
+        profiler = CycleProfiler()
+        with profiler.phase('sampling'):
+            ...
+        profiler.breakdown()  # {'sampling': 2.5, 'other': 0.01, 'total': 2.51}
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def breakdown(self) -> Dict[str, float]:
+        total = time.perf_counter() - self.start
+        result = dict(self.phases)
+        result['other'] = max(0.0, total - sum(self.phases.values()))
+        result['total'] = total
+        return result
+
+
+class CycleHistory:
+    """Rozkłady ostatnich N cykli i średnia per faza"""
+
+    def __init__(self, maxlen: int = 50):
+        self.cycles = deque(maxlen=maxlen)
+
+    def add(self, breakdown: Dict[str, float]):
+        if breakdown:
+            self.cycles.append(breakdown)
+
+    def __len__(self) -> int:
+        return len(self.cycles)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{faza: {'avg': s, 'max': s, 'share': % czasu cyklu}}"""
+        if not self.cycles:
+            return {}
+
+        names: List[str] = []
+        for cycle in self.cycles:
+            names += [name for name in cycle if name not in names]
+
+        avg_total = sum(cycle.get('total', 0.0) for cycle in self.cycles) / len(self.cycles)
+        summary = {}
+        for name in names:
+            values = [cycle.get(name, 0.0) for cycle in self.cycles]
+            avg = sum(values) / len(values)
+            summary[name] = {
+                'avg': avg,
+                'max': max(values),
+                'share': 100.0 * avg / avg_total if avg_total > 0 else 0.0
+            }
+        return summary
+
+    def format_summary(self) -> str:
+        lines = [f"Rozkład czasu cyklu (ostatnie {len(self.cycles)} jednostek):",
+                 f"  {'Faza':<16} {'Średnio[s]':>10} {'Max[s]':>8} {'Udział':>7}"]
+        for name, stats in self.summary().items():
+            lines.append(f"  {name:<16} {stats['avg']:>10.3f} {stats['max']:>8.3f} {stats['share']:>6.1f}%")
+        return "\n".join(lines)
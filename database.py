@@ -1,8 +1,10 @@
 # database.py - WERSJA Z LOGGEREM
 import csv
+import json
 import os
 import time
 import logging
+import threading
 from typing import List
 from datetime import datetime
 
@@ -16,15 +18,77 @@ class CSVDatabase:
         self.max_rows = max_rows
         self.current_index = 1
         self.current_filename = f"{base_filename}_{self.current_index}.csv"
+        self._lock = threading.Lock()
+
+        # Plik pomocniczy z liczbą wierszy - zapis nie musi czytać całego CSV
+        self.meta_filename = f"{base_filename}.meta.json"
+        self._meta = self._load_meta()
+        saved_index = self._meta.get('current_index', 1)
+        if saved_index > 1 and os.path.exists(f"{base_filename}_{saved_index}.csv"):
+            self.current_index = saved_index
+            self.current_filename = f"{base_filename}_{self.current_index}.csv"
 
         while os.path.exists(self.current_filename):
-            row_count = self._count_rows(self.current_filename)
+            row_count = self._cached_row_count(self.current_filename)
             if row_count >= max_rows:
                 self.current_index += 1
                 self.current_filename = f"{base_filename}_{self.current_index}.csv"
             else:
                 break
 
+    def _load_meta(self) -> dict:
+        try:
+            with open(self.meta_filename, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if isinstance(meta, dict) and isinstance(meta.get('files'), dict):
+                return meta
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Uszkodzony plik {self.meta_filename}, liczę wiersze od nowa: {e}")
+        return {'current_index': 1, 'files': {}}
+
+    def _save_meta(self):
+        """Zapis atomowy (plik tymczasowy + replace) - przerwany zapis nie psuje indeksu"""
+        self._meta['current_index'] = self.current_index
+        tmp_filename = self.meta_filename + ".tmp"
+        try:
+            with open(tmp_filename, 'w', encoding='utf-8') as f:
+                json.dump(self._meta, f, indent=1)
+            os.replace(tmp_filename, self.meta_filename)
+        except Exception as e:
+            logger.warning(f"Nie można zapisać {self.meta_filename}: {e}")
+
+    def _update_meta(self, filename: str, rows: int, **extra):
+        """extra (np. journal_offset) trafia do meta w tym samym zapisie co liczba wierszy"""
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return
+        self._meta['files'][os.path.basename(filename)] = {
+            'rows': rows, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns
+        }
+        self._meta.update(extra)
+        self._save_meta()
+
+    def _cached_row_count(self, filename: str) -> int:
+        """
+        Liczba wierszy z pliku meta, jeśli rozmiar i mtime CSV się zgadzają;
+        w przeciwnym razie (np. plik edytowany w Excelu) pełne przeliczenie
+        """
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return 0
+
+        entry = self._meta['files'].get(os.path.basename(filename))
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['rows']
+
+        rows = self._count_rows(filename)
+        self._update_meta(filename, rows)
+        return rows
+
     def _count_rows(self, filename: str) -> int:
         try:
             with open(filename, 'r', encoding='utf-8') as f:
@@ -36,7 +100,8 @@ class CSVDatabase:
             logger.error(f"Błąd liczenia wierszy: {e}")
             return 0
 
-    def _get_headers(self) -> List[str]:
+    @staticmethod
+    def _get_headers() -> List[str]:
         """NAGŁÓWKI BEZ POLSKICH ZNAKÓW"""
         return [
             "Data i godzina",
@@ -64,25 +129,14 @@ class CSVDatabase:
         ]
 
     def save_result(self, test_result, max_retries: int = 3, retry_delay: float = 1.0):
-        """Zapisz wynik testu do CSV z retry"""
-        row_count = self._count_rows(self.current_filename)
-        if row_count >= self.max_rows:
-            self.current_index += 1
-            self.current_filename = f"{self.base_filename}_{self.current_index}.csv"
-
-        file_exists = os.path.exists(self.current_filename)
+        """Zapisz wynik testu do CSV z retry (bezpieczne dla wielu wątków)"""
+        with self._lock:
+            return self._save_result(test_result, max_retries, retry_delay)
 
+    def _save_result(self, test_result, max_retries: int, retry_delay: float):
         for attempt in range(max_retries):
             try:
-                # ŚREDNIK jako delimiter (polski Excel)
-                with open(self.current_filename, 'a', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_MINIMAL)
-
-                    if not file_exists:
-                        writer.writerow(self._get_headers())
-
-                    writer.writerow(test_result.to_csv_row())
-
+                self._append_rows([test_result.to_csv_row()])
                 print(f"✓ Wynik zapisany do: {self.current_filename}")
                 logger.info(f"Wynik zapisany do: {self.current_filename}")
                 return True
@@ -121,6 +175,41 @@ class CSVDatabase:
 
         return False
 
+    def _append_rows(self, rows: List[List[str]], journal_offsets: List[int] = None):
+        """
+        Dopisz wiersze w jednej próbie (z przejściem do kolejnego pliku po max_rows).
+        PermissionError/IOError przekazywane dalej - retry robi wywołujący.
+        journal_offsets[i] = pozycja w dzienniku za wierszem i; zapisywana do meta
+        dopiero po dopisaniu wiersza do CSV.
+        """
+        written = 0
+        while rows:
+            row_count = self._cached_row_count(self.current_filename)
+            if row_count >= self.max_rows:
+                self.current_index += 1
+                self.current_filename = f"{self.base_filename}_{self.current_index}.csv"
+                continue
+
+            file_exists = os.path.exists(self.current_filename)
+            capacity = self.max_rows - row_count - (0 if file_exists else 1)
+            chunk, rows = rows[:max(1, capacity)], rows[max(1, capacity):]
+            written += len(chunk)
+
+            # ŚREDNIK jako delimiter (polski Excel)
+            with open(self.current_filename, 'a', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_MINIMAL)
+
+                if not file_exists:
+                    writer.writerow(self._get_headers())
+
+                writer.writerows(chunk)
+
+            extra = {'journal_offset': journal_offsets[written - 1]} if journal_offsets else {}
+            self._update_meta(self.current_filename, row_count + len(chunk) + (0 if file_exists else 1), **extra)
+
+    def close(self):
+        pass
+
     def _save_to_backup(self, test_result) -> bool:
         """Zapisz do pliku backup gdy główny plik jest zajęty"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -141,3 +230,415 @@ class CSVDatabase:
             print(f"✗ KRYTYCZNY BŁĄD: Nie udało się zapisać nawet do backup: {e}")
             logger.critical(f"KRYTYCZNY BŁĄD zapisu do backup: {e}", exc_info=True)
             return False
+
+
+class JournaledCSVDatabase(CSVDatabase):
+    """
+    CSVDatabase z dziennikiem zapisu: save_result tylko dopisuje wiersz do lokalnego
+    pliku {base}.journal (JSON lines) i wraca od razu, a wątek w tle przenosi
+    dziennik do raportu CSV, gdy plik nie jest zablokowany (Excel).
+    Kolejność wierszy jest zachowana; pozycja scalenia trzymana w pliku meta,
+    więc po restarcie niescalone wpisy są dopisywane automatycznie.
+    """
+
+    def __init__(self, base_filename: str = "raport_testow", max_rows: int = 1_000_000,
+                 merge_interval: float = 2.0):
+        super().__init__(base_filename, max_rows)
+        self.journal_filename = f"{base_filename}.journal"
+        self.merge_interval = merge_interval
+        self.csv_locked = False
+        self._journal_lock = threading.Lock()
+        # cały odczyt dziennika -> dopisanie do CSV -> przesunięcie pozycji jako jedna operacja
+        self._merge_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._merger = threading.Thread(target=self._merge_loop, name="csv-journal-merger", daemon=True)
+        self._merger.start()
+
+    def save_result(self, test_result, max_retries: int = 3, retry_delay: float = 1.0) -> bool:
+        """Przyjmij wynik do dziennika (bez czekania na plik CSV); max_retries/retry_delay ignorowane"""
+        line = json.dumps(test_result.to_csv_row(), ensure_ascii=False) + "\n"
+        try:
+            with self._journal_lock:
+                with open(self.journal_filename, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+        except Exception as e:
+            print(f"✗ Błąd zapisu do dziennika: {e}")
+            logger.error(f"Błąd zapisu do dziennika {self.journal_filename}: {e}", exc_info=True)
+            # dziennik niedostępny - zapis bezpośredni jak w CSVDatabase
+            return super().save_result(test_result, max_retries, retry_delay)
+
+        logger.info(f"Wynik przyjęty do dziennika: {self.journal_filename}")
+        self._wake.set()
+        return True
+
+    def pending_count(self) -> int:
+        """Liczba wyników w dzienniku, które nie trafiły jeszcze do CSV"""
+        with self._journal_lock:
+            try:
+                with open(self.journal_filename, 'rb') as f:
+                    f.seek(self._meta.get('journal_offset', 0))
+                    return sum(1 for line in f if line.strip())
+            except FileNotFoundError:
+                return 0
+
+    def _merge_loop(self):
+        while True:
+            self._wake.wait(self.merge_interval)
+            self._wake.clear()
+            self.merge()
+            if self._stopping:
+                break
+
+    def merge(self) -> int:
+        """Jedna próba przeniesienia dziennika do CSV; zwraca liczbę scalonych wierszy"""
+        with self._merge_lock:
+            return self._merge()
+
+    def _merge(self) -> int:
+        with self._journal_lock:
+            offset = self._meta.get('journal_offset', 0)
+            try:
+                with open(self.journal_filename, 'rb') as f:
+                    f.seek(offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return 0
+
+        # tylko pełne linie - wpis dopisywany w tej chwili zostaje na następny raz
+        data = data[:data.rfind(b"\n") + 1]
+        if not data:
+            return 0
+
+        rows, offsets = [], []
+        end = offset
+        for line in data.splitlines(keepends=True):
+            end += len(line)
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+                offsets.append(end)
+            except ValueError:
+                logger.error(f"Uszkodzony wpis dziennika pominięty: {line[:200]!r}")
+
+        with self._lock:
+            try:
+                # pozycja dziennika przesuwana w meta dopiero po dopisaniu wierszy -
+                # blokada CSV w połowie nie gubi wyników ani nie dubluje już dopisanych
+                self._append_rows(rows, journal_offsets=offsets)
+            except (PermissionError, IOError) as e:
+                if not self.csv_locked:
+                    print(f"⚠ Plik zajęty (Excel otwarty?) - wyniki czekają w dzienniku")
+                    logger.warning(f"CSV zablokowany, {len(rows)} wyników w dzienniku: {e}")
+                self.csv_locked = True
+                return 0
+
+            self.csv_locked = False
+            if self._meta.get('journal_offset', 0) != end:
+                # same uszkodzone/puste linie na końcu - nie ma czego dopisywać
+                self._meta['journal_offset'] = end
+                self._save_meta()
+            with self._journal_lock:
+                self._compact_journal(end)
+
+        logger.info(f"Scalono {len(rows)} wyników z dziennika do: {self.current_filename}")
+        return len(rows)
+
+    def _compact_journal(self, merged_offset: int):
+        """W pełni scalony dziennik jest obcinany do zera"""
+        try:
+            if os.path.getsize(self.journal_filename) == merged_offset:
+                open(self.journal_filename, 'w').close()
+                self._meta['journal_offset'] = 0
+                self._save_meta()
+        except OSError as e:
+            logger.warning(f"Nie można obciąć dziennika: {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Poproś wątek scalający o scalenie teraz i poczekaj; True jeśli dziennik pusty"""
+        deadline = time.monotonic() + timeout
+        while True:
+            self._wake.set()
+            time.sleep(min(0.1, self.merge_interval))
+            with self._merge_lock:
+                if self.pending_count() == 0:
+                    return True
+            if time.monotonic() >= deadline:
+                return False
+
+    def close(self):
+        self._stopping = True
+        self._wake.set()
+        self._merger.join(timeout=self.merge_interval + 5)
+        pending = self.pending_count()
+        if pending:
+            logger.warning(f"Zamknięcie: {pending} wyników czeka w {self.journal_filename} "
+                           f"(zostaną dopisane przy następnym uruchomieniu)")
+
+
+# ===== SQLITE =====
+
+# Profile w układzie raportu CSV: (nazwa profilu, prefiks kolumn w SQLite)
+PROFILE_COLUMNS = [
+    ('Profile 5V', 'p5v'),
+    ('Profile 9V', 'p9v'),
+    ('Profile 12V', 'p12v'),
+    ('Profile 15V', 'p15v'),
+]
+
+PROFILE_STAT_COLUMNS = [
+    ('status', 'TEXT'),
+    ('min_v', 'REAL'),
+    ('max_v', 'REAL'),
+    ('avg_v', 'REAL'),
+    ('std_v', 'REAL'),
+    ('avg_current', 'REAL'),
+    ('out_of_range', 'INTEGER'),
+]
+
+
+def _csv_number(value: str):
+    """'4,86' -> 4.86, 'N/A' -> None"""
+    try:
+        return float(value.replace(',', '.'))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _csv_format(value) -> str:
+    return "N/A" if value is None else f"{value:.2f}".replace('.', ',')
+
+
+class SQLiteDatabase:
+    """
+    Wyniki testów w SQLite (tryb WAL) z indeksami po numerze seryjnym, HRID i dacie.
+    Ten sam save_result co CSVDatabase; export_csv odtwarza układ raportu CSV.
+    """
+
+    def __init__(self, filename: str = "wyniki_testow.db"):
+        import sqlite3
+
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    @property
+    def current_filename(self) -> str:
+        return self.filename
+
+    def _profile_column_names(self) -> List[str]:
+        return [f"{prefix}_{name}" for _, prefix in PROFILE_COLUMNS for name, _ in PROFILE_STAT_COLUMNS]
+
+    def _create_schema(self):
+        profile_columns = ",\n".join(
+            f"    {prefix}_{name} {sql_type}"
+            for _, prefix in PROFILE_COLUMNS for name, sql_type in PROFILE_STAT_COLUMNS
+        )
+        with self._lock, self._conn:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS test_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    hrid TEXT NOT NULL,
+                    serial_number TEXT NOT NULL,
+                    final_status TEXT NOT NULL,
+                    test_duration REAL,
+                    cycle_profile TEXT,
+                {profile_columns}
+                )""")
+            # baza sprzed kolumny rozkładu cyklu
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(test_results)")]
+            if 'cycle_profile' not in columns:
+                self._conn.execute("ALTER TABLE test_results ADD COLUMN cycle_profile TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_serial ON test_results(serial_number)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_hrid ON test_results(hrid, timestamp)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_timestamp ON test_results(timestamp)")
+
+    def _result_values(self, test_result) -> List:
+        """Wartości kolumn; status/min/max wprost z to_csv_row, żeby eksport był identyczny"""
+        row = test_result.to_csv_row()
+        cycle_profile = getattr(test_result, 'cycle_profile', None)
+        values = [test_result.timestamp, test_result.hrid, test_result.serial_number,
+                  test_result.final_status, test_result.test_duration,
+                  json.dumps({name: round(seconds, 4) for name, seconds in cycle_profile.items()})
+                  if cycle_profile else None]
+
+        for position, (name, _) in enumerate(PROFILE_COLUMNS):
+            status, min_v, max_v = row[3 + position * 3: 6 + position * 3]
+            result = test_result.profile_results.get(name)
+            has_stats = result is not None and _csv_number(min_v) is not None
+            values += [
+                status,
+                _csv_number(min_v),
+                _csv_number(max_v),
+                result.get_average_voltage_with_load() if has_stats else None,
+                result.get_std_voltage('with_load') if has_stats else None,
+                result.get_average_current() if has_stats else None,
+                result.get_out_of_range_count() if result is not None else None,
+            ]
+        return values
+
+    def save_result(self, test_result, max_retries: int = 3, retry_delay: float = 1.0) -> bool:
+        """Zapisz wynik testu (retry przy zablokowanej bazie)"""
+        import sqlite3
+
+        columns = ["timestamp", "hrid", "serial_number", "final_status", "test_duration", "cycle_profile"] + \
+            self._profile_column_names()
+        sql = (f"INSERT INTO test_results ({', '.join(columns)}) "
+               f"VALUES ({', '.join('?' for _ in columns)})")
+        values = self._result_values(test_result)
+
+        for attempt in range(max_retries):
+            try:
+                with self._lock, self._conn:
+                    self._conn.execute(sql, values)
+                logger.info(f"Wynik zapisany do SQLite: {self.filename}")
+                return True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"SQLite zajęte (próba {attempt + 1}/{max_retries}): {e}")
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+            except Exception as e:
+                logger.error(f"Błąd zapisu SQLite: {e}", exc_info=True)
+                return False
+
+        return False
+
+    def _query(self, sql: str, params=()) -> List[dict]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def find_by_serial(self, serial_number: str) -> List[dict]:
+        return self._query("SELECT * FROM test_results WHERE serial_number = ? ORDER BY timestamp",
+                           (serial_number,))
+
+    def count_by_serial(self, serial_number: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM test_results WHERE serial_number = ?",
+                                      (serial_number,)).fetchone()[0]
+
+    def find_by_hrid(self, hrid: str, date_from: str = None, date_to: str = None) -> List[dict]:
+        """date_from/date_to: 'YYYY-MM-DD' (włącznie)"""
+        sql = "SELECT * FROM test_results WHERE hrid = ?"
+        params = [hrid]
+        sql, params = self._date_filter(sql, params, date_from, date_to)
+        return self._query(sql + " ORDER BY timestamp", params)
+
+    def find_by_date(self, date_from: str, date_to: str = None) -> List[dict]:
+        sql, params = self._date_filter("SELECT * FROM test_results WHERE 1 = 1", [], date_from, date_to)
+        return self._query(sql + " ORDER BY timestamp", params)
+
+    @staticmethod
+    def _date_filter(sql: str, params: list, date_from: str, date_to: str):
+        # timestamp 'YYYY-MM-DD HH:MM:SS' - porównanie tekstowe korzysta z indeksu
+        if date_from:
+            sql += " AND timestamp >= ?"
+            params.append(date_from)
+        if date_to:
+            sql += " AND timestamp < date(?, '+1 day')"
+            params.append(date_to)
+        return sql, params
+
+    def daily_summary(self, date_from: str = None, date_to: str = None) -> List[dict]:
+        """PASS/FAIL i średni czas testu per dzień"""
+        sql, params = self._date_filter(
+            "SELECT substr(timestamp, 1, 10) AS day, COUNT(*) AS total, "
+            "SUM(final_status = 'PASS') AS pass, SUM(final_status != 'PASS') AS fail, "
+            "AVG(test_duration) AS avg_duration FROM test_results WHERE 1 = 1",
+            [], date_from, date_to)
+        return self._query(sql + " GROUP BY day ORDER BY day", params)
+
+    def export_csv(self, filename: str, date_from: str = None, date_to: str = None) -> int:
+        """Eksport do układu raportu CSV (średnik, przecinek dziesiętny); zwraca liczbę wierszy"""
+        rows = self.find_by_date(date_from, date_to) if (date_from or date_to) else \
+            self._query("SELECT * FROM test_results ORDER BY timestamp")
+
+        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(CSVDatabase._get_headers())
+            for row in rows:
+                csv_row = [row['timestamp'], row['hrid'], row['serial_number']]
+                for _, prefix in PROFILE_COLUMNS:
+                    csv_row += [row[f"{prefix}_status"] or "SKIPPED",
+                                _csv_format(row[f"{prefix}_min_v"]),
+                                _csv_format(row[f"{prefix}_max_v"])]
+                csv_row += [row['final_status'], _csv_format(row['test_duration'])]
+                writer.writerow(csv_row)
+
+        logger.info(f"Eksport SQLite -> {filename}: {len(rows)} wierszy")
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MultiDatabase:
+    """Zapis do kilku magazynów wyników; wynik zapisu i atrybuty z pierwszego (głównego)"""
+
+    def __init__(self, primary, *secondary):
+        self.primary = primary
+        self.secondary = list(secondary)
+
+    def save_result(self, test_result, max_retries: int = 3, retry_delay: float = 1.0) -> bool:
+        success = self.primary.save_result(test_result, max_retries=max_retries, retry_delay=retry_delay)
+        for store in self.secondary:
+            try:
+                store.save_result(test_result, max_retries=max_retries, retry_delay=retry_delay)
+            except Exception as e:
+                logger.error(f"Błąd zapisu do {type(store).__name__}: {e}", exc_info=True)
+        return success
+
+    def close(self):
+        for store in [self.primary] + self.secondary:
+            store.close()
+
+    def __getattr__(self, name):
+        return getattr(self.primary, name)
+
+
+def find_store(database, store_type):
+    """Magazyn danego typu z create_database (pojedynczy albo w MultiDatabase) lub None"""
+    stores = [database.primary] + database.secondary if isinstance(database, MultiDatabase) else [database]
+    return next((store for store in stores if isinstance(store, store_type)), None)
+
+
+def create_database(config):
+    """
+    Magazyn wyników wg config.results_backend: "csv", "sqlite" lub "csv+sqlite",
+    plus archiwum przebiegów, jeśli ustawiono config.waveform_archive_dir,
+    i indeks numerów seryjnych (zawsze; plik config.serial_index_path) - każdy zapis liczy się do limitu prób
+    """
+    backend = getattr(config, 'results_backend', "csv")
+    if backend not in ("csv", "sqlite", "csv+sqlite"):
+        raise ValueError(f"Nieznany magazyn wyników: {backend}")
+
+    from serial_index import SerialIndex
+    # zawsze rejestrowany - bez serial_index_path licznik tylko w pamięci, ale limit prób działa;
+    # przed magazynem CSV - jego wątek scalający nie przesuwa jeszcze dziennika podczas skanu
+    serial_index = SerialIndex(getattr(config, 'serial_index_path', None) or None,
+                               sqlite_path=config.sqlite_path if backend == "sqlite" else None)
+
+    stores = []
+    if backend in ("csv", "csv+sqlite"):
+        if getattr(config, 'csv_journal', False):
+            stores.append(JournaledCSVDatabase(max_rows=config.max_csv_rows))
+        else:
+            stores.append(CSVDatabase(max_rows=config.max_csv_rows))
+    if backend in ("sqlite", "csv+sqlite"):
+        stores.append(SQLiteDatabase(config.sqlite_path))
+
+    if getattr(config, 'waveform_archive_dir', None):
+        from waveform_archive import WaveformArchive
+        stores.append(WaveformArchive(config.waveform_archive_dir))
+
+    stores.append(serial_index)
+    return stores[0] if len(stores) == 1 else MultiDatabase(*stores)
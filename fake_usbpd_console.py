@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# fake_usbpd_console.py - zamiennik USBPDConsole.exe oparty o simulator.SimulatedPM125
+#
+# Użycie jak oryginał: fake_usbpd_console.py -d <serial> -s | -c | -q <mA> | -l <mA> | -v <idx> | -p | -r | -f
+# Tryb sesji (ConsoleSession): fake_usbpd_console.py -d <serial> -i
+#   komendy ze stdin, po każdej odpowiedzi linia "END" lub "END <kod>"
+# Parametry symulacji: plik JSON wskazany przez PM125_SIM_CONFIG (pola SimulatorSettings)
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from simulator import SimulatedPM125, SimulatorSettings, _state_dir
+
+
+def _state_file(serial: str) -> str:
+    return os.path.join(_state_dir(), f"state_{serial}.json")
+
+
+def _load_device(serial: str) -> SimulatedPM125:
+    settings = SimulatorSettings.from_env()
+    device = SimulatedPM125(settings, serial=None if serial == "Any" else serial)
+    try:
+        with open(_state_file(device.serial), 'r', encoding='utf-8') as f:
+            device.load_state(json.load(f))
+    except (FileNotFoundError, ValueError):
+        pass
+    return device
+
+
+def _save_device(device: SimulatedPM125):
+    tmp_file = _state_file(device.serial) + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(device.to_state(), f)
+    os.replace(tmp_file, _state_file(device.serial))
+
+
+def _execute(device: SimulatedPM125, args) -> (int, str):
+    fault = device.command_delay()
+    if fault == "hang":
+        time.sleep(device.settings.hang_time)
+    if fault is not None:
+        return 1, "SIMULATED FAILURE"
+    return device.console_output(args)
+
+
+def main(argv) -> int:
+    serial = "Any"
+    if len(argv) >= 2 and argv[0] == '-d':
+        serial, argv = argv[1], argv[2:]
+
+    device = _load_device(serial)
+
+    if argv and argv[0] == '-i':
+        for line in sys.stdin:
+            args = line.split()
+            if not args:
+                continue
+            code, output = _execute(device, args)
+            if output:
+                print(output)
+            print("END" if code == 0 else f"END {code}", flush=True)
+        _save_device(device)
+        return 0
+
+    code, output = _execute(device, argv)
+    _save_device(device)
+    if code == 0:
+        print(output)
+    else:
+        print(output, file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
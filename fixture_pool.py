@@ -0,0 +1,130 @@
+# fixture_pool.py - równoległe testy na kilku testerach PM125
+# Tylko biblioteka: GUI i batch_runner.py testują na jednym testerze i nie używają puli.
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List, Dict, Optional, Callable
+
+from config import TestConfig
+from hardware_interface import PM125Interface
+from test_runner import TestRunner, FullTestResult
+
+logger = logging.getLogger(__name__)
+
+
+def discover_fixtures(config: TestConfig) -> List[str]:
+    """
+    Numery seryjne testerów do puli: z config.fixture_serials albo
+    wszystkie urządzenia znalezione przez -f
+    """
+    if config.fixture_serials:
+        return list(config.fixture_serials)
+
+    hardware = PM125Interface.from_config(config)
+    try:
+        return hardware.find_all_devices()
+    finally:
+        hardware.disconnect()
+
+
+class FixtureWorker:
+    """Jeden tester PM125 z własnym TestRunner i wątkiem roboczym"""
+
+    def __init__(self, config: TestConfig, device_serial: str, database=None,
+                 hardware_factory: Callable[[TestConfig, str], PM125Interface] = None):
+        self.device_serial = device_serial
+        self.database = database
+        factory = hardware_factory or PM125Interface.from_config
+        self.hardware = factory(config, device_serial)
+        self.runner = TestRunner(config, self.hardware)
+        self.jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self.busy = False
+        self.thread = threading.Thread(target=self._loop, name=f"fixture-{device_serial}", daemon=True)
+        self.thread.start()
+
+    def submit(self, hrid: str, serial_number: str, progress_callback=None) -> Future:
+        future = Future()
+        self.jobs.put((hrid, serial_number, progress_callback, future))
+        return future
+
+    def _loop(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+
+            hrid, serial_number, progress_callback, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            self.busy = True
+            try:
+                logger.info(f"[{self.device_serial}] START: {serial_number}")
+                result = self.runner.run_full_test(hrid=hrid, serial_number=serial_number,
+                                                   progress_callback=progress_callback)
+                if self.database is not None:
+                    self.database.save_result(result)
+                logger.info(f"[{self.device_serial}] {serial_number}: {result.final_status} "
+                            f"({result.test_duration:.2f}s)")
+                future.set_result(result)
+            except Exception as e:
+                logger.error(f"[{self.device_serial}] Błąd testu {serial_number}: {e}", exc_info=True)
+                future.set_exception(e)
+            finally:
+                self.busy = False
+
+    def stop(self):
+        self.jobs.put(None)
+        self.thread.join()
+        self.hardware.disconnect()
+
+
+class FixturePool:
+    """
+    Pula testerów PM125 - każdy tester ma swój wątek, konfiguracja jest wspólna,
+    a zapis do bazy jest serializowany przez CSVDatabase
+    """
+
+    def __init__(self, config: TestConfig, device_serials: List[str], database=None,
+                 hardware_factory: Callable[[TestConfig, str], PM125Interface] = None):
+        if not device_serials:
+            raise ValueError("Pula testerów jest pusta")
+
+        self.config = config
+        self.database = database
+        self.workers: Dict[str, FixtureWorker] = {}
+
+        for device_serial in device_serials:
+            try:
+                self.workers[device_serial] = FixtureWorker(config, device_serial, database, hardware_factory)
+                logger.info(f"Tester w puli: {device_serial}")
+            except Exception as e:
+                logger.error(f"Pominięto tester {device_serial}: {e}")
+
+        if not self.workers:
+            raise ConnectionError("Nie udało się połączyć z żadnym testerem z puli")
+
+    def submit(self, hrid: str, serial_number: str, fixture: str, progress_callback=None) -> Future:
+        """
+        Zleć test jednostki
+        fixture: serial testera, w którym fizycznie jest jednostka - wymagany,
+        bo wynik z innego testera trafiłby do raportu pod cudzym numerem seryjnym
+        """
+        if fixture not in self.workers:
+            raise ValueError(f"Tester {fixture} nie jest w puli ({', '.join(self.workers)})")
+        return self.workers[fixture].submit(hrid, serial_number, progress_callback)
+
+    def run_batch(self, hrid: str, assignments: Dict[str, str]) -> Dict[str, FullTestResult]:
+        """
+        Jedna runda: assignments = {serial testera: serial jednostki w tym testerze}.
+        Wszystkie testery równolegle; wyniki per tester.
+        """
+        futures = {fixture: self.submit(hrid, serial_number, fixture)
+                   for fixture, serial_number in assignments.items()}
+        return {fixture: future.result() for fixture, future in futures.items()}
+
+    def shutdown(self):
+        for worker in self.workers.values():
+            worker.stop()
+        self.workers.clear()
@@ -1,53 +1,34 @@
+import time
+
+# Celowo przed pozostałymi importami (E402): raport startu mierzy też czas importu
+# tkinter i modułów aplikacji, który jest największą częścią zimnego startu EXE
+STARTUP_T0 = time.perf_counter()
+
 import tkinter as tk
 from tkinter import messagebox, ttk, filedialog
 import tkinter.simpledialog
-from PIL import Image, ImageTk
 from threading import Thread
-import time
 import os
-import sys
-from collections import deque, Counter
+from collections import deque
 import logging
-from datetime import datetime, timedelta
-import glob
 
 from config import TestConfig
-from hardware_interface import PM125Interface
-from test_runner import TestRunner
-from database import CSVDatabase
-
-log_filename = f"psu19_log_{datetime.now().strftime('%Y%m%d')}.txt"
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.FileHandler(log_filename, encoding='utf-8')]
-)
+from hardware_connection import HardwareConnection, CONNECTED, CONNECTING
+from test_runner import TestRunner, SKIPPED_FAIL_FAST
+from database import create_database, find_store
+from serial_index import SerialIndex
+from spc import SPCMonitor
+from cycle_profiler import CycleProfiler, CycleHistory
+from latency_stats import format_latency_table
+from live_chart import LiveChart, SampleQueue
+from assets import load_image
+from log_tail import LogFollower, LEVELS
+from log_setup import start_logging, configure_logging, LOG_FILENAME
+
+log_listener = start_logging()
+log_filename = LOG_FILENAME
 logger = logging.getLogger(__name__)
 
-
-def cleanup_old_logs(days=7):
-    try:
-        cutoff_date = datetime.now() - timedelta(days=days)
-        log_files = glob.glob("psu19_log_*.txt")
-        deleted_count = 0
-        for log_file in log_files:
-            try:
-                date_str = log_file.replace("psu19_log_", "").replace(".txt", "")
-                file_date = datetime.strptime(date_str, "%Y%m%d")
-                if file_date < cutoff_date:
-                    os.remove(log_file)
-                    deleted_count += 1
-                    logger.info(f"Usunięto stary log: {log_file}")
-            except Exception as e:
-                logger.warning(f"Nie można usunąć {log_file}: {e}")
-        if deleted_count > 0:
-            logger.info(f"Wyczyszczono {deleted_count} starych logów")
-    except Exception as e:
-        logger.error(f"Błąd czyszczenia logów: {e}")
-
-
-cleanup_old_logs(days=7)
-
 COLORS = {
     'primary': '#4267B2',
     'primary_dark': '#3D5A98',
@@ -66,24 +47,6 @@ COLORS = {
 }
 
 
-def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
-
-
-def load_logo(file_path, size=(200, 45)):
-    try:
-        original_image = Image.open(file_path)
-        logo_image = original_image.resize(size, Image.LANCZOS)
-        return ImageTk.PhotoImage(logo_image)
-    except Exception as e:
-        logger.warning(f"Nie można załadować logo {file_path}: {e}")
-        return None
-
-
 LANGUAGES = {
     'pl': {
         'app_title': "PSU19 Tester",
@@ -120,8 +83,15 @@ LANGUAGES = {
         'wrong_password': "Nieprawidłowe hasło!",
         'logs': "Logi",
         'refresh': "Odśwież",
+        'follow': "Na żywo",
+        'level': "Poziom:",
         'clear': "Wyczyść",
         'statistics': "Statystyki",
+        'latency': "Czasy komend",
+        'conn_connecting': "● PM125: łączenie...",
+        'conn_connected': "● PM125: połączono ({detail})",
+        'conn_disconnected': "● PM125: brak połączenia - ponawiam",
+        'not_connected': "Tester PM125 nie jest połączony.\n\nSprawdź kabel USB - połączenie jest ponawiane automatycznie.",
         'current_session': "Statystyki bieżącej sesji",
         'total_tests': "Testów łącznie:",
         'paths': "Ścieżki",
@@ -147,6 +117,7 @@ LANGUAGES = {
         'config_saved': "Konfiguracja zapisana!\n\nZrestartuj aplikację aby zastosować zmiany.",
         'file_locked': "Plik zajęty",
         'csv_locked': "Plik CSV zajęty",
+        'journal_pending': "⚠ CSV otwarty w Excelu - {count} wyników bezpiecznie w dzienniku, zostaną dopisane po zamknięciu",
         'close_excel': "Plik CSV jest otwarty w Excelu!\n\nZamknij Excel i spróbuj ponownie.",
         'ok_retry': "OK - Spróbuję ponownie",
         'select_hrid_remove': "Wybierz HRID do usunięcia!",
@@ -194,8 +165,15 @@ LANGUAGES = {
         'wrong_password': "Wrong password!",
         'logs': "Logs",
         'refresh': "Refresh",
+        'follow': "Live",
+        'level': "Level:",
         'clear': "Clear",
         'statistics': "Statistics",
+        'latency': "Command latency",
+        'conn_connecting': "● PM125: connecting...",
+        'conn_connected': "● PM125: connected ({detail})",
+        'conn_disconnected': "● PM125: not connected - retrying",
+        'not_connected': "PM125 tester is not connected.\n\nCheck the USB cable - the connection is retried automatically.",
         'current_session': "Current session statistics",
         'total_tests': "Total tests:",
         'paths': "Paths",
@@ -221,6 +199,7 @@ LANGUAGES = {
         'config_saved': "Configuration saved!\n\nRestart app to apply changes.",
         'file_locked': "File locked",
         'csv_locked': "CSV File locked",
+        'journal_pending': "⚠ CSV open in Excel - {count} results safe in the journal, added once it is closed",
         'close_excel': "CSV file is open in Excel!\n\nClose Excel and try again.",
         'ok_retry': "OK - Retry",
         'select_hrid_remove': "Select HRID to remove!",
@@ -268,8 +247,15 @@ LANGUAGES = {
         'wrong_password': "Неправильний пароль!",
         'logs': "Логи",
         'refresh': "Оновити",
+        'follow': "Наживо",
+        'level': "Рівень:",
         'clear': "Очистити",
         'statistics': "Статистика",
+        'latency': "Час команд",
+        'conn_connecting': "● PM125: з'єднання...",
+        'conn_connected': "● PM125: підключено ({detail})",
+        'conn_disconnected': "● PM125: немає з'єднання - повторюю",
+        'not_connected': "Тестер PM125 не підключено.\n\nПеревірте USB кабель - з'єднання повторюється автоматично.",
         'current_session': "Статистика поточної сесії",
         'total_tests': "Всього тестів:",
         'paths': "Шляхи",
@@ -295,6 +281,7 @@ LANGUAGES = {
         'config_saved': "Конфігурація збережена!\n\nПеревантажте додаток",
         'file_locked': "Файл заблокований",
         'csv_locked': "Файл CSV заблокований",
+        'journal_pending': "⚠ CSV відкрито в Excel - {count} результатів збережено в журналі, будуть додані після закриття",
         'close_excel': "Файл CSV відкритий в Excel!\n\nЗакрийте Excel і спробуйте ще раз.",
         'ok_retry': "OK - Спробую ще раз",
         'select_hrid_remove': "Виберіть HRID для видалення!",
@@ -310,9 +297,24 @@ LANGUAGES = {
 }
 
 
+# Zakładka logów: ile wpisów przy otwarciu, limit linii w oknie, okres odświeżania na żywo [ms]
+LOG_TAIL_LINES = 100
+LOG_MAX_LINES = 2000
+LOG_FOLLOW_MS = 500
+# Odświeżanie informacji o wynikach czekających w dzienniku CSV [ms]
+JOURNAL_STATUS_MS = 1000
+
+IMPORT_TIME = time.perf_counter() - STARTUP_T0
+
+
 class TestGUI:
     def __init__(self):
-        self.root = tk.Tk()
+        self.startup = CycleProfiler()
+        self.startup.start = STARTUP_T0
+        self.startup.add('imports', IMPORT_TIME)
+
+        with self.startup.phase('tk'):
+            self.root = tk.Tk()
         self.root.title("PSU19 Tester - Reconext")
         self.root.geometry("900x760")
         self.root.minsize(850, 710)
@@ -324,7 +326,6 @@ class TestGUI:
         self.last_test_serial = None
         self.test_history = deque(maxlen=5)
         self.daily_stats = {'pass': 0, 'fail': 0, 'total': 0}
-        self.serial_test_count = Counter()
         self.debug_mode = False
         self.debug_key_sequence = []
         self.test_in_progress = False
@@ -334,7 +335,9 @@ class TestGUI:
         logger.info("=== APLIKACJA URUCHOMIONA ===")
 
         try:
-            self.config = TestConfig.load()
+            with self.startup.phase('config'):
+                self.config = TestConfig.load()
+                configure_logging(log_listener, self.config)
             logger.info("Konfiguracja załadowana")
         except Exception as e:
             logger.error(f"Błąd ładowania konfiguracji: {e}", exc_info=True)
@@ -342,19 +345,53 @@ class TestGUI:
             self.root.destroy()
             return
 
-        try:
-            self.hardware = PM125Interface(console_path=self.config.console_path,
-                                           device_serial=self.config.device_serial)
-            logger.info("Połączono z PM125")
-        except Exception as e:
-            logger.error(f"Błąd połączenia: {e}", exc_info=True)
-            messagebox.showerror("Error", f"Cannot connect to PM125:\n{e}")
-            self.root.destroy()
+        # tester łączy się w tle - logowanie HRID dostępne od razu
+        self.connection_state = (CONNECTING, "")
+        with self.startup.phase('hardware'):
+            self.connection = HardwareConnection(self.config, on_state=self._on_connection_state,
+                                                 on_connected=self._on_connected)
+
+        with self.startup.phase('database'):
+            self.runner = TestRunner(self.config, None)
+            self.database = create_database(self.config)
+            # indeks jest magazynem w create_database - liczy każdy zapisany wynik
+            self.serial_test_count = find_store(self.database, SerialIndex)
+            # brak spc_state.json - odbudowa z raportów w tle, nie w budżecie startu
+            self.spc = SPCMonitor(self.config, state_path=self.config.spc_state_path, background=True)
+            self.cycle_history = CycleHistory(50)
+
+        with self.startup.phase('ui'):
+            self._build_ui()
+        self.connection.start()
+        self.root.after_idle(self._report_startup)
+
+    @property
+    def hardware(self):
+        return self.connection.hardware
+
+    def _on_connected(self, hardware):
+        # wątek połączenia, pod blokadą testu - żaden test nie używa starego interfejsu
+        self.runner.hardware = hardware
+
+    def _on_connection_state(self, state: str, detail: str):
+        self.root.after(0, self._show_connection_state, state, detail)
+
+    def _show_connection_state(self, state: str, detail: str):
+        self.connection_state = (state, detail)
+        if not hasattr(self, 'connection_label'):
             return
-
-        self.runner = TestRunner(self.config, self.hardware)
-        self.database = CSVDatabase()
-        self._build_ui()
+        color = {CONNECTED: COLORS['success'], CONNECTING: COLORS['warning']}.get(state, COLORS['error'])
+        self.connection_label.config(text=LANGUAGES[self.current_lang][f'conn_{state}'].format(detail=detail),
+                                     fg=color)
+
+    def _report_startup(self):
+        """Czas od startu procesu do pierwszego narysowania okna, z podziałem na fazy"""
+        breakdown = self.startup.breakdown()
+        report = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in breakdown.items())
+        if breakdown['total'] > self.config.startup_budget:
+            logger.warning(f"Start aplikacji ponad budżet {self.config.startup_budget:.1f}s: {report}")
+        else:
+            logger.info(f"Start aplikacji: {report}")
 
     def _build_ui(self):
         header_frame = tk.Frame(self.root, bg=COLORS['primary'], height=70)
@@ -362,7 +399,7 @@ class TestGUI:
         header_frame.pack_propagate(False)
 
         try:
-            reconext_logo = load_logo(resource_path("reconext_logo.jpg"), size=(55, 55))
+            reconext_logo = load_image("reconext_logo.jpg", size=(55, 55))
             if reconext_logo:
                 logo_label = tk.Label(header_frame, image=reconext_logo, bg=COLORS['primary'])
                 logo_label.image = reconext_logo
@@ -378,11 +415,10 @@ class TestGUI:
             flags_frame = tk.Frame(header_frame, bg=COLORS['primary'])
             flags_frame.pack(side=tk.RIGHT, padx=20)
 
-            flag_pl_img = ImageTk.PhotoImage(Image.open(resource_path("flag_pl.png")).resize((32, 24), Image.LANCZOS))
-            flag_en_img = ImageTk.PhotoImage(Image.open(resource_path("flag_en.png")).resize((32, 24), Image.LANCZOS))
-            flag_ua_img = ImageTk.PhotoImage(Image.open(resource_path("flag_ua.png")).resize((32, 24), Image.LANCZOS))
-
-            for flag_img, lang in [(flag_pl_img, 'pl'), (flag_en_img, 'en'), (flag_ua_img, 'ua')]:
+            for lang in ['pl', 'en', 'ua']:
+                flag_img = load_image(f"flag_{lang}.png", size=(32, 24))
+                if flag_img is None:
+                    continue
                 btn = tk.Button(flags_frame, image=flag_img, command=lambda l=lang: self._update_language(l),
                                 borderwidth=0, bg=COLORS['primary'], activebackground=COLORS['primary_dark'],
                                 cursor="hand2")
@@ -549,8 +585,18 @@ class TestGUI:
         self.author_label.pack(side=tk.LEFT, padx=15, pady=8)
         self.author_label.bind("<Button-1>", lambda e: self._show_about())
 
+        self.connection_label = tk.Label(footer, text="", font=("Arial", 9, "bold"), bg=COLORS['background'])
+        self.connection_label.pack(side=tk.LEFT, padx=15, pady=8)
+        self._show_connection_state(*self.connection_state)
+
+        # wyniki czekające w dzienniku, gdy CSV jest zablokowany - informacja bez blokowania pracy
+        self.journal_label = tk.Label(footer, text="", font=("Arial", 9, "bold"), fg=COLORS['warning'],
+                                      bg=COLORS['background'])
+        self.journal_label.pack(side=tk.LEFT, padx=15, pady=8)
+        self._update_journal_status()
+
         try:
-            logo_image = load_logo(resource_path("logo.png"), size=(150, 35))
+            logo_image = load_image("logo.png", size=(150, 35))
             if logo_image:
                 logo_label = tk.Label(footer, image=logo_image, bg=COLORS['background'])
                 logo_label.image = logo_image
@@ -558,6 +604,15 @@ class TestGUI:
         except Exception as e:
             logger.warning(f"Footer logo error: {e}")
 
+    def _update_journal_status(self):
+        """Co JOURNAL_STATUS_MS: stan pliku CSV wg ostatniej próby wątku scalającego"""
+        if getattr(self.database, 'csv_locked', False):
+            self.journal_label.config(
+                text=LANGUAGES[self.current_lang]['journal_pending'].format(count=self.database.pending_count()))
+        else:
+            self.journal_label.config(text="")
+        self.root.after(JOURNAL_STATUS_MS, self._update_journal_status)
+
     def _update_stats(self):
         total = self.daily_stats['total']
         pass_count = self.daily_stats['pass']
@@ -622,6 +677,7 @@ class TestGUI:
         self.history_tree.heading('result', text=LANGUAGES[lang]['result'])
         self.history_tree.heading('time', text=LANGUAGES[lang]['time'])
         self.no_tests_label.config(text=LANGUAGES[lang]['no_tests'])
+        self._show_connection_state(*self.connection_state)
 
         logger.info(f"Język zmieniony na: {lang}")
 
@@ -649,7 +705,6 @@ class TestGUI:
 
         self.daily_stats = {'pass': 0, 'fail': 0, 'total': 0}
         self._update_stats()
-        self.serial_test_count.clear()
 
         self.logged_hrid = None
         self.entry_hrid.config(state="normal")
@@ -712,6 +767,11 @@ class TestGUI:
         if not serial:
             return
 
+        if not self.connection.connected:
+            messagebox.showwarning("PM125", LANGUAGES[self.current_lang]['not_connected'])
+            logger.warning(f"Test {serial} odrzucony - brak połączenia z PM125")
+            return
+
         if not self._validate_serial(serial):
             return
 
@@ -720,14 +780,23 @@ class TestGUI:
         Thread(target=self._run_test_thread, args=(serial,), daemon=True).start()
 
     def _run_test_thread(self, serial: str):
+        profiler = CycleProfiler()
+        self.sample_queue = SampleQueue()
         try:
-            self.root.after(0, self._create_test_window)
-            time.sleep(0.1)
-
-            result = self.runner.run_full_test(hrid=self.logged_hrid, serial_number=serial, progress_callback=None)
+            with profiler.phase('gui'):
+                self.root.after(0, self._create_test_window)
+                time.sleep(0.1)
+
+            with self.connection.lock:
+                result = self.runner.run_full_test(hrid=self.logged_hrid, serial_number=serial,
+                                                   progress_callback=self.sample_queue.put, profiler=profiler)
+            if result.final_status != "PASS":
+                # FAIL może oznaczać odłączony tester - sprawdź od razu, nie przy następnym cyklu
+                self.connection.check_now()
             logger.info(f"Test zakończony: {result.final_status}, czas: {result.test_duration:.2f}s")
 
-            save_success = self.database.save_result(result, max_retries=3, retry_delay=1.0)
+            with profiler.phase('save'):
+                save_success = self.database.save_result(result, max_retries=3, retry_delay=1.0)
             logger.info(f"Wynik zapisu: {save_success}")
 
             if not save_success:
@@ -740,21 +809,33 @@ class TestGUI:
             else:
                 self.daily_stats['fail'] += 1
 
-            self.serial_test_count[serial] += 1
+            for alarm in self.spc.add_result(result):
+                logger.warning(f"SPC: {alarm}")
+            self.spc.save()
             self.last_test_serial = serial
 
             self.root.after(0, self._update_stats)
             self.root.after(0, self._add_to_history, serial, result.final_status, result.test_duration,
                             result.timestamp)
 
-            if hasattr(self, 'test_window') and self.test_window and self.test_window.winfo_exists():
-                self.test_window.destroy()
+            with profiler.phase('gui'):
+                if hasattr(self, 'test_window') and self.test_window and self.test_window.winfo_exists():
+                    self.test_window.destroy()
+
+                time.sleep(0.2)
+                self.root.after(0, self._show_final_result, result, save_success)
 
-            time.sleep(0.2)
-            self.root.after(0, self._show_final_result, result, save_success)
+            # zapisany rozkład (result.cycle_profile z run_full_test) kończy się przed zapisem;
+            # historia dostaje pełny cykl z zapisem i oknem wyniku
+            cycle = profiler.breakdown()
+            self.cycle_history.add(cycle)
+            logger.info("Cykl: " + ", ".join(f"{k} {v:.2f}s" for k, v in cycle.items()))
+            if len(self.cycle_history) % 10 == 0:
+                logger.info(self.cycle_history.format_summary())
 
         except Exception as e:
             logger.error(f"BŁĄD: {e}", exc_info=True)
+            self.connection.check_now()
             messagebox.showerror("Error", f"Error:\n{str(e)}")
         finally:
             self.root.after(0, self._unlock_ui)
@@ -762,12 +843,12 @@ class TestGUI:
     def _create_test_window(self):
         self.test_window = tk.Toplevel(self.root)
         self.test_window.title("TEST")
-        self.test_window.geometry("500x300")
+        self.test_window.geometry("560x520")
         self.test_window.configure(bg=COLORS['background'])
 
         root_x = self.root.winfo_x()
         root_y = self.root.winfo_y()
-        self.test_window.geometry(f"+{root_x + 200}+{root_y + 180}")
+        self.test_window.geometry(f"+{root_x + 170}+{root_y + 100}")
         self.test_window.protocol("WM_DELETE_WINDOW", lambda: None)
 
         header_frame = tk.Frame(self.test_window, bg=COLORS['primary'], height=65)
@@ -781,11 +862,17 @@ class TestGUI:
         content_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
 
         tk.Label(content_frame, text=LANGUAGES[self.current_lang]['test_wait'], font=("Arial", 12),
-                 fg=COLORS['text_dark'], bg=COLORS['background']).pack(pady=(10, 20))
+                 fg=COLORS['text_dark'], bg=COLORS['background']).pack(pady=(5, 10))
+
+        self.live_chart = LiveChart(content_frame, self.sample_queue, colors=COLORS)
+        self.live_chart.pack(pady=5)
+        self.live_chart.start()
 
         self.progress_canvas = tk.Canvas(content_frame, width=400, height=30, bg="white", highlightthickness=1,
                                          highlightbackground=COLORS['border'])
-        self.progress_canvas.pack(pady=20)
+        self.progress_canvas.pack(pady=10)
+        self.progress_canvas.create_rectangle(0, 0, 400, 30, fill="#EEEEEE", outline=COLORS['border'])
+        self.progress_bar = self.progress_canvas.create_rectangle(0, 3, 100, 27, fill=COLORS['primary'], outline="")
 
         self.progress_position = 0
         self.progress_direction = 1
@@ -793,7 +880,7 @@ class TestGUI:
 
         self.time_label = tk.Label(content_frame, text=f"{LANGUAGES[self.current_lang]['time_label']}: 00:00",
                                    font=("Arial", 14, "bold"), fg=COLORS['accent'], bg=COLORS['background'])
-        self.time_label.pack(pady=15)
+        self.time_label.pack(pady=10)
 
         self.test_start_time = time.time()
         self._update_test_timer()
@@ -803,12 +890,9 @@ class TestGUI:
             return
 
         try:
-            self.progress_canvas.delete("all")
-            self.progress_canvas.create_rectangle(0, 0, 400, 30, fill="#EEEEEE", outline=COLORS['border'])
-
             bar_width = 100
-            self.progress_canvas.create_rectangle(self.progress_position, 3, self.progress_position + bar_width, 27,
-                                                  fill=COLORS['primary'], outline="")
+            self.progress_canvas.coords(self.progress_bar, self.progress_position, 3,
+                                        self.progress_position + bar_width, 27)
 
             self.progress_position += self.progress_direction * 6
 
@@ -916,6 +1000,8 @@ class TestGUI:
 
             if profile_result.status == "TIMEOUT":
                 status_icon, status_color = "⏱", COLORS['warning']
+            elif profile_result.status == SKIPPED_FAIL_FAST:
+                status_icon, status_color = "⊘", COLORS['text_light']
             else:
                 status_icon = "✓" if profile_result.status == "PASS" else "✗"
                 status_color = COLORS['success'] if profile_result.status == "PASS" else COLORS['error']
@@ -925,7 +1011,7 @@ class TestGUI:
             tk.Label(profile_row, text=profile_name, font=("Arial", 10), fg=COLORS['text_dark'],
                      bg=COLORS['background'], width=12, anchor='w').pack(side=tk.LEFT)
 
-            if profile_result.status not in ["TIMEOUT", "ERROR"]:
+            if profile_result.status not in ["TIMEOUT", "ERROR", SKIPPED_FAIL_FAST]:
                 avg_v = profile_result.get_average_voltage_with_load()
                 tk.Label(profile_row, text=f"{LANGUAGES[self.current_lang]['avg_voltage']}: {avg_v:.2f}V",
                          font=("Arial", 9), fg=COLORS['text_light'], bg=COLORS['background']).pack(side=tk.LEFT,
@@ -948,7 +1034,7 @@ class TestGUI:
     def _retry_test(self, result_window):
         result_window.destroy()
         logger.info(f"RETRY: {self.last_test_serial}")
-        self.serial_test_count[self.last_test_serial] -= 1
+        self.serial_test_count.undo(self.last_test_serial)
         self._start_test(retry_serial=self.last_test_serial)
 
     def _debug_key_pressed(self, event):
@@ -1014,22 +1100,32 @@ class TestGUI:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         log_text.config(yscrollcommand=scrollbar.set)
 
-        try:
-            with open(log_filename, 'r', encoding='utf-8') as f:
-                for line in f.readlines()[-100:]:
-                    log_text.insert(tk.END, line)
-                log_text.see(tk.END)
-        except Exception as e:
-            log_text.insert(tk.END, f"Error: {e}")
+        log_follower = LogFollower(log_filename)
+        follow_var = tk.BooleanVar(value=True)
+        level_var = tk.StringVar(value="DEBUG")
+
+        def change_level(event=None):
+            log_follower.min_level = logging.getLevelName(level_var.get())
+            self._debug_refresh_logs(log_text, log_follower)
 
         log_btn_frame = tk.Frame(log_tab, bg=COLORS['card_bg'])
         log_btn_frame.pack(fill=tk.X, padx=10, pady=10)
         tk.Button(log_btn_frame, text=f"🔄 {LANGUAGES[self.current_lang]['refresh']}",
-                  command=lambda: self._debug_refresh_logs(log_text), bg=COLORS['primary'], fg="white",
+                  command=lambda: self._debug_refresh_logs(log_text, log_follower), bg=COLORS['primary'], fg="white",
                   font=("Arial", 10, "bold"), padx=15, pady=8).pack(side=tk.LEFT, padx=5)
         tk.Button(log_btn_frame, text=f"🗑️ {LANGUAGES[self.current_lang]['clear']}",
                   command=lambda: self._debug_clear_logs(log_text), bg=COLORS['error'], fg="white",
                   font=("Arial", 10, "bold"), padx=15, pady=8).pack(side=tk.LEFT, padx=5)
+        tk.Checkbutton(log_btn_frame, text=LANGUAGES[self.current_lang]['follow'], variable=follow_var,
+                       bg=COLORS['card_bg'], font=("Arial", 10)).pack(side=tk.LEFT, padx=15)
+        tk.Label(log_btn_frame, text=LANGUAGES[self.current_lang]['level'], bg=COLORS['card_bg'],
+                 font=("Arial", 10)).pack(side=tk.LEFT)
+        level_box = ttk.Combobox(log_btn_frame, textvariable=level_var, values=LEVELS, width=10, state="readonly")
+        level_box.pack(side=tk.LEFT, padx=5)
+        level_box.bind("<<ComboboxSelected>>", change_level)
+
+        self._debug_refresh_logs(log_text, log_follower)
+        self._debug_follow_logs(log_text, log_follower, follow_var)
 
         stats_tab = tk.Frame(notebook, bg=COLORS['card_bg'])
         notebook.add(stats_tab, text=f"📊 {LANGUAGES[self.current_lang]['statistics']}")
@@ -1061,6 +1157,25 @@ class TestGUI:
                                                                                                               padx=10,
                                                                                                               pady=5)
 
+        latency_tab = tk.Frame(notebook, bg=COLORS['card_bg'])
+        notebook.add(latency_tab, text=f"⏱ {LANGUAGES[self.current_lang]['latency']}")
+
+        latency_text = tk.Text(latency_tab, font=("Courier", 10), height=12, bg=COLORS['card_bg'],
+                               fg=COLORS['text_dark'])
+        latency_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        latency_btn_frame = tk.Frame(latency_tab, bg=COLORS['card_bg'])
+        latency_btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        tk.Button(latency_btn_frame, text=f"🔄 {LANGUAGES[self.current_lang]['refresh']}",
+                  command=lambda: self._debug_refresh_latency(latency_text), bg=COLORS['primary'], fg="white",
+                  font=("Arial", 10, "bold"), padx=15, pady=8).pack(side=tk.LEFT, padx=5)
+        tk.Button(latency_btn_frame, text=f"🗑️ {LANGUAGES[self.current_lang]['clear']}",
+                  command=lambda: (self.hardware and self.hardware.reset_command_latency(),
+                                   self._debug_refresh_latency(latency_text)),
+                  bg=COLORS['error'], fg="white", font=("Arial", 10, "bold"), padx=15, pady=8).pack(side=tk.LEFT,
+                                                                                                     padx=5)
+        self._debug_refresh_latency(latency_text)
+
         paths_tab = tk.Frame(notebook, bg=COLORS['card_bg'])
         notebook.add(paths_tab, text=f"📁 {LANGUAGES[self.current_lang]['paths']}")
 
@@ -1229,17 +1344,44 @@ class TestGUI:
         tk.Button(config_content, text=f"💾 {LANGUAGES[self.current_lang]['save_config']}", command=save_config,
                   bg=COLORS['success'], fg="white", font=("Arial", 12, "bold"), padx=30, pady=10).pack(pady=20)
 
-    def _debug_refresh_logs(self, log_text):
+    def _debug_refresh_logs(self, log_text, log_follower):
         log_text.delete('1.0', tk.END)
         try:
-            with open(log_filename, 'r', encoding='utf-8') as f:
-                for line in f.readlines()[-100:]:
-                    log_text.insert(tk.END, line)
-                log_text.see(tk.END)
-            logger.info("Logs refreshed")
+            for line in log_follower.tail(LOG_TAIL_LINES):
+                log_text.insert(tk.END, line + "\n")
+            log_text.see(tk.END)
         except Exception as e:
             log_text.insert(tk.END, f"Error: {e}")
 
+    def _debug_follow_logs(self, log_text, log_follower, follow_var):
+        """Co LOG_FOLLOW_MS dopisz nowe linie logu (tylko przyrost pliku)"""
+        if not log_text.winfo_exists():
+            return
+        if follow_var.get():
+            try:
+                lines = log_follower.poll()
+            except OSError as e:
+                lines = [f"Error: {e}"]
+            if lines:
+                at_end = log_text.yview()[1] >= 0.999
+                log_text.insert(tk.END, "\n".join(lines) + "\n")
+                excess = int(log_text.index('end-1c').split('.')[0]) - LOG_MAX_LINES
+                if excess > 0:
+                    log_text.delete('1.0', f"{excess + 1}.0")
+                # nie przewijaj, gdy inżynier czyta coś wyżej
+                if at_end:
+                    log_text.see(tk.END)
+        log_text.after(LOG_FOLLOW_MS, self._debug_follow_logs, log_text, log_follower, follow_var)
+
+    def _debug_refresh_latency(self, latency_text):
+        latency_text.delete('1.0', tk.END)
+        snapshot = self.hardware.command_latency() if self.hardware else {}
+        if not snapshot:
+            latency_text.insert(tk.END, "-")
+            return
+        latency_text.insert(tk.END, format_latency_table(snapshot) + "\n\n")
+        latency_text.insert(tk.END, self.cycle_history.format_summary() if len(self.cycle_history) else "")
+
     def _debug_clear_logs(self, log_text):
         log_text.delete('1.0', tk.END)
         logger.info("=== LOGS CLEARED ===")
@@ -1252,8 +1394,10 @@ class TestGUI:
         try:
             self.root.mainloop()
         finally:
-            if hasattr(self, 'hardware') and self.hardware:
-                self.hardware.disconnect()
+            if hasattr(self, 'connection'):
+                self.connection.stop()
+            if hasattr(self, 'database') and self.database:
+                self.database.close()
             logger.info(f"=== APP CLOSED === Stats: {self.daily_stats}")
 
 
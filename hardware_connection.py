@@ -0,0 +1,142 @@
+# hardware_connection.py - połączenie z PM125 w tle: start bez czekania na tester, ponawianie i reconnect
+import logging
+import threading
+from typing import Callable, Optional
+
+from hardware_interface import PM125Interface
+
+logger = logging.getLogger(__name__)
+
+CONNECTING = "connecting"
+CONNECTED = "connected"
+DISCONNECTED = "disconnected"
+
+
+class HardwareConnection:
+    """
+    Wątek, który łączy się z testerem, sprawdza połączenie gdy nic nie testuje
+    i po odłączeniu (USB, zasilanie testera) łączy ponownie - bez restartu aplikacji.
+
+        connection = HardwareConnection(config, on_state=..., on_connected=...)
+        connection.start()
+        with connection.lock:      # test trzyma blokadę, sprawdzanie połączenia czeka
+            runner.run_full_test(...)
+
+    on_state(state, detail) i on_connected(hardware) są wołane z wątku połączenia.
+    """
+
+    def __init__(self, config, on_state: Callable[[str, str], None] = None,
+                 on_connected: Callable[[PM125Interface], None] = None):
+        self.config = config
+        self.on_state = on_state
+        self.on_connected = on_connected
+        self.hardware: Optional[PM125Interface] = None
+        self.state = DISCONNECTED
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.state == CONNECTED and self.hardware is not None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="pm125-connection", daemon=True)
+        self._thread.start()
+
+    def check_now(self):
+        """Sprawdź połączenie od razu (np. po teście z błędami komunikacji)"""
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        """Zatrzymaj wątek i rozłącz tester (obciążenie 0)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if not self.lock.acquire(timeout=timeout):
+            logger.warning("Zamykanie w trakcie testu - tester nie został rozłączony")
+            return
+        try:
+            if self.hardware:
+                self.hardware.disconnect()
+                self.hardware = None
+        finally:
+            self.lock.release()
+
+    def _set_state(self, state: str, detail: str = ""):
+        self.state = state
+        if self.on_state:
+            try:
+                self.on_state(state, detail)
+            except Exception as e:
+                logger.warning(f"Błąd obsługi stanu połączenia: {e}")
+
+    def _run(self):
+        retry = self.config.reconnect_interval
+        failures = 0
+        while not self._stop.is_set():
+            if self.hardware is None:
+                if self._connect(log_failure=failures == 0):
+                    retry = self.config.reconnect_interval
+                    failures = 0
+                    wait = self.config.connection_check_interval
+                else:
+                    failures += 1
+                    wait = retry
+                    retry = min(retry * 2, self.config.reconnect_max_interval)
+            else:
+                self._check()
+                wait = self.config.connection_check_interval if self.hardware else 0
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def _connect(self, log_failure: bool) -> bool:
+        self._set_state(CONNECTING)
+        try:
+            hardware = PM125Interface.from_config(self.config)
+        except Exception as e:
+            # przy kolejnych nieudanych próbach bez ostrzeżeń co kilka sekund
+            if log_failure:
+                logger.warning(f"Brak połączenia z PM125, ponawiam w tle: {e}")
+            else:
+                logger.debug(f"Ponowna próba połączenia nieudana: {e}")
+            self._set_state(DISCONNECTED, str(e).splitlines()[0] if str(e) else type(e).__name__)
+            return False
+
+        if self._stop.is_set():
+            hardware.disconnect()
+            return False
+
+        with self.lock:
+            self.hardware = hardware
+            if self.on_connected:
+                self.on_connected(hardware)
+        serial = hardware.device_serial
+        if serial == "Any":
+            serial = hardware.get_device_info().get('serial', serial)
+        logger.info(f"Połączono z PM125 ({serial})")
+        self._set_state(CONNECTED, serial)
+        return True
+
+    def _check(self):
+        # trwający test ma pierwszeństwo - sprawdzimy przy następnej okazji
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            try:
+                alive = self.hardware._test_connection()
+            except Exception as e:
+                logger.warning(f"Błąd sprawdzania połączenia z PM125: {e}")
+                alive = False
+            if alive:
+                return
+            logger.warning("Utracono połączenie z PM125 - ponowne łączenie")
+            # bez disconnect(): odłączony tester i tak nie przyjmie obciążenia 0
+            self.hardware.connected = False
+            self.hardware.transport.close()
+            self.hardware = None
+        finally:
+            self.lock.release()
+        self._set_state(DISCONNECTED)
@@ -4,20 +4,267 @@ import os
 import re
 import time
 import sys
+import queue
+import threading
 from typing import Optional, List, Dict
 
+from latency_stats import CommandLatencyStats
 
-class PM125Interface:
-    """Interfejs do testera PassMark PM125 przez USBPDConsole.exe"""
 
-    def __init__(self, console_path: str = None, device_serial: str = None):
+def _popen_kwargs() -> Dict[str, any]:
+    """Parametry procesu konsoli - na Windows bez widocznego okna"""
+    if sys.platform == 'win32':
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = 0
+        return {'startupinfo': startupinfo, 'creationflags': 0x08000000}
+    return {}
+
+
+class ConsoleSession:
+    """
+    Długo żyjący proces USBPDConsole - urządzenie zostaje otwarte między komendami.
+
+    Protokół ZAŁOŻONY, niepotwierdzony w dokumentacji PassMark: konsola uruchomiona
+    z session_args czyta ze stdin jedną komendę na linię (np. "-s" albo "-q 3000")
+    i po odpowiedzi wypisuje linię z terminatorem ("END" lub "END <kod>",
+    kod != 0 oznacza błąd). Konsola bez takiego trybu kończy się od razu -
+    ConsoleTransport po kilku nieudanych sesjach przechodzi na stałe na per_call.
+    """
+
+    def __init__(self, console_path: str, device_serial: str,
+                 session_args: List[str] = None, terminator: str = "END"):
+        self.console_path = console_path
+        self.device_serial = device_serial
+        self.session_args = list(session_args) if session_args is not None else ['-i']
+        self.terminator = terminator
+        self.process: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.timed_out = False   # ostatnia komenda zakończona timeoutem
+
+    def start(self) -> bool:
+        """Uruchom proces sesji; False jeśli konsola nie wystartowała"""
+        self.close()
+        cmd = [self.console_path, '-d', self.device_serial] + self.session_args
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                **_popen_kwargs()
+            )
+        except Exception as e:
+            print(f"Błąd uruchamiania sesji konsoli: {e}")
+            self.process = None
+            return False
+
+        self._lines = queue.Queue()
+        threading.Thread(target=self._reader, args=(self.process.stdout, self._lines), daemon=True).start()
+        return True
+
+    @staticmethod
+    def _reader(stream, lines: "queue.Queue[Optional[str]]"):
+        """Wątek czytający stdout sesji linia po linii (None = koniec strumienia)"""
+        try:
+            for line in stream:
+                lines.put(line.rstrip('\r\n'))
+        except Exception:
+            pass
+        finally:
+            lines.put(None)
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def execute(self, args: List[str], timeout: float = 5) -> Optional[str]:
         """
-        console_path: ścieżka do USBPDConsole.exe
-        device_serial: numer seryjny urządzenia PM125 (np. "PMPD111111")
-                      Jeśli None, użyje pierwszego dostępnego
+        Wyślij komendę do sesji i poczekaj na terminator
+        Zwraca output lub None jeśli błąd (po timeout sesja jest zamykana)
         """
+        with self._lock:
+            self.timed_out = False
+            if not self.is_alive() and not self.start():
+                return None
+
+            try:
+                self.process.stdin.write(' '.join(args) + '\n')
+                self.process.stdin.flush()
+            except Exception as e:
+                print(f"Błąd zapisu do sesji konsoli: {e}")
+                self.close()
+                return None
+
+            output_lines = []
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"Timeout sesji konsoli: {' '.join(args)}")
+                    self.timed_out = True
+                    self.close()
+                    return None
+                try:
+                    line = self._lines.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+
+                if line is None:
+                    print("Sesja konsoli zakończyła się nieoczekiwanie")
+                    self.close()
+                    return None
+
+                if line == self.terminator or line.startswith(self.terminator + ' '):
+                    code = line[len(self.terminator):].strip()
+                    if code and code != '0':
+                        print(f"Błąd komendy w sesji (kod {code}): {' '.join(output_lines)}")
+                        return None
+                    return '\n'.join(output_lines).strip()
+
+                output_lines.append(line)
+
+    def close(self):
+        """Zamknij proces sesji"""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.close()
+                try:
+                    process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait(timeout=1)
+        except Exception:
+            pass
+
+DEFAULT_CONSOLE_PATH = r"C:\Users\kacper.urbanowicz\Downloads\USBPDAPI_1.0.1016 (1)\USBPDConsole Release\USBPDConsole.exe"
+
+
+# ===== PARSOWANIE ODPOWIEDZI KONSOLI =====
+
+def parse_measurements(output: str) -> Optional[Dict[str, float]]:
+    """Wyciągnij napięcie i prąd z odpowiedzi na -s (w V i A)"""
+    try:
+        voltage_match = re.search(r'VOLTAGE[:\s]+(\d+)\s*mV', output)
+        if not voltage_match:
+            print(f"Nie znaleziono napięcia w: {output}")
+            return None
+        voltage_mv = int(voltage_match.group(1))
+
+        current_match = re.search(r'MEASURED CURRENT[:\s]+(\d+)\s*mA', output)
+        if not current_match:
+            print(f"Nie znaleziono prądu w: {output}")
+            return None
+        current_ma = int(current_match.group(1))
+
+        return {
+            'voltage': voltage_mv / 1000.0,
+            'current': current_ma / 1000.0
+        }
+
+    except Exception as e:
+        print(f"Błąd parsowania pomiarów: {e}")
+        return None
+
+
+def parse_profiles(output: str) -> List[Dict[str, any]]:
+    """Lista profili z odpowiedzi na -p"""
+    profiles = []
+    lines = output.split('\n')
+
+    for idx, line in enumerate(lines, start=1):
+        if 'VOLTAGE' in line or 'mV' in line:
+            voltage_match = re.search(r'(\d+)\s*mV', line)
+            current_match = re.search(r'(\d+)\s*mA', line)
+
+            if voltage_match:
+                profiles.append({
+                    'index': idx,
+                    'voltage_mv': int(voltage_match.group(1)),
+                    'current_ma': int(current_match.group(1)) if current_match else 0,
+                    'type': 'FIXED'
+                })
+
+    return profiles
+
+
+def parse_connection_status(output: str) -> Dict[str, any]:
+    """Status połączenia z odpowiedzi na -c"""
+    status = {
+        'connected': 'STATUS:CONNECTED' in output
+    }
+
+    if status['connected']:
+        voltage_match = re.search(r'SET VOLTAGE[:\s]+(\d+)\s*mV', output)
+        if voltage_match:
+            status['set_voltage_mv'] = int(voltage_match.group(1))
+            status['set_voltage_v'] = status['set_voltage_mv'] / 1000.0
+
+        current_match = re.search(r'MAX CURRENT[:\s]+(\d+)\s*mA', output)
+        if current_match:
+            status['max_current_ma'] = int(current_match.group(1))
+            status['max_current_a'] = status['max_current_ma'] / 1000.0
+
+    return status
+
+
+def parse_serials(output: str) -> List[str]:
+    """Numery seryjne z odpowiedzi na -f / -r"""
+    return re.findall(r'SERIAL[:\s]+(\w+)', output)
+
+
+# ===== WARSTWA TRANSPORTU =====
+
+class PM125Transport:
+    """
+    Bazowa klasa transportu do PM125 - surowe operacje bez opóźnień i walidacji.
+    PM125Interface dodaje nad nią czasy stabilizacji, zakresy i komunikaty.
+    """
+
+    def test_connection(self) -> bool:
+        raise NotImplementedError
+
+    def set_profile(self, profile_index: int) -> bool:
+        raise NotImplementedError
+
+    def set_load(self, current_ma: int, instant: bool = True) -> bool:
+        raise NotImplementedError
+
+    def read_measurements(self) -> Optional[Dict[str, float]]:
+        raise NotImplementedError
+
+    def get_device_info(self) -> Dict[str, str]:
+        raise NotImplementedError
+
+    def get_connection_status(self) -> Dict[str, any]:
+        raise NotImplementedError
+
+    def get_available_profiles(self) -> List[Dict[str, any]]:
+        raise NotImplementedError
+
+    def find_all_devices(self) -> List[str]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ConsoleTransport(PM125Transport):
+    """Transport przez USBPDConsole.exe (proces na komendę lub stała sesja)"""
+
+    # tyle razy z rzędu sesja może paść/nie wystartować, zanim transport zostanie przy per_call
+    SESSION_MAX_FAILURES = 3
+
+    def __init__(self, console_path: str = None, device_serial: str = "Any",
+                 console_mode: str = "per_call", session_args: List[str] = None,
+                 session_terminator: str = "END"):
         if console_path is None:
-            console_path = r"C:\Users\kacper.urbanowicz\Downloads\USBPDAPI_1.0.1016 (1)\USBPDConsole Release\USBPDConsole.exe"
+            console_path = DEFAULT_CONSOLE_PATH
 
         if not os.path.exists(console_path):
             raise FileNotFoundError(
@@ -26,51 +273,71 @@ class PM125Interface:
             )
 
         self.console_path = console_path
-        self.device_serial = device_serial if device_serial else "Any"
-        self.connected = False
-        self.current_profile = None
-
-        if not self._test_connection():
-            raise ConnectionError(
-                "Nie można połączyć z PM125.\n"
-                "Sprawdź czy:\n"
-                "1. Urządzenie jest podłączone przez Monitoring Port (USB Micro B)\n"
-                "2. Sterowniki są zainstalowane\n"
-                "3. Zasilacz jest podłączony do portu SINK"
-            )
-
-        self.connected = True
-        info = self.get_device_info()
-        print(f"✓ Połączono z PM125 (Serial: {info.get('serial', 'N/A')})")
-
-    def _run_command(self, *args, timeout: int = 5) -> Optional[str]:
+        self.device_serial = device_serial
+        self.session: Optional[ConsoleSession] = None
+        self.latency = CommandLatencyStats()
+        self._timed_out = False
+        self._session_failures = 0
+
+        if console_mode == "session":
+            self.session = ConsoleSession(console_path, device_serial,
+                                          session_args=session_args,
+                                          terminator=session_terminator)
+            if not self.session.start():
+                print("⚠ Sesja konsoli niedostępna - tryb per_call")
+                self.session = None
+        elif console_mode != "per_call":
+            raise ValueError(f"Nieznany tryb konsoli: {console_mode}")
+
+    def run_command(self, *args, timeout: int = 5) -> Optional[str]:
         """
         Uruchom komendę USBPDConsole BEZ WIDOCZNEJ KONSOLI
+        W trybie sesji komenda idzie do stałego procesu; jeśli sesja padła,
+        komenda jest wykonywana jednorazowo (fallback per_call)
         Zwraca output lub None jeśli błąd
+        Czas każdej komendy trafia do self.latency (per flaga, np. '-s')
         """
+        start = time.perf_counter()
+        output = self._run_command(*args, timeout=timeout)
+        if output is not None:
+            outcome = "ok"
+        else:
+            outcome = "timeout" if self._timed_out else "error"
+        self.latency.record(args[0] if args else "", time.perf_counter() - start, outcome)
+        return output
+
+    def _run_command(self, *args, timeout: int = 5) -> Optional[str]:
+        if self.session is not None:
+            output = self.session.execute(list(args), timeout=timeout)
+            self._timed_out = self.session.timed_out
+            if output is not None or self.session.is_alive():
+                self._session_failures = 0
+                return output
+            self._session_failures += 1
+            if self._session_failures >= self.SESSION_MAX_FAILURES:
+                # konsola nie obsługuje sesji - bez podwójnego procesu na każdą komendę
+                print(f"⚠ Sesja konsoli padła {self._session_failures} razy z rzędu - "
+                      f"dalej tylko tryb per_call")
+                self.session.close()
+                self.session = None
+            else:
+                print(f"⚠ Sesja konsoli niedostępna - fallback per_call: {' '.join(args)}")
+
+        return self._run_command_once(*args, timeout=timeout)
+
+    def _run_command_once(self, *args, timeout: int = 5) -> Optional[str]:
+        """Uruchom komendę w osobnym procesie USBPDConsole (tryb per_call)"""
+        self._timed_out = False
         try:
             cmd = [self.console_path, '-d', self.device_serial] + list(args)
 
-            if sys.platform == 'win32':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = 0
-
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                    startupinfo=startupinfo,
-                    creationflags=0x08000000
-                )
-            else:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout
-                )
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                **_popen_kwargs()
+            )
 
             if result.returncode == 0:
                 return result.stdout.strip()
@@ -81,17 +348,159 @@ class PM125Interface:
 
         except subprocess.TimeoutExpired:
             print(f"Timeout wykonania komendy: {' '.join(args)}")
+            self._timed_out = True
             return None
         except Exception as e:
             print(f"Błąd wykonania komendy: {e}")
             return None
 
+    def test_connection(self) -> bool:
+        output = self.run_command('-c')
+        return bool(output and 'STATUS:CONNECTED' in output)
+
+    def set_profile(self, profile_index: int) -> bool:
+        return self.run_command('-v', str(profile_index)) is not None
+
+    def set_load(self, current_ma: int, instant: bool = True) -> bool:
+        if instant:
+            output = self.run_command('-q', str(current_ma))
+        else:
+            output = self.run_command('-l', str(current_ma))
+        return output is not None
+
+    def read_measurements(self) -> Optional[Dict[str, float]]:
+        output = self.run_command('-s')
+        if not output:
+            return None
+        return parse_measurements(output)
+
+    def get_device_info(self) -> Dict[str, str]:
+        info = {'serial': self.device_serial}
+
+        output = self.run_command('-r')
+        if output:
+            info['config'] = output
+
+            serials = parse_serials(output)
+            if serials:
+                info['serial'] = serials[0]
+
+        return info
+
+    def get_connection_status(self) -> Dict[str, any]:
+        output = self.run_command('-c')
+        if not output:
+            return {'connected': False}
+        return parse_connection_status(output)
+
+    def get_available_profiles(self) -> List[Dict[str, any]]:
+        output = self.run_command('-p')
+        if not output:
+            print("Błąd pobierania profili")
+            return []
+        return parse_profiles(output)
+
+    def find_all_devices(self) -> List[str]:
+        output = self.run_command('-f')
+        if not output:
+            return []
+        return parse_serials(output)
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+
+def create_transport(transport: str = "console", console_path: str = None, device_serial: str = "Any",
+                     console_mode: str = "per_call", session_args: List[str] = None,
+                     session_terminator: str = "END", api_library_path: str = None,
+                     simulator_settings: Dict = None) -> PM125Transport:
+    """
+    Utwórz transport po nazwie
+    transport: "console" (USBPDConsole.exe), "api" (USBPDAPI przez ctypes)
+               lub "sim" (symulator w procesie, bez sprzętu)
+    """
+    if transport == "console":
+        return ConsoleTransport(console_path, device_serial, console_mode=console_mode,
+                                session_args=session_args, session_terminator=session_terminator)
+
+    if transport == "api":
+        from usbpd_api import USBPDApiTransport, default_library_path
+
+        if not api_library_path:
+            api_library_path = default_library_path(console_path or DEFAULT_CONSOLE_PATH)
+        return USBPDApiTransport(api_library_path, device_serial)
+
+    if transport == "sim":
+        from simulator import SimulatedTransport, SimulatorSettings
+
+        return SimulatedTransport(SimulatorSettings.from_dict(simulator_settings), device_serial)
+
+    raise ValueError(f"Nieznany transport: {transport}")
+
+
+class PM125Interface:
+    """Interfejs do testera PassMark PM125 (domyślnie przez USBPDConsole.exe)"""
+
+    def __init__(self, console_path: str = None, device_serial: str = None,
+                 console_mode: str = "per_call", session_args: List[str] = None,
+                 session_terminator: str = "END", transport="console",
+                 api_library_path: str = None, simulator_settings: Dict = None):
+        """
+        console_path: ścieżka do USBPDConsole.exe
+        device_serial: numer seryjny urządzenia PM125 (np. "PMPD111111")
+                      Jeśli None, użyje pierwszego dostępnego
+        console_mode: "per_call" (proces na komendę) lub "session" (stały proces,
+                      przy błędzie sesji komenda jest powtarzana w trybie per_call)
+        transport: "console", "api" (USBPDAPI w procesie), "sim" (symulator)
+                   lub gotowy PM125Transport
+        api_library_path: ścieżka do biblioteki USBPDAPI (domyślnie obok konsoli)
+        simulator_settings: parametry SimulatorSettings dla transportu "sim"
+        """
+        self.device_serial = device_serial if device_serial else "Any"
+        self.connected = False
+        self.current_profile = None
+
+        if isinstance(transport, PM125Transport):
+            self.transport = transport
+        else:
+            self.transport = create_transport(transport, console_path, self.device_serial,
+                                              console_mode=console_mode, session_args=session_args,
+                                              session_terminator=session_terminator,
+                                              api_library_path=api_library_path,
+                                              simulator_settings=simulator_settings)
+        self.console_path = getattr(self.transport, 'console_path', console_path)
+
+        if not self._test_connection():
+            self.transport.close()
+            raise ConnectionError(
+                "Nie można połączyć z PM125.\n"
+                "Sprawdź czy:\n"
+                "1. Urządzenie jest podłączone przez Monitoring Port (USB Micro B)\n"
+                "2. Sterowniki są zainstalowane\n"
+                "3. Zasilacz jest podłączony do portu SINK"
+            )
+
+        self.connected = True
+        info = self.get_device_info()
+        print(f"✓ Połączono z PM125 (Serial: {info.get('serial', 'N/A')})")
+
+    @classmethod
+    def from_config(cls, config, device_serial: str = None) -> "PM125Interface":
+        """Utwórz interfejs z ustawień TestConfig (device_serial nadpisuje config)"""
+        return cls(console_path=config.console_path,
+                   device_serial=device_serial or config.device_serial,
+                   console_mode=config.console_mode,
+                   session_args=config.console_session_args,
+                   session_terminator=config.console_session_terminator,
+                   transport=config.transport,
+                   api_library_path=config.api_library_path,
+                   simulator_settings=config.simulator_settings)
+
     def _test_connection(self) -> bool:
         """Test czy urządzenie jest połączone"""
-        output = self._run_command('-c')
-        if output and 'STATUS:CONNECTED' in output:
-            return True
-        return False
+        return self.transport.test_connection()
 
     def disconnect(self):
         """Rozłącz urządzenie (ustaw obciążenie na 0)"""
@@ -99,47 +508,26 @@ class PM125Interface:
             self.set_load(0)
             self.connected = False
             print("✓ Rozłączono z PM125 (obciążenie = 0mA)")
+        self.transport.close()
 
     def get_available_profiles(self) -> List[Dict[str, any]]:
         """
         Pobierz listę dostępnych profili
         Zwraca: lista dict z 'index', 'voltage_mv', 'current_ma', 'type'
         """
-        output = self._run_command('-p')
-
-        if not output:
-            print("Błąd pobierania profili")
-            return []
-
-        profiles = []
-        lines = output.split('\n')
+        return self.transport.get_available_profiles()
 
-        for idx, line in enumerate(lines, start=1):
-            if 'VOLTAGE' in line or 'mV' in line:
-                voltage_match = re.search(r'(\d+)\s*mV', line)
-                current_match = re.search(r'(\d+)\s*mA', line)
-
-                if voltage_match:
-                    profiles.append({
-                        'index': idx,
-                        'voltage_mv': int(voltage_match.group(1)),
-                        'current_ma': int(current_match.group(1)) if current_match else 0,
-                        'type': 'FIXED'
-                    })
-
-        return profiles
-
-    def set_profile(self, profile_index: int) -> bool:
+    def set_profile(self, profile_index: int, settle_delay: float = 0.5) -> bool:
         """
         Wybierz profil napięcia przez indeks
         profile_index: 1=5V, 2=9V, 3=12V, 4=15V (zazwyczaj)
+        settle_delay: stały czas na stabilizację [s] (0 = wywołujący czeka sam)
         """
         try:
-            output = self._run_command('-v', str(profile_index))
-
-            if output is not None:
+            if self.transport.set_profile(profile_index):
                 self.current_profile = profile_index
-                time.sleep(0.5)
+                if settle_delay > 0:
+                    time.sleep(settle_delay)
                 print(f"✓ Ustawiono profil #{profile_index}")
                 return True
 
@@ -170,7 +558,7 @@ class PM125Interface:
 
         return self.set_profile(profile_index)
 
-    def set_load(self, current_ma: int, instant: bool = True) -> bool:
+    def set_load(self, current_ma: int, instant: bool = True, settle_delay: float = None) -> bool:
         """
         Ustaw obciążenie w mA
 
@@ -178,19 +566,18 @@ class PM125Interface:
             current_ma: 0-5000 mA
             instant: True = instant jump (używa -q quick load)
                     False = slow ramp (używa -l normal load)
+            settle_delay: czas po zmianie [s]; None = 0.05s (instant) / 0.1s (ramp)
         """
         if not 0 <= current_ma <= 5000:
             print(f"✗ Prąd {current_ma}mA poza zakresem 0-5000mA")
             return False
 
         try:
-            if instant:
-                output = self._run_command('-q', str(current_ma))
-            else:
-                output = self._run_command('-l', str(current_ma))
-
-            if output is not None:
-                time.sleep(0.05 if instant else 0.1)
+            if self.transport.set_load(current_ma, instant):
+                if settle_delay is None:
+                    settle_delay = 0.05 if instant else 0.1
+                if settle_delay > 0:
+                    time.sleep(settle_delay)
                 return True
 
             return False
@@ -204,32 +591,7 @@ class PM125Interface:
         Odczytaj napięcie i prąd jednocześnie
         Zwraca: {'voltage': float, 'current': float} w V i A
         """
-        output = self._run_command('-s')
-
-        if not output:
-            return None
-
-        try:
-            voltage_match = re.search(r'VOLTAGE[:\s]+(\d+)\s*mV', output)
-            if not voltage_match:
-                print(f"Nie znaleziono napięcia w: {output}")
-                return None
-            voltage_mv = int(voltage_match.group(1))
-
-            current_match = re.search(r'MEASURED CURRENT[:\s]+(\d+)\s*mA', output)
-            if not current_match:
-                print(f"Nie znaleziono prądu w: {output}")
-                return None
-            current_ma = int(current_match.group(1))
-
-            return {
-                'voltage': voltage_mv / 1000.0,
-                'current': current_ma / 1000.0
-            }
-
-        except Exception as e:
-            print(f"Błąd parsowania pomiarów: {e}")
-            return None
+        return self.transport.read_measurements()
 
     def read_voltage(self) -> Optional[float]:
         """Odczytaj tylko napięcie"""
@@ -243,51 +605,25 @@ class PM125Interface:
 
     def get_device_info(self) -> Dict[str, str]:
         """Pobierz informacje o urządzeniu"""
-        info = {'serial': self.device_serial}
-
-        output = self._run_command('-r')
-        if output:
-            info['config'] = output
-
-            serial_match = re.search(r'SERIAL[:\s]+(\w+)', output)
-            if serial_match:
-                info['serial'] = serial_match.group(1)
-
-        return info
+        return self.transport.get_device_info()
 
     def get_connection_status(self) -> Dict[str, any]:
         """Pobierz szczegółowy status połączenia"""
-        output = self._run_command('-c')
-
-        if not output:
-            return {'connected': False}
-
-        status = {
-            'connected': 'STATUS:CONNECTED' in output
-        }
-
-        if status['connected']:
-            voltage_match = re.search(r'SET VOLTAGE[:\s]+(\d+)\s*mV', output)
-            if voltage_match:
-                status['set_voltage_mv'] = int(voltage_match.group(1))
-                status['set_voltage_v'] = status['set_voltage_mv'] / 1000.0
-
-            current_match = re.search(r'MAX CURRENT[:\s]+(\d+)\s*mA', output)
-            if current_match:
-                status['max_current_ma'] = int(current_match.group(1))
-                status['max_current_a'] = status['max_current_ma'] / 1000.0
-
-        return status
+        return self.transport.get_connection_status()
 
     def find_all_devices(self) -> List[str]:
         """Znajdź wszystkie podłączone urządzenia PM125"""
-        output = self._run_command('-f')
+        return self.transport.find_all_devices()
 
-        if not output:
-            return []
+    def command_latency(self) -> Dict[str, Dict[str, float]]:
+        """Czasy komend per flaga konsoli (p50/p95/p99/max, timeouty, błędy); {} jeśli transport nie mierzy"""
+        latency = getattr(self.transport, 'latency', None)
+        return latency.snapshot() if latency is not None else {}
 
-        serials = re.findall(r'SERIAL[:\s]+(\w+)', output)
-        return serials
+    def reset_command_latency(self):
+        latency = getattr(self.transport, 'latency', None)
+        if latency is not None:
+            latency.reset()
 
 
 def test_device_connection(console_path: str = None) -> bool:
@@ -0,0 +1,106 @@
+# latency_stats.py - histogramy czasu odpowiedzi komend testera (p50/p95/p99/max, timeouty, błędy)
+import bisect
+import math
+import time
+from typing import Dict, Optional
+
+# Granice kubełków: 0.1 ms .. 100 s, logarytmicznie, 20 na dekadę (błąd percentyla < 12%)
+_BUCKETS_PER_DECADE = 20
+BUCKET_BOUNDS = [10 ** (-4 + i / _BUCKETS_PER_DECADE) for i in range(6 * _BUCKETS_PER_DECADE + 1)]
+
+
+class LatencyHistogram:
+    """
+    Histogram czasów jednej komendy o stałej liczbie kubełków - zapis to bisect
+    i inkrementacja, bez blokady (każdy transport ma własne liczniki, a pod GIL
+    rzadki wyścig dwóch wątków gubi najwyżej jedną próbkę statystyki)
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'max', 'timeouts', 'errors')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+        self.errors = 0
+
+    def record(self, seconds: float, outcome: str = "ok"):
+        """outcome: "ok", "timeout" lub "error" (czas liczony dla wszystkich)"""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if outcome == "timeout":
+            self.timeouts += 1
+        elif outcome == "error":
+            self.errors += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Górna granica kubełka zawierającego p-ty percentyl (nie więcej niż max)"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max if self.count else None,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+        }
+
+
+class CommandLatencyStats:
+    """
+    Histogram per komenda konsoli ('-s', '-q', '-l', '-v', '-c', '-r', ...)
+
+        stats.record('-s', 0.012)
+        stats.snapshot()['-s']['p95']
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.since = time.time()
+
+    def record(self, command: str, seconds: float, outcome: str = "ok"):
+        histogram = self.histograms.get(command)
+        if histogram is None:
+            histogram = self.histograms.setdefault(command, LatencyHistogram())
+        histogram.record(seconds, outcome)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {command: histogram.snapshot() for command, histogram in sorted(self.histograms.items())}
+
+    def reset(self):
+        self.histograms = {}
+        self.since = time.time()
+
+    def format_table(self) -> str:
+        return format_latency_table(self.snapshot())
+
+
+def format_latency_table(snapshot: Dict[str, Dict[str, float]]) -> str:
+    """Tabela tekstowa ze snapshot() - czasy w ms"""
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.1f}"
+
+    lines = [f"{'Komenda':<8} {'N':>7} {'p50[ms]':>8} {'p95[ms]':>8} {'p99[ms]':>8} "
+             f"{'max[ms]':>8} {'Timeout':>7} {'Błędy':>6}"]
+    for command, s in snapshot.items():
+        lines.append(f"{command:<8} {s['count']:>7} {ms(s['p50']):>8} {ms(s['p95']):>8} {ms(s['p99']):>8} "
+                     f"{ms(s['max']):>8} {s['timeouts']:>7} {s['errors']:>6}")
+    return "\n".join(lines)
@@ -0,0 +1,124 @@
+# live_chart.py - wykres napięcia/prądu na żywo w oknie testu (Tk Canvas, aktualizacja elementów w miejscu)
+import tkinter as tk
+from collections import deque
+from typing import Dict, List
+
+
+class SampleQueue:
+    """
+    Bufor próbek z wątku testu do pętli Tk. put() to dopisanie do deque,
+    drain() zabiera wszystko naraz - jedno odświeżenie wykresu na wiele próbek.
+    Przy zatrzymanym GUI najstarsze próbki wypadają (maxlen), wątek testu nigdy nie czeka.
+    """
+
+    def __init__(self, maxlen: int = 5000):
+        self._samples = deque(maxlen=maxlen)
+
+    def put(self, **sample):
+        self._samples.append(sample)
+
+    def drain(self) -> List[Dict]:
+        # popleft jest atomowe - próbka dopisana w trakcie zostaje na następną klatkę
+        samples = []
+        try:
+            while True:
+                samples.append(self._samples.popleft())
+        except IndexError:
+            pass
+        return samples
+
+
+class LiveChart:
+    """
+    Przewijany wykres napięcia (z pasem limitów profilu) i prądu.
+    Elementy Canvas tworzone raz; odświeżenie to tylko coords()/itemconfig()
+    co frame_ms, i tylko gdy przyszły nowe próbki.
+    """
+
+    def __init__(self, parent, samples: SampleQueue, width: int = 520, height: int = 220,
+                 points: int = 200, frame_ms: int = 100, colors: Dict[str, str] = None):
+        colors = colors or {}
+        self.samples = samples
+        self.width = width
+        self.height = height
+        self.frame_ms = frame_ms
+        self.voltage = deque(maxlen=points)
+        self.current = deque(maxlen=points)
+        self.points = points
+        self.limits = None
+        self.profile_name = ""
+        self.pad = 6
+
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg="white", highlightthickness=1,
+                                highlightbackground=colors.get('border', "#CCCCCC"))
+        self.band = self.canvas.create_rectangle(0, 0, 0, 0, fill="#E3F2E3", outline="")
+        self.limit_lines = [self.canvas.create_line(0, 0, 0, 0, fill="#4CAF50", dash=(4, 2)) for _ in range(2)]
+        self.current_line = self.canvas.create_line(0, 0, 0, 0, fill=colors.get('accent', "#FF9800"), width=1)
+        self.voltage_line = self.canvas.create_line(0, 0, 0, 0, fill=colors.get('primary', "#1565C0"), width=2)
+        self.title = self.canvas.create_text(self.pad, self.pad, anchor='nw', font=("Arial", 9, "bold"), text="")
+        self.value = self.canvas.create_text(width - self.pad, self.pad, anchor='ne', font=("Arial", 10, "bold"),
+                                             text="")
+        self.scale = self.canvas.create_text(self.pad, height - self.pad, anchor='sw', font=("Arial", 8),
+                                             fill="#666666", text="")
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def start(self):
+        self.canvas.after(self.frame_ms, self._pump)
+
+    def _pump(self):
+        if not self.canvas.winfo_exists():
+            return
+        batch = self.samples.drain()
+        if batch:
+            self._add(batch)
+            self._redraw()
+        self.canvas.after(self.frame_ms, self._pump)
+
+    def _add(self, batch: List[Dict]):
+        for sample in batch:
+            limits = (sample.get('min_voltage'), sample.get('max_voltage'))
+            if limits != self.limits:
+                # nowy profil - inna skala napięcia, wykres od zera
+                self.limits = limits
+                self.voltage.clear()
+                self.current.clear()
+            self.profile_name = sample.get('profile_name', "")
+            self.voltage.append(sample['voltage'])
+            self.current.append(sample['current'])
+
+    def _y(self, value: float, low: float, high: float) -> float:
+        top, bottom = 22, self.height - 18
+        return bottom - (value - low) / (high - low) * (bottom - top)
+
+    def _redraw(self):
+        low_limit, high_limit = self.limits
+        values = list(self.voltage)
+        low = min(values + ([low_limit] if low_limit is not None else []))
+        high = max(values + ([high_limit] if high_limit is not None else []))
+        margin = max(0.1, (high - low) * 0.1)
+        low, high = low - margin, high + margin
+
+        step = (self.width - 2 * self.pad) / max(1, self.points - 1)
+        xs = [self.pad + i * step for i in range(len(values))]
+
+        if len(values) > 1:
+            self.canvas.coords(self.voltage_line,
+                               *[c for x, v in zip(xs, values) for c in (x, self._y(v, low, high))])
+            current_high = max(1.0, max(self.current) * 1.1)
+            self.canvas.coords(self.current_line,
+                               *[c for x, i in zip(xs, self.current) for c in (x, self._y(i, 0.0, current_high))])
+
+        if low_limit is not None and high_limit is not None:
+            y_high, y_low = self._y(high_limit, low, high), self._y(low_limit, low, high)
+            self.canvas.coords(self.band, self.pad, y_high, self.width - self.pad, y_low)
+            for line, y in zip(self.limit_lines, (y_high, y_low)):
+                self.canvas.coords(line, self.pad, y, self.width - self.pad, y)
+
+        voltage, current = values[-1], self.current[-1]
+        in_range = low_limit is None or low_limit <= voltage <= high_limit
+        self.canvas.itemconfig(self.title, text=self.profile_name)
+        self.canvas.itemconfig(self.value, text=f"{voltage:.2f} V   {current:.3f} A",
+                               fill="#2E7D32" if in_range else "#C62828")
+        self.canvas.itemconfig(self.scale, text=f"{low:.2f} - {high:.2f} V")
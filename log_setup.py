@@ -0,0 +1,101 @@
+# log_setup.py - logowanie GUI: kolejka + wątek zapisu, poziomy per moduł, rotacja po rozmiarze z gzip
+import atexit
+import glob
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from datetime import datetime, timedelta
+from typing import Dict
+
+LOG_FILENAME = "psu19_log.txt"
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+
+# Grupy z config.log_levels -> loggery modułów; "root" = wszystko inne (PIL, biblioteki)
+LOG_GROUPS = {
+    'hardware': ['hardware_interface', 'hardware_connection', 'usbpd_api', 'simulator', 'fixture_pool'],
+    'runner': ['test_runner', 'batch_runner', 'spc'],
+    'database': ['database', 'waveform_archive', 'serial_index'],
+    'gui': ['__main__', 'gui', 'assets', 'live_chart'],
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str):
+    """Zamknięty segment logu -> .gz (w wątku zapisu, nie w wątku testu)"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def start_logging(filename: str = LOG_FILENAME, max_bytes: int = 10 * 1024 * 1024,
+                  backup_count: int = 10) -> logging.handlers.QueueListener:
+    """
+    Root logger dostaje tylko QueueHandler - wywołanie logger.x() w wątku testu to
+    sformatowanie wiadomości i włożenie do kolejki. Plik zapisuje QueueListener w tle.
+    Po przekroczeniu max_bytes plik przechodzi w psu19_log.txt.1.gz (najwyżej backup_count segmentów).
+    """
+    file_handler = logging.handlers.RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count,
+                                                        encoding='utf-8')
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    # przy zamknięciu dopisz wszystko, co zostało w kolejce
+    atexit.register(stop_logging, listener)
+
+    set_log_levels({})
+    cleanup_old_logs()
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener):
+    """Opróżnij kolejkę i zatrzymaj wątek zapisu (wielokrotne wywołanie bez błędu)"""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def set_log_levels(levels: Dict[str, str]):
+    """Poziomy z config.log_levels; brak grupy = DEBUG, brak 'root' = INFO"""
+    logging.getLogger().setLevel(levels.get('root', "INFO"))
+    for group, names in LOG_GROUPS.items():
+        level = levels.get(group, "DEBUG")
+        for name in names:
+            logging.getLogger(name).setLevel(level)
+
+
+def configure_logging(listener: logging.handlers.QueueListener, config):
+    """Ustawienia z TestConfig (wczytanego już po starcie logowania)"""
+    set_log_levels(config.log_levels)
+    for handler in listener.handlers:
+        if isinstance(handler, logging.handlers.RotatingFileHandler):
+            handler.maxBytes = config.log_max_bytes
+            handler.backupCount = config.log_backup_count
+
+
+def cleanup_old_logs(days: int = 7):
+    """Dzienne logi psu19_log_RRRRMMDD.txt sprzed rotacji - usuń starsze niż days"""
+    cutoff_date = datetime.now() - timedelta(days=days)
+    for log_file in glob.glob("psu19_log_*.txt"):
+        try:
+            date_str = log_file.replace("psu19_log_", "").replace(".txt", "")
+            if datetime.strptime(date_str, "%Y%m%d") < cutoff_date:
+                os.remove(log_file)
+                logger.info(f"Usunięto stary log: {log_file}")
+        except (ValueError, OSError) as e:
+            logger.warning(f"Nie można usunąć {log_file}: {e}")
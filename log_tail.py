@@ -0,0 +1,122 @@
+# log_tail.py - ogon logu czytany od końca pliku i śledzenie dopisywanych linii (okno inżynieryjne)
+import logging
+import os
+import re
+from typing import List, Optional
+
+# '2026-10-17 12:00:00,123 [WARNING] ...' - linie bez nagłówka (traceback) należą do poprzedniego wpisu
+RECORD_RE = re.compile(r'^\d{4}-\d{2}-\d{2} [\d:,.]+ \[(\w+)\]')
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+
+def line_level(line: str) -> Optional[int]:
+    """Poziom wpisu z nagłówka linii albo None dla linii kontynuacji"""
+    match = RECORD_RE.match(line)
+    if not match:
+        return None
+    level = logging.getLevelName(match.group(1))
+    return level if isinstance(level, int) else logging.NOTSET
+
+
+def tail_lines(path: str, n: int = 100, min_level: int = logging.NOTSET, end: int = None,
+               block_size: int = 64 * 1024, max_bytes: int = 8 * 1024 * 1024) -> List[str]:
+    """
+    Ostatnie n wpisów logu o poziomie >= min_level (z liniami kontynuacji), bez końców linii.
+    Czyta blokami od końca pliku - koszt zależy od n, nie od rozmiaru logu;
+    przy ostrym filtrze poziomu skanuje najwyżej max_bytes.
+    """
+    records = []   # od najnowszego
+    pending = []   # linie kontynuacji czekające na swój nagłówek (od najnowszej)
+
+    def take(raw: bytes) -> bool:
+        nonlocal pending
+        line = raw.decode('utf-8', errors='replace').rstrip('\r')
+        if not line:
+            return False
+        level = line_level(line)
+        if level is None:
+            pending.append(line)
+            return False
+        if level >= min_level:
+            records.append([line] + pending[::-1])
+        pending = []
+        return len(records) >= n
+
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END) if end is None else end
+        stop = max(0, pos - max_bytes)
+        head = b''
+        done = False
+        while pos > stop and not done:
+            size = min(block_size, pos - stop)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + head).split(b'\n')
+            # pierwsza linia bloku może być ucięta - dokończy ją następny blok
+            head = lines.pop(0) if pos > 0 else b''
+            for raw in reversed(lines):
+                if take(raw):
+                    done = True
+                    break
+
+    return [line for record in reversed(records) for line in record]
+
+
+class LogFollower:
+    """
+    Przyrostowe czytanie logu: tail() raz przy otwarciu, potem poll() na timerze
+    czyta tylko bajty dopisane od ostatniego razu. Skrócenie lub podmiana pliku
+    (rotacja) - czytanie od początku nowego pliku.
+    """
+
+    def __init__(self, path: str, min_level: int = logging.NOTSET, max_read: int = 1024 * 1024):
+        self.path = path
+        self.min_level = min_level
+        self.max_read = max_read
+        self.offset = 0
+        self.inode = None
+        self.partial = b''
+        self.keep = True  # czy linie kontynuacji bieżącego wpisu przechodzą filtr
+
+    def tail(self, n: int = 100) -> List[str]:
+        stat = os.stat(self.path)
+        self.offset, self.inode, self.partial, self.keep = stat.st_size, stat.st_ino, b'', True
+        return tail_lines(self.path, n, self.min_level, end=stat.st_size)
+
+    def poll(self) -> List[str]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.offset, self.inode, self.partial = 0, stat.st_ino, b''
+        if stat.st_size == self.offset:
+            return []
+
+        skipped = stat.st_size - self.offset > self.max_read
+        if skipped:
+            # zalew logu - pokaż najnowsze max_read bajtów, zaczynając od pełnej linii
+            self.offset, self.partial = stat.st_size - self.max_read, b''
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        self.offset += len(data)
+
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        if skipped and lines:
+            lines.pop(0)
+        return self._filter(lines)
+
+    def _filter(self, lines: List[bytes]) -> List[str]:
+        result = []
+        for raw in lines:
+            line = raw.decode('utf-8', errors='replace').rstrip('\r')
+            level = line_level(line)
+            if level is not None:
+                self.keep = level >= self.min_level
+            if self.keep and line:
+                result.append(line)
+        return result
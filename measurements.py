@@ -0,0 +1,158 @@
+# measurements.py - kolumnowy bufor próbek (array('d') zamiast listy słowników)
+from array import array
+from typing import Dict, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy opcjonalny - bez niego liczymy na array wbudowanymi funkcjami
+    np = None
+
+
+class SampleBuffer:
+    """
+    Próbki jednego etapu w trzech kolumnach float64 (czas, napięcie, prąd).
+    Zachowuje się jak dawna lista {'time','voltage','current'} przy len(), iteracji
+    i indeksowaniu, ale statystyki liczy na całych kolumnach (numpy jeśli dostępny).
+    """
+
+    __slots__ = ('time', 'voltage', 'current')
+
+    def __init__(self):
+        self.time = array('d')
+        self.voltage = array('d')
+        self.current = array('d')
+
+    def append(self, time_sec: float, voltage: float, current: float):
+        self.time.append(time_sec)
+        self.voltage.append(voltage)
+        self.current.append(current)
+
+    def __len__(self) -> int:
+        return len(self.voltage)
+
+    def __bool__(self) -> bool:
+        return len(self.voltage) > 0
+
+    def __getitem__(self, index: int) -> Dict[str, float]:
+        return {'time': self.time[index], 'voltage': self.voltage[index], 'current': self.current[index]}
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        for t, v, i in zip(self.time, self.voltage, self.current):
+            yield {'time': t, 'voltage': v, 'current': i}
+
+    def __repr__(self) -> str:
+        return f"SampleBuffer({len(self)} próbek)"
+
+    def _column(self, name: str):
+        """Kolumna jako widok numpy (bez kopiowania) albo surowy array"""
+        column = getattr(self, name)
+        if np is not None:
+            return np.frombuffer(column, dtype=np.float64)
+        return column
+
+    def min_voltage(self) -> Optional[float]:
+        if not self:
+            return None
+        return float(self._column('voltage').min()) if np is not None else min(self.voltage)
+
+    def max_voltage(self) -> Optional[float]:
+        if not self:
+            return None
+        return float(self._column('voltage').max()) if np is not None else max(self.voltage)
+
+    def sum_voltage(self) -> float:
+        return float(self._column('voltage').sum()) if np is not None else sum(self.voltage)
+
+    def mean_voltage(self) -> Optional[float]:
+        if not self:
+            return None
+        return self.sum_voltage() / len(self)
+
+    def mean_current(self) -> Optional[float]:
+        if not self:
+            return None
+        total = float(self._column('current').sum()) if np is not None else sum(self.current)
+        return total / len(self)
+
+    def count_out_of_range(self, min_v: float, max_v: float) -> int:
+        """Liczba próbek napięcia poza [min_v, max_v]"""
+        if not self:
+            return 0
+        if np is not None:
+            voltage = self._column('voltage')
+            return int(np.count_nonzero((voltage < min_v) | (voltage > max_v)))
+        return sum(1 for v in self.voltage if not min_v <= v <= max_v)
+
+    def all_in_range(self, min_v: float, max_v: float) -> bool:
+        if np is not None:
+            return self.count_out_of_range(min_v, max_v) == 0
+        return all(min_v <= v <= max_v for v in self.voltage)
+
+
+class RunningStats:
+    """
+    Statystyki etapu aktualizowane przy każdej próbce (Welford) - odczyt O(1)
+    bez przeglądania bufora: liczba, średnia, wariancja, min/max napięcia,
+    średni prąd i liczba próbek poza zakresem profilu.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'current_sum', 'out_of_range')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.current_sum = 0.0
+        self.out_of_range = 0
+
+    def add(self, voltage: float, current: float, in_range: bool = True):
+        self.count += 1
+        delta = voltage - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (voltage - self.mean)
+
+        if self.min is None or voltage < self.min:
+            self.min = voltage
+        if self.max is None or voltage > self.max:
+            self.max = voltage
+
+        self.current_sum += current
+        if not in_range:
+            self.out_of_range += 1
+
+    @property
+    def sum(self) -> float:
+        return self.mean * self.count
+
+    @property
+    def variance(self) -> float:
+        """Wariancja z próby (n-1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+    @property
+    def mean_current(self) -> float:
+        return self.current_sum / self.count if self.count else 0.0
+
+    def merged(self, other: "RunningStats") -> "RunningStats":
+        """Połącz statystyki dwóch etapów (wzór Chana) bez dostępu do próbek"""
+        result = RunningStats()
+        result.count = self.count + other.count
+        if result.count == 0:
+            return result
+
+        delta = other.mean - self.mean
+        result.mean = self.mean + delta * other.count / result.count
+        result.m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / result.count
+        mins = [v for v in (self.min, other.min) if v is not None]
+        maxs = [v for v in (self.max, other.max) if v is not None]
+        result.min = min(mins) if mins else None
+        result.max = max(maxs) if maxs else None
+        result.current_sum = self.current_sum + other.current_sum
+        result.out_of_range = self.out_of_range + other.out_of_range
+        return result
@@ -0,0 +1,211 @@
+# report_aggregator.py - zestawienia uzysku i czasu cyklu ze wszystkich raportów CSV
+import argparse
+import csv
+import glob
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# Kolumny raportu (CSVDatabase._get_headers): data, HRID, serial, 4 x (wynik, min, max), wynik, czas
+PROFILE_COLUMNS = [('5V', 3), ('9V', 6), ('12V', 9), ('15V', 12)]
+FINAL_STATUS_COLUMN = 15
+DURATION_COLUMN = 16
+HEADER_FIRST_CELL = "Data i godzina"
+
+
+def parse_decimal(value: str) -> Optional[float]:
+    """'4,86' -> 4.86; 'N/A' / puste -> None"""
+    try:
+        return float(value.replace(',', '.', 1))
+    except ValueError:
+        return None
+
+
+class Bucket:
+    """Liczniki jednej grupy (dzień / HRID / profil) - łączone między plikami"""
+
+    __slots__ = ('total', 'passed', 'duration_sum', 'duration_count', 'duration_min', 'duration_max',
+                 'v_min', 'v_max')
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.duration_sum = 0.0
+        self.duration_count = 0
+        self.duration_min = None
+        self.duration_max = None
+        self.v_min = None
+        self.v_max = None
+
+    def add(self, passed: bool, duration: Optional[float] = None,
+            v_min: Optional[float] = None, v_max: Optional[float] = None):
+        self.total += 1
+        self.passed += passed
+        if duration is not None:
+            self.duration_sum += duration
+            self.duration_count += 1
+            self.duration_min = duration if self.duration_min is None else min(self.duration_min, duration)
+            self.duration_max = duration if self.duration_max is None else max(self.duration_max, duration)
+        if v_min is not None:
+            self.v_min = v_min if self.v_min is None else min(self.v_min, v_min)
+        if v_max is not None:
+            self.v_max = v_max if self.v_max is None else max(self.v_max, v_max)
+
+    def merge(self, other: "Bucket"):
+        self.total += other.total
+        self.passed += other.passed
+        self.duration_sum += other.duration_sum
+        self.duration_count += other.duration_count
+        for name, pick in (('duration_min', min), ('duration_max', max), ('v_min', min), ('v_max', max)):
+            values = [v for v in (getattr(self, name), getattr(other, name)) if v is not None]
+            setattr(self, name, pick(values) if values else None)
+
+    @property
+    def pass_rate(self) -> float:
+        return 100.0 * self.passed / self.total if self.total else 0.0
+
+    @property
+    def avg_duration(self) -> Optional[float]:
+        return self.duration_sum / self.duration_count if self.duration_count else None
+
+
+class ReportAggregate:
+    """Zestawienie w jednym przebiegu: per dzień, per HRID, per profil"""
+
+    def __init__(self):
+        self.rows = 0
+        self.bad_rows = 0
+        self.by_day: Dict[str, Bucket] = {}
+        self.by_hrid: Dict[str, Bucket] = {}
+        self.by_profile: Dict[str, Bucket] = {}
+
+    @staticmethod
+    def _bucket(groups: Dict[str, Bucket], key: str) -> Bucket:
+        bucket = groups.get(key)
+        if bucket is None:
+            bucket = groups[key] = Bucket()
+        return bucket
+
+    def add_row(self, row: List[str]):
+        if len(row) <= DURATION_COLUMN:
+            self.bad_rows += 1
+            return
+
+        self.rows += 1
+        passed = row[FINAL_STATUS_COLUMN] == "PASS"
+        duration = parse_decimal(row[DURATION_COLUMN])
+        self._bucket(self.by_day, row[0][:10]).add(passed, duration)
+        self._bucket(self.by_hrid, row[1]).add(passed, duration)
+
+        for name, column in PROFILE_COLUMNS:
+            status = row[column]
+            if status in ("PASS", "FAIL"):
+                self._bucket(self.by_profile, name).add(
+                    status == "PASS", v_min=parse_decimal(row[column + 1]), v_max=parse_decimal(row[column + 2]))
+
+    def add_file(self, filename: str):
+        with open(filename, 'r', newline='', encoding='utf-8-sig') as f:
+            for row in csv.reader(f, delimiter=';'):
+                if row and row[0] != HEADER_FIRST_CELL:
+                    self.add_row(row)
+
+    def merge(self, other: "ReportAggregate"):
+        self.rows += other.rows
+        self.bad_rows += other.bad_rows
+        for mine, theirs in ((self.by_day, other.by_day), (self.by_hrid, other.by_hrid),
+                             (self.by_profile, other.by_profile)):
+            for key, bucket in theirs.items():
+                self._bucket(mine, key).merge(bucket)
+
+
+def aggregate_file(filename: str) -> ReportAggregate:
+    aggregate = ReportAggregate()
+    aggregate.add_file(filename)
+    return aggregate
+
+
+def aggregate_reports(filenames: List[str], workers: int = 1) -> ReportAggregate:
+    """Strumieniowo po wszystkich plikach; workers > 1 - jeden proces na plik"""
+    total = ReportAggregate()
+    if workers > 1 and len(filenames) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for aggregate in pool.map(aggregate_file, filenames):
+                total.merge(aggregate)
+    else:
+        for filename in filenames:
+            total.add_file(filename)
+    return total
+
+
+def _format(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}".replace('.', ',')
+
+
+def _table(title: str, key_name: str, groups: Dict[str, Bucket], voltages: bool = False,
+           order: List[str] = None) -> List[List[str]]:
+    if voltages:
+        header = [key_name, "Testow", "PASS", "FAIL", "Uzysk [%]", "Min napiecie [V]", "Max napiecie [V]"]
+    else:
+        header = [key_name, "Testow", "PASS", "FAIL", "Uzysk [%]", "Sredni czas [s]", "Min czas [s]",
+                  "Max czas [s]"]
+    rows = [[title], header]
+    for key in (order if order is not None else sorted(groups)):
+        b = groups.get(key)
+        if b is None:
+            continue
+        row = [key, str(b.total), str(b.passed), str(b.total - b.passed), _format(b.pass_rate)]
+        if voltages:
+            row += [_format(b.v_min), _format(b.v_max)]
+        else:
+            row += [_format(b.avg_duration), _format(b.duration_min), _format(b.duration_max)]
+        rows.append(row)
+    return rows
+
+
+def summary_tables(aggregate: ReportAggregate) -> List[List[List[str]]]:
+    return [
+        _table("Uzysk per dzien", "Dzien", aggregate.by_day),
+        _table("Uzysk per HRID", "HRID", aggregate.by_hrid),
+        _table("Uzysk per profil", "Profil", aggregate.by_profile, voltages=True,
+               order=[name for name, _ in PROFILE_COLUMNS]),
+    ]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Zestawienie uzysku i czasu cyklu z raportów CSV")
+    parser.add_argument('files', nargs='*',
+                        help="pliki raportów (domyślnie raport_testow_*.csv, z backupami)")
+    parser.add_argument('--workers', type=int, default=1, help="procesy równoległe (jeden plik na proces)")
+    parser.add_argument('--csv', dest='output', default=None,
+                        help="zapisz tabele do pliku CSV (średnik, przecinek dziesiętny)")
+    args = parser.parse_args(argv)
+
+    filenames = args.files or sorted(glob.glob("raport_testow_*.csv"))
+    if not filenames:
+        print("Brak plików raportów")
+        return 1
+
+    aggregate = aggregate_reports(filenames, workers=args.workers)
+    tables = summary_tables(aggregate)
+
+    print(f"Plików: {len(filenames)}, wierszy: {aggregate.rows}"
+          + (f", pominiętych (uszkodzone): {aggregate.bad_rows}" if aggregate.bad_rows else ""))
+    for table in tables:
+        print()
+        print(table[0][0])
+        widths = [max(len(row[i]) for row in table[1:] if i < len(row)) for i in range(len(table[1]))]
+        for row in table[1:]:
+            print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f, delimiter=';')
+            for table in tables:
+                writer.writerows(table)
+                writer.writerow([])
+        print(f"\n✓ Zestawienie zapisane do: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# sampling.py - próbkowanie w stałym rytmie (siatka czasu zamiast sleep po odczycie)
+import math
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+
+@dataclass
+class SamplingStats:
+    """Faktyczna gęstość próbkowania jednego etapu"""
+    requested_rate: float       # [próbek/s] z measurement_interval (0 = bez limitu)
+    achieved_rate: float        # [próbek/s] udane odczyty / czas etapu (przerwany: pełne sloty)
+    samples: int
+    failed_reads: int
+    missed_slots: int           # sloty siatki pominięte, bo odczyt trwał za długo
+    duration: float
+
+    def to_dict(self):
+        return {
+            'requested_rate': self.requested_rate,
+            'achieved_rate': self.achieved_rate,
+            'samples': self.samples,
+            'failed_reads': self.failed_reads,
+            'missed_slots': self.missed_slots,
+            'duration': self.duration
+        }
+
+
+class FixedRateScheduler:
+    """
+    Iterator zwracający czas (od startu etapu) kolejnych slotów siatki co `interval`.
+    Czas liczony z time.perf_counter(), więc nie dryfuje o czas odczytu;
+    jeśli odczyt przekroczy slot, zaległe sloty są pomijane i liczone w missed_slots.
+
+        scheduler = FixedRateScheduler(0.05, 2.5)
+        for elapsed in scheduler:
+            ok = read()
+            scheduler.record(ok)
+        stats = scheduler.stats()
+    """
+
+    def __init__(self, interval: float, duration: float):
+        self.interval = max(0.0, interval)
+        self.duration = duration
+        self.start = None
+        self.samples = 0
+        self.failed_reads = 0
+        self.missed_slots = 0
+        self.elapsed = 0.0
+        self.stopped = False
+
+    def __iter__(self) -> Iterator[float]:
+        self.start = time.perf_counter()
+        slot = 0
+        total_slots = math.ceil(self.duration / self.interval) if self.interval > 0 else 0
+
+        while not self.stopped:
+            now = time.perf_counter() - self.start
+            if now >= self.duration:
+                break
+
+            yield now
+
+            if self.interval <= 0:
+                continue
+
+            finished = time.perf_counter() - self.start
+            next_slot = max(slot + 1, math.ceil(finished / self.interval))
+            self.missed_slots += min(next_slot, total_slots) - min(slot + 1, total_slots)
+            slot = next_slot
+
+            slot_time = slot * self.interval
+            if slot_time >= self.duration:
+                break
+
+            delay = slot_time - (time.perf_counter() - self.start)
+            if delay > 0:
+                time.sleep(delay)
+
+        if not self.stopped:
+            self.elapsed = time.perf_counter() - self.start
+
+    def stop(self):
+        """Przerwij etap przed czasem (np. fail-fast) - wołać przed wyjściem z pętli"""
+        self.stopped = True
+        if self.start is not None:
+            self.elapsed = time.perf_counter() - self.start
+
+    def record(self, success: bool):
+        """Zarejestruj wynik odczytu w bieżącym slocie"""
+        if success:
+            self.samples += 1
+        else:
+            self.failed_reads += 1
+
+    def stats(self) -> SamplingStats:
+        # etap przerwany - gęstość liczona z rozpoczętych slotów siatki, nie z zadanego czasu
+        # (z samego elapsed 1 próbka po kilku ms dawałaby setki próbek/s)
+        duration = self.duration
+        if self.stopped:
+            duration = min(self.duration, math.ceil(self.elapsed / self.interval) * self.interval) \
+                if self.interval > 0 else self.elapsed
+        return SamplingStats(
+            requested_rate=1.0 / self.interval if self.interval > 0 else 0.0,
+            achieved_rate=self.samples / duration if duration > 0 else 0.0,
+            samples=self.samples,
+            failed_reads=self.failed_reads,
+            missed_slots=self.missed_slots,
+            duration=self.elapsed
+        )
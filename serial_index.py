@@ -0,0 +1,204 @@
+# serial_index.py - trwały licznik prób testu per numer seryjny (limit powtórek)
+import csv
+import glob
+import io
+import json
+import os
+import sqlite3
+import threading
+import logging
+from collections import Counter
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HEADER_FIRST_CELL = "Data i godzina"
+# ostatnie bajty przeskanowanej części raportu - wykrywają plik przepisany w Excelu
+_TAIL_CHECK = 64
+
+
+class SerialIndex:
+    """
+    Liczba testów każdego numeru seryjnego, liczona z zapisanych wyników
+    (raporty CSV + niescalony dziennik albo SQLite), zachowana między restartami.
+
+    serial_index.json - migawka: liczby z raportów do zapisanych pozycji plików
+                        i ręczne korekty (undo)
+    serial_index.log  - korekty dopisane od ostatniej migawki
+
+    Przy starcie raporty są doczytywane od zapisanych pozycji, więc wyniki zapisane
+    przez batch_runner.py, FixturePool czy inną instancję też liczą się do limitu.
+    W trakcie pracy indeks jest magazynem wyników w create_database: save_result
+    dolicza każdy zapisany wynik, niezależnie od tego, kto go zapisał.
+
+    filename=None - licznik tylko w pamięci (jak dawny Counter): bez plików i skanu raportów.
+    """
+
+    def __init__(self, filename: Optional[str] = "serial_index.json", report_base: str = "raport_testow",
+                 sqlite_path: str = None):
+        self.filename = filename
+        self.log_filename = os.path.splitext(filename)[0] + ".log" if filename else None
+        self.report_base = report_base
+        self.sqlite_path = sqlite_path
+        self.stored = Counter()        # z raportów do self.offsets
+        self.offsets: Dict[str, dict] = {}
+        self.adjustments = Counter()   # undo (RETRY) - nie ma ich w raportach
+        self.session = Counter()       # zapisane w tej sesji + niescalony dziennik
+        self._lock = threading.Lock()
+        if filename:
+            self._load()
+
+    def _load(self):
+        snapshot = {}
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Uszkodzony {self.filename}, odbudowa z raportów: {e}")
+
+        if 'offsets' in snapshot:
+            self.stored.update(snapshot['stored'])
+            self.offsets = snapshot['offsets']
+            self.adjustments.update(snapshot.get('adjustments', {}))
+        # migawka sprzed pozycji plików ({serial: liczba}) - odbudowa z raportów, korekty tracone
+
+        self._replay_log()
+        if self.sqlite_path:
+            self.stored = self._count_sqlite()
+            self.offsets = {}
+        elif not self._scan_reports():
+            logger.info("Raporty zmienione poza aplikacją - indeks numerów seryjnych od nowa")
+            self.stored, self.offsets = Counter(), {}
+            self._scan_reports()
+        self._scan_journal()
+        self._save_snapshot()
+        logger.info(f"Indeks numerów seryjnych: {len(self)} numerów")
+
+    def _replay_log(self):
+        try:
+            with open(self.log_filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        continue  # niedokończona linia po awarii
+                    self.adjustments[change['serial']] += change['delta']
+        except FileNotFoundError:
+            pass
+
+    def _scan_reports(self) -> bool:
+        """
+        Doczytaj raporty (z backupami) od zapisanych pozycji.
+        False, gdy któryś przeskanowany plik zniknął lub został przepisany - wtedy pełne przeliczenie.
+        """
+        filenames = {os.path.basename(name): name for name in glob.glob(f"{self.report_base}_*.csv")}
+        if any(name not in filenames for name in self.offsets):
+            return False
+
+        for name, path in filenames.items():
+            entry = self.offsets.get(name, {'offset': 0, 'tail': ""})
+            try:
+                with open(path, 'rb') as f:
+                    if entry['offset']:
+                        f.seek(max(0, entry['offset'] - _TAIL_CHECK))
+                        if f.read(entry['offset'] - f.tell()).hex() != entry['tail']:
+                            return False
+                    data = f.read()
+            except Exception as e:
+                logger.warning(f"Pominięto {path} przy budowie indeksu: {e}")
+                continue
+
+            # tylko pełne linie - wiersz dopisywany w tej chwili zostaje na następny start
+            data = data[:data.rfind(b"\n") + 1]
+            for row in csv.reader(io.StringIO(data.decode('utf-8-sig', errors='replace')), delimiter=';'):
+                if len(row) > 2 and row[0] != HEADER_FIRST_CELL:
+                    self.stored[row[2]] += 1
+            offset = entry['offset'] + len(data)
+            with open(path, 'rb') as f:
+                f.seek(max(0, offset - _TAIL_CHECK))
+                tail = f.read(offset - f.tell()).hex()
+            self.offsets[name] = {'offset': offset, 'tail': tail}
+        return True
+
+    def _scan_journal(self):
+        """Wyniki w dzienniku CSV, których wątek scalający jeszcze nie dopisał do raportu"""
+        journal = f"{self.report_base}.journal"
+        try:
+            with open(f"{self.report_base}.meta.json", 'r', encoding='utf-8') as f:
+                offset = json.load(f).get('journal_offset', 0)
+        except (FileNotFoundError, ValueError):
+            offset = 0
+        try:
+            with open(journal, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        self.session[json.loads(line)[2]] += 1
+                    except (ValueError, IndexError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+    def _count_sqlite(self) -> Counter:
+        counts = Counter()
+        if not os.path.exists(self.sqlite_path):
+            return counts
+        conn = sqlite3.connect(self.sqlite_path)
+        try:
+            counts.update(dict(conn.execute(
+                "SELECT serial_number, COUNT(*) FROM test_results GROUP BY serial_number")))
+        except sqlite3.Error as e:
+            logger.warning(f"Nie można policzyć wyników z {self.sqlite_path}: {e}")
+        finally:
+            conn.close()
+        return counts
+
+    def _save_snapshot(self):
+        """Migawka atomowo (tmp + replace), potem obcięcie logu korekt"""
+        tmp_filename = self.filename + ".tmp"
+        try:
+            with open(tmp_filename, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'stored': dict(self.stored),
+                    'offsets': self.offsets,
+                    'adjustments': {serial: delta for serial, delta in self.adjustments.items() if delta},
+                }, f)
+            os.replace(tmp_filename, self.filename)
+            open(self.log_filename, 'w').close()
+        except Exception as e:
+            logger.warning(f"Nie można zapisać {self.filename}: {e}")
+
+    def __getitem__(self, serial: str) -> int:
+        return max(0, self.stored[serial] + self.session[serial] + self.adjustments[serial])
+
+    def __len__(self) -> int:
+        return sum(1 for serial in set(self.stored) | set(self.session) if self[serial] > 0)
+
+    def record(self, serial: str):
+        """Zarejestruj wykonany test (trwałość zapewnia sam zapisany wynik)"""
+        with self._lock:
+            self.session[serial] += 1
+
+    def save_result(self, test_result, max_retries: int = 3, retry_delay: float = 1.0) -> bool:
+        """Magazyn wyników w create_database: każdy zapisany wynik liczy się do limitu"""
+        self.record(test_result.serial_number)
+        return True
+
+    def close(self):
+        pass
+
+    def undo(self, serial: str):
+        """Cofnij ostatni test (RETRY po błędzie stanowiska nie liczy się do limitu)"""
+        with self._lock:
+            if self[serial] <= 0:
+                return
+            self.adjustments[serial] -= 1
+            if not self.log_filename:
+                return
+            try:
+                with open(self.log_filename, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'serial': serial, 'delta': -1}) + "\n")
+            except Exception as e:
+                logger.error(f"Błąd zapisu {self.log_filename}: {e}")
@@ -0,0 +1,54 @@
+# settle.py - wykrywanie ustalenia napięcia zamiast stałych sleep'ów
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Tuple, Callable, Dict
+
+
+@dataclass
+class SettleResult:
+    """Wynik oczekiwania na ustalenie napięcia"""
+    settled: bool
+    settle_time: float
+    samples: int
+    voltage: Optional[float] = None
+
+
+def wait_for_settle(
+        read_measurements: Callable[[], Optional[Dict[str, float]]],
+        band_v: float = 0.05,
+        stable_samples: int = 3,
+        max_wait: float = 1.0,
+        poll_interval: float = 0.02,
+        expected_range: Optional[Tuple[float, float]] = None
+) -> SettleResult:
+    """
+    Odpytuj napięcie aż ostatnie `stable_samples` odczytów mieści się w paśmie `band_v`
+    (i opcjonalnie w `expected_range`), najdłużej `max_wait` sekund.
+    Po przekroczeniu max_wait zwraca settled=False - pomiar i tak rusza,
+    a ocenę PASS/FAIL robi etap pomiarowy.
+    """
+    start = time.perf_counter()
+    window = deque(maxlen=max(1, stable_samples))
+    samples = 0
+    voltage = None
+
+    while True:
+        measurements = read_measurements()
+        elapsed = time.perf_counter() - start
+
+        if measurements:
+            samples += 1
+            voltage = measurements['voltage']
+            window.append(voltage)
+
+            stable = len(window) == window.maxlen and max(window) - min(window) <= band_v
+            in_range = expected_range is None or expected_range[0] <= voltage <= expected_range[1]
+            if stable and in_range:
+                return SettleResult(True, elapsed, samples, voltage)
+
+        if elapsed >= max_wait:
+            return SettleResult(False, elapsed, samples, voltage)
+
+        if poll_interval > 0:
+            time.sleep(min(poll_interval, max(0.0, max_wait - elapsed)))
@@ -0,0 +1,324 @@
+# simulator.py - symulator testera PM125 (bez sprzętu) + benchmark TestRunner
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Optional, List, Dict, Tuple
+
+from hardware_interface import PM125Transport
+
+SIM_CONFIG_ENV = "PM125_SIM_CONFIG"
+SIM_STATE_DIR_ENV = "PM125_SIM_STATE_DIR"
+
+# Profile PDO zasilacza: (napięcie mV, max prąd mA)
+SIM_PROFILES = [(5000, 3000), (9000, 3000), (12000, 3000), (15000, 2400)]
+
+
+@dataclass
+class SimulatorSettings:
+    """Parametry symulacji - opóźnienia, szum, spadek pod obciążeniem, awarie"""
+    command_latency: float = 0.02       # [s] czas wykonania każdej komendy
+    latency_jitter: float = 0.005       # [s] losowy dodatek do opóźnienia
+    noise_mv: float = 15.0              # odchylenie standardowe szumu napięcia
+    droop_mv_per_a: float = 40.0        # spadek napięcia na 1A obciążenia
+    settle_time: float = 0.05           # [s] stała czasowa narastania po zmianie profilu
+    failure_rate: float = 0.0           # prawdopodobieństwo błędu komendy
+    hang_rate: float = 0.0              # prawdopodobieństwo zawieszenia komendy
+    hang_time: float = 6.0              # [s] czas zawieszenia (> timeout konsoli)
+    fault_profiles: List[int] = field(default_factory=list)  # profile z uszkodzonym wyjściem
+    fault_offset_mv: float = -1500.0    # przesunięcie napięcia na uszkodzonym profilu
+    devices: List[str] = field(default_factory=lambda: ["SIMPM125001"])
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "SimulatorSettings":
+        return cls(**(data or {}))
+
+    @classmethod
+    def from_env(cls) -> "SimulatorSettings":
+        """Ustawienia z pliku JSON wskazanego przez PM125_SIM_CONFIG"""
+        path = os.environ.get(SIM_CONFIG_ENV)
+        if not path:
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, filename: str):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, indent=2)
+
+
+class SimulatedPM125:
+    """Model jednego testera PM125 z podłączonym zasilaczem"""
+
+    def __init__(self, settings: SimulatorSettings = None, serial: str = None):
+        self.settings = settings or SimulatorSettings()
+        self.serial = serial or self.settings.devices[0]
+        self.rng = random.Random(self.settings.seed)
+        self.profile = 1
+        self.load_ma = 0
+        self.start_mv = float(SIM_PROFILES[0][0])
+        self.changed_at = time.time()
+
+    # ===== STAN (dla konsoli per_call - proces nie żyje między komendami) =====
+
+    def to_state(self) -> Dict:
+        return {'profile': self.profile, 'load_ma': self.load_ma,
+                'start_mv': self.start_mv, 'changed_at': self.changed_at}
+
+    def load_state(self, state: Dict):
+        self.profile = state.get('profile', 1)
+        self.load_ma = state.get('load_ma', 0)
+        self.start_mv = state.get('start_mv', 0.0)
+        self.changed_at = state.get('changed_at', time.time())
+
+    # ===== FIZYKA =====
+
+    def _target_mv(self) -> float:
+        nominal_mv = SIM_PROFILES[self.profile - 1][0]
+        target = nominal_mv - self.settings.droop_mv_per_a * self.load_ma / 1000.0
+        if self.profile in self.settings.fault_profiles:
+            target += self.settings.fault_offset_mv
+        return target
+
+    def _output_mv(self) -> float:
+        target = self._target_mv()
+        tau = self.settings.settle_time
+        if tau > 0:
+            elapsed = time.time() - self.changed_at
+            target = target + (self.start_mv - target) * math.exp(-elapsed / tau)
+        return target
+
+    def set_profile(self, profile_index: int) -> bool:
+        if not 1 <= profile_index <= len(SIM_PROFILES):
+            return False
+        self.start_mv = self._output_mv()
+        self.changed_at = time.time()
+        self.profile = profile_index
+        return True
+
+    def set_load(self, current_ma: int) -> bool:
+        if not 0 <= current_ma <= 5000:
+            return False
+        self.load_ma = current_ma
+        return True
+
+    def measure(self) -> Tuple[int, int]:
+        """Zwraca (napięcie mV, prąd mA)"""
+        voltage = self._output_mv() + self.rng.gauss(0.0, self.settings.noise_mv)
+        current = self.load_ma + self.rng.gauss(0.0, 5.0) if self.load_ma else 0
+        return max(0, int(round(voltage))), max(0, int(round(current)))
+
+    # ===== OPÓŹNIENIA I AWARIE =====
+
+    def command_delay(self) -> Optional[str]:
+        """
+        Odczekaj czas komendy; zwraca "fail"/"hang" gdy wstrzyknięto awarię
+        (przy "hang" opóźnienie NIE jest odczekane - robi to wywołujący)
+        """
+        s = self.settings
+        roll = self.rng.random()
+        if roll < s.hang_rate:
+            return "hang"
+        delay = s.command_latency + self.rng.uniform(0.0, s.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if roll < s.hang_rate + s.failure_rate:
+            return "fail"
+        return None
+
+    # ===== FORMAT WYJŚCIA USBPDConsole =====
+
+    def console_output(self, args: List[str]) -> Tuple[int, str]:
+        """Wykonaj komendę konsoli; zwraca (kod wyjścia, tekst)"""
+        if not args:
+            return 1, "NO COMMAND"
+
+        command, params = args[0], args[1:]
+        value = int(params[0]) if params and params[0].lstrip('-').isdigit() else None
+
+        if command == '-c':
+            nominal_mv, max_ma = SIM_PROFILES[self.profile - 1]
+            return 0, f"STATUS:CONNECTED\nSET VOLTAGE: {nominal_mv} mV\nMAX CURRENT: {max_ma} mA"
+        if command == '-s':
+            voltage_mv, current_ma = self.measure()
+            return 0, f"VOLTAGE: {voltage_mv} mV\nMEASURED CURRENT: {current_ma} mA"
+        if command in ('-q', '-l'):
+            if value is None or not self.set_load(value):
+                return 1, f"INVALID LOAD: {params}"
+            return 0, f"LOAD SET: {value} mA"
+        if command == '-v':
+            if value is None or not self.set_profile(value):
+                return 1, f"INVALID PROFILE: {params}"
+            return 0, f"PROFILE SET: {value}"
+        if command == '-p':
+            return 0, '\n'.join(f"PDO {i}: FIXED {mv} mV {ma} mA"
+                                for i, (mv, ma) in enumerate(SIM_PROFILES, start=1))
+        if command == '-r':
+            return 0, f"SERIAL: {self.serial}\nFIRMWARE: SIMULATOR"
+        if command == '-f':
+            return 0, '\n'.join(f"SERIAL: {serial}" for serial in self.settings.devices)
+
+        return 1, f"UNKNOWN COMMAND: {command}"
+
+
+class SimulatedTransport(PM125Transport):
+    """Transport w procesie oparty o SimulatedPM125 - zamiennik ConsoleTransport"""
+
+    def __init__(self, settings: SimulatorSettings = None, device_serial: str = "Any"):
+        settings = settings or SimulatorSettings()
+        serial = None if device_serial in (None, "Any") else device_serial
+        self.device = SimulatedPM125(settings, serial=serial)
+        self.device_serial = self.device.serial
+
+    def _command(self) -> bool:
+        fault = self.device.command_delay()
+        if fault == "hang":
+            time.sleep(self.device.settings.hang_time)
+            return False
+        return fault is None
+
+    def test_connection(self) -> bool:
+        return self._command()
+
+    def set_profile(self, profile_index: int) -> bool:
+        return self._command() and self.device.set_profile(profile_index)
+
+    def set_load(self, current_ma: int, instant: bool = True) -> bool:
+        return self._command() and self.device.set_load(current_ma)
+
+    def read_measurements(self) -> Optional[Dict[str, float]]:
+        if not self._command():
+            return None
+        voltage_mv, current_ma = self.device.measure()
+        return {'voltage': voltage_mv / 1000.0, 'current': current_ma / 1000.0}
+
+    def get_device_info(self) -> Dict[str, str]:
+        return {'serial': self.device.serial, 'config': 'SIMULATOR'}
+
+    def get_connection_status(self) -> Dict[str, any]:
+        nominal_mv, max_ma = SIM_PROFILES[self.device.profile - 1]
+        return {'connected': True,
+                'set_voltage_mv': nominal_mv, 'set_voltage_v': nominal_mv / 1000.0,
+                'max_current_ma': max_ma, 'max_current_a': max_ma / 1000.0}
+
+    def get_available_profiles(self) -> List[Dict[str, any]]:
+        return [{'index': i, 'voltage_mv': mv, 'current_ma': ma, 'type': 'FIXED'}
+                for i, (mv, ma) in enumerate(SIM_PROFILES, start=1)]
+
+    def find_all_devices(self) -> List[str]:
+        return list(self.device.settings.devices)
+
+
+# ===== BENCHMARK =====
+
+def fake_console_path() -> str:
+    """Ścieżka do skryptu udającego USBPDConsole.exe"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_usbpd_console.py")
+
+
+def run_benchmark(units: int, settings: SimulatorSettings, transport: str = "inproc",
+                  console_mode: str = "per_call", measurement_interval: float = None,
+                  verbose: bool = False) -> Dict[str, float]:
+    """Wykonaj N pełnych testów na symulatorze i policz przepustowość"""
+    from config import TestConfig
+    from hardware_interface import PM125Interface
+    from test_runner import TestRunner
+
+    config = TestConfig()
+    if measurement_interval is not None:
+        config.measurement_interval = measurement_interval
+
+    if transport == "inproc":
+        hardware = PM125Interface(transport=SimulatedTransport(settings))
+    else:
+        settings_file = os.path.join(_state_dir(), "bench_settings.json")
+        settings.save(settings_file)
+        os.environ[SIM_CONFIG_ENV] = settings_file
+        hardware = PM125Interface(console_path=fake_console_path(), console_mode=console_mode)
+
+    runner = TestRunner(config, hardware)
+    durations = []
+    samples = 0
+    sampling_time = 0.0
+    passed = 0
+
+    start = time.perf_counter()
+    for unit in range(units):
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            result = runner.run_full_test(hrid="SIM", serial_number=f"SIM{unit:06d}")
+        durations.append(result.test_duration)
+        passed += result.final_status == "PASS"
+        for profile in config.get_profiles():
+            profile_result = result.profile_results[profile.name]
+            samples += len(profile_result.measurements_no_load) + len(profile_result.measurements_with_load)
+            sampling_time += profile.test_duration_no_load + profile.test_duration_with_load
+    total = time.perf_counter() - start
+
+    hardware.disconnect()
+
+    return {
+        'units': units,
+        'passed': passed,
+        'total_time': total,
+        'avg_cycle': sum(durations) / len(durations) if durations else 0.0,
+        'tests_per_hour': units / total * 3600 if total > 0 else 0.0,
+        'samples': samples,
+        'sample_rate': samples / sampling_time if sampling_time > 0 else 0.0,
+    }
+
+
+def _state_dir() -> str:
+    """Katalog na stan symulatora konsoli (per_call nie trzyma stanu w procesie)"""
+    import tempfile
+    path = os.environ.get(SIM_STATE_DIR_ENV) or os.path.join(tempfile.gettempdir(), "pm125_sim")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark TestRunner na symulatorze PM125")
+    parser.add_argument('--units', type=int, default=3, help="liczba testowanych jednostek")
+    parser.add_argument('--transport', choices=['inproc', 'console'], default='inproc',
+                        help="inproc = SimulatedTransport, console = fake_usbpd_console.py")
+    parser.add_argument('--console-mode', choices=['per_call', 'session'], default='per_call')
+    parser.add_argument('--latency', type=float, default=None, help="opóźnienie komendy [s]")
+    parser.add_argument('--noise', type=float, default=None, help="szum napięcia [mV]")
+    parser.add_argument('--failure-rate', type=float, default=None)
+    parser.add_argument('--fault-profile', type=int, action='append', default=[],
+                        help="indeks profilu z uszkodzonym wyjściem (można powtarzać)")
+    parser.add_argument('--interval', type=float, default=None, help="measurement_interval [s]")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true', help="pokaż wyjście TestRunner")
+    args = parser.parse_args(argv)
+
+    settings = SimulatorSettings(seed=args.seed, fault_profiles=args.fault_profile)
+    if args.latency is not None:
+        settings.command_latency = args.latency
+    if args.noise is not None:
+        settings.noise_mv = args.noise
+    if args.failure_rate is not None:
+        settings.failure_rate = args.failure_rate
+
+    stats = run_benchmark(args.units, settings, transport=args.transport,
+                          console_mode=args.console_mode, measurement_interval=args.interval,
+                          verbose=args.verbose)
+
+    print(f"Jednostek:        {stats['units']} (PASS: {stats['passed']})")
+    print(f"Czas całkowity:   {stats['total_time']:.2f}s")
+    print(f"Średni cykl:      {stats['avg_cycle']:.2f}s")
+    print(f"Testów/godzinę:   {stats['tests_per_hour']:.1f}")
+    print(f"Próbek:           {stats['samples']}")
+    print(f"Próbkowanie:      {stats['sample_rate']:.1f} próbek/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
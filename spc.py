@@ -0,0 +1,417 @@
+# spc.py - statystyczna kontrola procesu per profil: Cpk, karta X-średnie/R, reguły Western Electric
+import argparse
+import csv
+import glob
+import io
+import json
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from measurements import RunningStats
+
+logger = logging.getLogger(__name__)
+
+# Stałe kart X-średnie/R dla liczności podgrupy n
+A2 = {2: 1.880, 3: 1.023, 4: 0.729, 5: 0.577, 6: 0.483, 7: 0.419, 8: 0.373, 9: 0.337, 10: 0.308}
+D3 = {2: 0.0, 3: 0.0, 4: 0.0, 5: 0.0, 6: 0.0, 7: 0.076, 8: 0.136, 9: 0.184, 10: 0.223}
+D2 = {2: 1.128, 3: 1.693, 4: 2.059, 5: 2.326, 6: 2.534, 7: 2.704, 8: 2.847, 9: 2.970, 10: 3.078}
+D4 = {2: 3.267, 3: 2.574, 4: 2.282, 5: 2.114, 6: 2.004, 7: 1.924, 8: 1.864, 9: 1.816, 10: 1.777}
+
+# Charakterystyki jednostki: min i max napięcia z obciążeniem (te same co w raporcie CSV)
+CHARACTERISTICS = ('min', 'max')
+
+
+@dataclass
+class SPCAlarm:
+    """Naruszenie reguły na karcie kontrolnej"""
+    profile: str
+    characteristic: str
+    rule: str
+    value: float
+    serial_number: str = ""
+
+    def __str__(self):
+        return f"{self.profile} [{self.characteristic}] {self.rule}: {self.value:.3f}V ({self.serial_number})"
+
+
+class ControlChart:
+    """
+    Karta X-średnie/R jednej charakterystyki, aktualizowana w O(1) na jednostkę.
+    Granice liczone z pierwszych `baseline_subgroups` podgrup, potem zamrożone;
+    od tego momentu każda podgrupa jest sprawdzana regułami Western Electric.
+    """
+
+    def __init__(self, lsl: float, usl: float, subgroup_size: int = 5, baseline_subgroups: int = 20):
+        if subgroup_size not in A2:
+            raise ValueError(f"Liczność podgrupy poza zakresem 2-10: {subgroup_size}")
+
+        self.lsl = lsl
+        self.usl = usl
+        self.subgroup_size = subgroup_size
+        self.baseline_subgroups = baseline_subgroups
+        self.stats = RunningStats()
+        self.subgroup: List[float] = []
+        self.subgroups = 0
+        self.xbar_sum = 0.0
+        self.range_sum = 0.0
+        self.center: Optional[float] = None
+        self.range_mean: Optional[float] = None
+        self.zones = deque(maxlen=8)   # ostatnie punkty X-średnie w jednostkach sigma
+
+    @property
+    def frozen(self) -> bool:
+        return self.center is not None
+
+    @property
+    def sigma_within(self) -> Optional[float]:
+        """Sigma wewnątrz podgrup R-średnie/d2 (zdolność krótkoterminowa)"""
+        if self.frozen:
+            range_mean = self.range_mean
+        elif self.subgroups:
+            range_mean = self.range_sum / self.subgroups
+        else:
+            return None
+        return range_mean / D2[self.subgroup_size]
+
+    def _index(self, sigma: Optional[float], centered: bool) -> Optional[float]:
+        if not sigma or sigma <= 0 or not self.stats.count:
+            return None
+        if not centered:
+            return (self.usl - self.lsl) / (6 * sigma)
+        mean = self.stats.mean
+        return min(self.usl - mean, mean - self.lsl) / (3 * sigma)
+
+    @property
+    def cp(self) -> Optional[float]:
+        return self._index(self.sigma_within, centered=False)
+
+    @property
+    def cpk(self) -> Optional[float]:
+        return self._index(self.sigma_within, centered=True)
+
+    @property
+    def pp(self) -> Optional[float]:
+        """Jak cp, ale z sigmą całkowitą wszystkich jednostek (wydajność długoterminowa)"""
+        return self._index(self.stats.std, centered=False)
+
+    @property
+    def ppk(self) -> Optional[float]:
+        return self._index(self.stats.std, centered=True)
+
+    def to_state(self) -> Dict:
+        """Stan karty do zapisu w JSON (razem z parametrami, żeby wykryć zmianę konfiguracji)"""
+        return {
+            'lsl': self.lsl, 'usl': self.usl,
+            'subgroup_size': self.subgroup_size, 'baseline_subgroups': self.baseline_subgroups,
+            'stats': {name: getattr(self.stats, name) for name in RunningStats.__slots__},
+            'subgroup': self.subgroup, 'subgroups': self.subgroups,
+            'xbar_sum': self.xbar_sum, 'range_sum': self.range_sum,
+            'center': self.center, 'range_mean': self.range_mean,
+            'zones': list(self.zones),
+        }
+
+    def load_state(self, state: Dict) -> bool:
+        """Przywróć stan; False (bez zmian) gdy limity lub parametry karty są inne"""
+        if (state.get('lsl'), state.get('usl'), state.get('subgroup_size'), state.get('baseline_subgroups')) != \
+                (self.lsl, self.usl, self.subgroup_size, self.baseline_subgroups):
+            return False
+        for name, value in state['stats'].items():
+            setattr(self.stats, name, value)
+        self.subgroup = list(state['subgroup'])
+        self.subgroups = state['subgroups']
+        self.xbar_sum = state['xbar_sum']
+        self.range_sum = state['range_sum']
+        self.center = state['center']
+        self.range_mean = state['range_mean']
+        self.zones.clear()
+        self.zones.extend(state['zones'])
+        return True
+
+    def limits(self) -> Optional[Dict[str, float]]:
+        """Granice kart (zamrożone albo bieżące z dotychczasowych podgrup)"""
+        if self.frozen:
+            center, range_mean = self.center, self.range_mean
+        elif self.subgroups:
+            center, range_mean = self.xbar_sum / self.subgroups, self.range_sum / self.subgroups
+        else:
+            return None
+        n = self.subgroup_size
+        return {
+            'center': center,
+            'ucl': center + A2[n] * range_mean,
+            'lcl': center - A2[n] * range_mean,
+            'range_mean': range_mean,
+            'range_ucl': D4[n] * range_mean,
+            'range_lcl': D3[n] * range_mean,
+        }
+
+    def add(self, value: float) -> List[str]:
+        """Dodaj wartość jednostki; zwraca nazwy naruszonych reguł (po zamknięciu podgrupy)"""
+        self.stats.add(value, 0.0, self.lsl <= value <= self.usl)
+        self.subgroup.append(value)
+        if len(self.subgroup) < self.subgroup_size:
+            return []
+
+        xbar = sum(self.subgroup) / len(self.subgroup)
+        subgroup_range = max(self.subgroup) - min(self.subgroup)
+        self.subgroup.clear()
+
+        if not self.frozen:
+            self.subgroups += 1
+            self.xbar_sum += xbar
+            self.range_sum += subgroup_range
+            if self.subgroups >= self.baseline_subgroups:
+                self.center = self.xbar_sum / self.subgroups
+                self.range_mean = self.range_sum / self.subgroups
+            return []
+
+        return self._check_rules(xbar, subgroup_range)
+
+    def _check_rules(self, xbar: float, subgroup_range: float) -> List[str]:
+        limits = self.limits()
+        sigma = (limits['ucl'] - limits['center']) / 3
+        violations = []
+
+        if sigma <= 0:
+            # zerowy rozrzut w bazie - każda zmiana średniej jest poza granicą
+            if xbar != limits['center']:
+                violations.append("WE1: punkt poza 3 sigma")
+            return violations
+
+        z = (xbar - limits['center']) / sigma
+        self.zones.append(z)
+        recent = list(self.zones)
+
+        if abs(z) > 3:
+            violations.append("WE1: punkt poza 3 sigma")
+        for side in (1, -1):
+            if sum(1 for v in recent[-3:] if v * side > 2) >= 2 and z * side > 2:
+                violations.append("WE2: 2 z 3 poza 2 sigma")
+            if sum(1 for v in recent[-5:] if v * side > 1) >= 4 and z * side > 1:
+                violations.append("WE3: 4 z 5 poza 1 sigma")
+            if len(recent) == 8 and all(v * side > 0 for v in recent):
+                violations.append("WE4: 8 punktów po jednej stronie linii centralnej")
+
+        if subgroup_range > limits['range_ucl'] or subgroup_range < limits['range_lcl']:
+            violations.append("R: rozstęp poza granicami")
+        return violations
+
+
+class SPCMonitor:
+    """
+    SPC dla wszystkich profili konfiguracji: charakterystyki min/max napięcia
+    z obciążeniem, limity specyfikacji z VoltageProfile.min_voltage/max_voltage.
+
+        monitor = SPCMonitor(config, state_path="spc_state.json")
+        alarms = monitor.add_result(full_test_result)
+        monitor.save()
+
+    Z state_path karty (baza, podgrupa w toku, ostatnie punkty) przetrwają restart;
+    gdy pliku stanu jeszcze nie ma, karty są jednorazowo odbudowywane z raportów CSV.
+    background=True (GUI) - odbudowa w wątku, start aplikacji na nią nie czeka;
+    wyniki dodane w tym czasie trafiają na karty zaraz po historii.
+    """
+
+    def __init__(self, config, subgroup_size: int = None, baseline_subgroups: int = None,
+                 state_path: str = None, report_base: str = "raport_testow", background: bool = False):
+        subgroup_size = subgroup_size or getattr(config, 'spc_subgroup_size', 5)
+        baseline_subgroups = baseline_subgroups or getattr(config, 'spc_baseline_subgroups', 20)
+        self.charts: Dict[str, Dict[str, ControlChart]] = {
+            profile.name: {
+                characteristic: ControlChart(profile.min_voltage, profile.max_voltage,
+                                             subgroup_size, baseline_subgroups)
+                for characteristic in CHARACTERISTICS
+            }
+            for profile in config.get_profiles()
+        }
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._pending: Optional[list] = None   # wyniki czekające na koniec odbudowy w tle
+        if state_path:
+            self._load(report_base, background)
+
+    @property
+    def rebuilding(self) -> bool:
+        return self._pending is not None
+
+    def _load(self, report_base: str, background: bool):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            # rozmiary teraz - wiersze dopisane w trakcie odbudowy przyjdą przez add_result
+            sizes = {filename: os.path.getsize(filename) for filename in report_files(report_base)}
+            if background:
+                self._pending = []
+                threading.Thread(target=self._rebuild, args=(sizes,), name="spc-rebuild", daemon=True).start()
+            else:
+                self._rebuild(sizes)
+            return
+        except Exception as e:
+            logger.warning(f"Uszkodzony {self.state_path}, karty SPC od zera: {e}")
+            return
+
+        for profile_name, charts in self.charts.items():
+            for characteristic, chart in charts.items():
+                chart_state = state.get(profile_name, {}).get(characteristic)
+                if chart_state and not chart.load_state(chart_state):
+                    logger.warning(f"SPC {profile_name} [{characteristic}]: zmienione limity lub parametry "
+                                   f"karty - nowa baza")
+
+    def _rebuild(self, sizes: Dict[str, int]):
+        try:
+            self.rebuild_from_reports(list(sizes), sizes)
+            logger.info(f"Karty SPC odbudowane z {len(sizes)} raportów")
+        except Exception as e:
+            logger.error(f"Błąd odbudowy kart SPC z raportów: {e}", exc_info=True)
+        with self._lock:
+            pending, self._pending = self._pending or [], None
+            for test_result in pending:
+                for alarm in self._add_result(test_result):
+                    logger.warning(f"SPC: {alarm}")
+        self.save()
+
+    def save(self):
+        """Zapis atomowy stanu kart (plik tymczasowy + replace); w trakcie odbudowy zapisze ją wątek odbudowy"""
+        if not self.state_path or self.rebuilding:
+            return
+        with self._lock:
+            state = {profile_name: {characteristic: chart.to_state() for characteristic, chart in charts.items()}
+                     for profile_name, charts in self.charts.items()}
+        tmp_filename = self.state_path + ".tmp"
+        try:
+            with open(tmp_filename, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_filename, self.state_path)
+        except Exception as e:
+            logger.warning(f"Nie można zapisać {self.state_path}: {e}")
+
+    def add_values(self, profile_name: str, v_min: float, v_max: float, serial_number: str = "") -> List[SPCAlarm]:
+        charts = self.charts.get(profile_name)
+        if charts is None:
+            return []
+        alarms = []
+        for characteristic, value in (('min', v_min), ('max', v_max)):
+            for rule in charts[characteristic].add(value):
+                alarms.append(SPCAlarm(profile_name, characteristic, rule, value, serial_number))
+        return alarms
+
+    def add_result(self, test_result) -> List[SPCAlarm]:
+        """
+        Dodaj jednostkę (FullTestResult); profile bez pomiarów z obciążeniem są pomijane.
+        W trakcie odbudowy w tle wynik czeka w kolejce (alarmy trafią wtedy do logu).
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(test_result)
+                return []
+            return self._add_result(test_result)
+
+    def _add_result(self, test_result) -> List[SPCAlarm]:
+        alarms = []
+        for name, result in test_result.profile_results.items():
+            if result.status in ("PASS", "FAIL") and result.stats_with_load.count:
+                alarms += self.add_values(name, result.get_min_voltage(), result.get_max_voltage(),
+                                          test_result.serial_number)
+        return alarms
+
+    def add_report_row(self, row: List[str]) -> List[SPCAlarm]:
+        """Dodaj jednostkę z wiersza raportu CSV (odbudowa z historii)"""
+        from report_aggregator import PROFILE_COLUMNS, parse_decimal
+
+        alarms = []
+        for name, column in PROFILE_COLUMNS:
+            if len(row) <= column + 2 or row[column] not in ("PASS", "FAIL"):
+                continue
+            v_min, v_max = parse_decimal(row[column + 1]), parse_decimal(row[column + 2])
+            if v_min is not None and v_max is not None:
+                alarms += self.add_values(f"Profile {name}", v_min, v_max, row[2])
+        return alarms
+
+    def rebuild_from_reports(self, filenames: List[str], sizes: Dict[str, int] = None) -> List[SPCAlarm]:
+        """Przejście strumieniowe po raportach w podanej kolejności; sizes - czytaj tylko do tych rozmiarów"""
+        from report_aggregator import HEADER_FIRST_CELL
+
+        alarms = []
+        for filename in filenames:
+            lines = _report_lines(filename, sizes[filename] if sizes is not None else None)
+            for row in csv.reader(lines, delimiter=';'):
+                if row and row[0] != HEADER_FIRST_CELL:
+                    alarms += self.add_report_row(row)
+        return alarms
+
+    def summary(self) -> List[Dict]:
+        rows = []
+        for profile_name, charts in self.charts.items():
+            for characteristic, chart in charts.items():
+                rows.append({
+                    'profile': profile_name,
+                    'characteristic': characteristic,
+                    'count': chart.stats.count,
+                    'mean': chart.stats.mean,
+                    'std': chart.stats.std,
+                    'sigma_within': chart.sigma_within,
+                    'cp': chart.cp,
+                    'cpk': chart.cpk,
+                    'pp': chart.pp,
+                    'ppk': chart.ppk,
+                    'out_of_spec': chart.stats.out_of_range,
+                    'limits': chart.limits(),
+                    'frozen': chart.frozen,
+                })
+        return rows
+
+
+def _report_lines(filename: str, size: int = None) -> Iterator[str]:
+    """Linie raportu; size - tylko pełne linie z pierwszych size bajtów"""
+    if size is None:
+        with open(filename, 'r', newline='', encoding='utf-8-sig') as f:
+            yield from f
+        return
+    with open(filename, 'rb') as f:
+        data = f.read(size)
+    yield from io.StringIO(data[:data.rfind(b"\n") + 1].decode('utf-8-sig', errors='replace'), newline='')
+
+
+def report_files(report_base: str = "raport_testow") -> List[str]:
+    """Raporty w kolejności zapisu (_2 przed _10)"""
+    return sorted(glob.glob(f"{report_base}_*.csv"), key=lambda name: (len(name), name))
+
+
+def main(argv: List[str] = None) -> int:
+    from config import TestConfig
+
+    parser = argparse.ArgumentParser(description="Cpk i karty kontrolne z raportów CSV")
+    parser.add_argument('files', nargs='*', help="pliki raportów (domyślnie raport_testow_*.csv)")
+    parser.add_argument('--subgroup', type=int, default=None, help="liczność podgrupy (2-10)")
+    parser.add_argument('--baseline', type=int, default=None, help="podgrupy do wyznaczenia granic")
+    args = parser.parse_args(argv)
+
+    filenames = args.files or report_files()
+    monitor = SPCMonitor(TestConfig.load(), args.subgroup, args.baseline)
+    alarms = monitor.rebuild_from_reports(filenames)
+
+    def fmt(value, digits=3):
+        return "-" if value is None else f"{value:.{digits}f}"
+
+    # Cp/Cpk z sigmy wewnątrz podgrup (R/d2), Pp/Ppk z sigmy całkowitej
+    print(f"{'Profil':<12} {'Char.':<5} {'N':>7} {'Średnia':>8} {'Sigma':>7} {'SigmaW':>7} "
+          f"{'Cp':>6} {'Cpk':>6} {'Pp':>6} {'Ppk':>6} {'Poza':>5}")
+    for row in monitor.summary():
+        print(f"{row['profile']:<12} {row['characteristic']:<5} {row['count']:>7} {fmt(row['mean']):>8} "
+              f"{fmt(row['std'], 4):>7} {fmt(row['sigma_within'], 4):>7} {fmt(row['cp'], 2):>6} "
+              f"{fmt(row['cpk'], 2):>6} {fmt(row['pp'], 2):>6} {fmt(row['ppk'], 2):>6} {row['out_of_spec']:>5}")
+
+    print(f"\nAlarmy kart kontrolnych: {len(alarms)}")
+    for alarm in alarms[-20:]:
+        print(f"  {alarm}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+/*
+ * usbpdapi_stub.c - atrapa biblioteki USBPDAPI do testów usbpd_api.py na Linuxie
+ *
+ * Budowanie:
+ *   gcc -shared -fPIC -o stubs/libusbpdapi.so stubs/usbpdapi_stub.c
+ *
+ * Zachowanie: profile 5/9/12/15V, napięcie spada o 50 mV na każdy 1 A obciążenia,
+ * prąd mierzony = ustawione obciążenie.
+ */
+#include <stdlib.h>
+#include <string.h>
+#include <stdio.h>
+
+typedef struct {
+    char serial[32];
+    int profile;
+    int load_ma;
+} Device;
+
+static const int PROFILE_MV[] = {5000, 9000, 12000, 15000};
+static const int PROFILE_MA[] = {3000, 3000, 3000, 2400};
+#define PROFILE_COUNT 4
+
+void *USBPD_Open(const char *serial)
+{
+    Device *dev = calloc(1, sizeof(Device));
+    if (!dev)
+        return NULL;
+    if (!serial || strcmp(serial, "Any") == 0)
+        serial = "PMPD000001";
+    snprintf(dev->serial, sizeof(dev->serial), "%s", serial);
+    dev->profile = 1;
+    return dev;
+}
+
+void USBPD_Close(void *handle)
+{
+    free(handle);
+}
+
+int USBPD_IsConnected(void *handle)
+{
+    return handle != NULL;
+}
+
+int USBPD_SetProfile(void *handle, int index)
+{
+    if (index < 1 || index > PROFILE_COUNT)
+        return -1;
+    ((Device *)handle)->profile = index;
+    return 0;
+}
+
+int USBPD_SetLoad(void *handle, int current_ma, int instant)
+{
+    (void)instant;
+    if (current_ma < 0 || current_ma > 5000)
+        return -1;
+    ((Device *)handle)->load_ma = current_ma;
+    return 0;
+}
+
+int USBPD_ReadMeasurements(void *handle, int *voltage_mv, int *current_ma)
+{
+    Device *dev = handle;
+    *voltage_mv = PROFILE_MV[dev->profile - 1] - dev->load_ma / 20;
+    *current_ma = dev->load_ma;
+    return 0;
+}
+
+int USBPD_GetStatus(void *handle, int *set_voltage_mv, int *max_current_ma)
+{
+    Device *dev = handle;
+    *set_voltage_mv = PROFILE_MV[dev->profile - 1];
+    *max_current_ma = PROFILE_MA[dev->profile - 1];
+    return 0;
+}
+
+int USBPD_GetSerial(void *handle, char *buffer, int size)
+{
+    snprintf(buffer, size, "%s", ((Device *)handle)->serial);
+    return 0;
+}
+
+int USBPD_GetProfileCount(void *handle)
+{
+    (void)handle;
+    return PROFILE_COUNT;
+}
+
+int USBPD_GetProfile(void *handle, int index, int *voltage_mv, int *current_ma)
+{
+    (void)handle;
+    if (index < 1 || index > PROFILE_COUNT)
+        return -1;
+    *voltage_mv = PROFILE_MV[index - 1];
+    *current_ma = PROFILE_MA[index - 1];
+    return 0;
+}
+
+int USBPD_FindDevices(char *buffer, int size)
+{
+    snprintf(buffer, size, "PMPD000001");
+    return 1;
+}
@@ -6,6 +6,14 @@ from typing import List, Dict, Optional
 
 from config import TestConfig, VoltageProfile
 from hardware_interface import PM125Interface
+from settle import wait_for_settle
+from sampling import FixedRateScheduler, SamplingStats
+from measurements import SampleBuffer, RunningStats
+from cycle_profiler import CycleProfiler
+
+
+# Profil niewykonany, bo wcześniejszy profil przerwał test (fail_fast = "unit")
+SKIPPED_FAIL_FAST = "SKIPPED_FAIL_FAST"
 
 
 class TimeoutException(Exception):
@@ -18,70 +26,83 @@ class ProfileTestResult:
     """Wynik testu pojedynczego profilu"""
     profile_name: str
     nominal_voltage: float
-    measurements_no_load: List[Dict[str, float]] = field(default_factory=list)
-    measurements_with_load: List[Dict[str, float]] = field(default_factory=list)
+    measurements_no_load: SampleBuffer = field(default_factory=SampleBuffer)
+    measurements_with_load: SampleBuffer = field(default_factory=SampleBuffer)
     status: str = "PENDING"
+    settle_times: Dict[str, float] = field(default_factory=dict)
+    sampling_stats: Dict[str, SamplingStats] = field(default_factory=dict)
+    min_limit: Optional[float] = None
+    max_limit: Optional[float] = None
+    stats_no_load: RunningStats = field(default_factory=RunningStats)
+    stats_with_load: RunningStats = field(default_factory=RunningStats)
+    aborted: bool = False   # przerwany przez fail-fast po pierwszej próbce poza zakresem
 
     def add_measurement(self, time_sec: float, voltage: float, current: float, phase: str):
         """
-        Dodaj pomiar do listy
+        Dodaj pomiar do bufora etapu i zaktualizuj statystyki bieżące
         phase: 'no_load' lub 'with_load'
         """
-        measurement = {
-            'time': time_sec,
-            'voltage': voltage,
-            'current': current
-        }
+        in_range = True
+        if self.min_limit is not None and self.max_limit is not None:
+            in_range = self.min_limit <= voltage <= self.max_limit
 
         if phase == 'no_load':
-            self.measurements_no_load.append(measurement)
+            self.measurements_no_load.append(time_sec, voltage, current)
+            self.stats_no_load.add(voltage, current, in_range)
         else:
-            self.measurements_with_load.append(measurement)
+            self.measurements_with_load.append(time_sec, voltage, current)
+            self.stats_with_load.add(voltage, current, in_range)
 
     def finalize(self, min_v: float, max_v: float):
         """Określ czy test PASS/FAIL"""
-        all_measurements = self.measurements_no_load + self.measurements_with_load
-
-        if not all_measurements:
+        if not self.stats_no_load.count and not self.stats_with_load.count:
             self.status = "NO_DATA"
             return
 
-        all_in_range = all(
-            min_v <= m['voltage'] <= max_v
-            for m in all_measurements
-        )
-        self.status = "PASS" if all_in_range else "FAIL"
+        if (min_v, max_v) == (self.min_limit, self.max_limit):
+            out_of_range = self.get_out_of_range_count()
+        else:
+            # Inne limity niż przy zbieraniu - jednorazowe przeliczenie z bufora
+            out_of_range = (self.measurements_no_load.count_out_of_range(min_v, max_v)
+                            + self.measurements_with_load.count_out_of_range(min_v, max_v))
+        self.status = "PASS" if out_of_range == 0 else "FAIL"
 
     def get_average_voltage(self) -> float:
         """Średnie napięcie ze WSZYSTKICH pomiarów"""
-        all_measurements = self.measurements_no_load + self.measurements_with_load
-        if not all_measurements:
-            return 0.0
-        return sum(m['voltage'] for m in all_measurements) / len(all_measurements)
+        return self.stats_no_load.merged(self.stats_with_load).mean
 
     def get_average_voltage_with_load(self) -> float:
         """Średnie napięcie TYLKO z obciążeniem"""
-        if not self.measurements_with_load:
-            return 0.0
-        return sum(m['voltage'] for m in self.measurements_with_load) / len(self.measurements_with_load)
+        return self.stats_with_load.mean
 
     def get_min_voltage(self) -> float:
         """Minimalne napięcie z obciążeniem"""
-        if not self.measurements_with_load:
+        if not self.stats_with_load.count:
             return 0.0
-        return min(m['voltage'] for m in self.measurements_with_load)
+        return self.stats_with_load.min
 
     def get_max_voltage(self) -> float:
         """Maksymalne napięcie z obciążeniem"""
-        if not self.measurements_with_load:
+        if not self.stats_with_load.count:
             return 0.0
-        return max(m['voltage'] for m in self.measurements_with_load)
+        return self.stats_with_load.max
 
     def get_average_current(self) -> float:
         """Średni prąd z pomiarów z obciążeniem"""
-        if not self.measurements_with_load:
-            return 0.0
-        return sum(m['current'] for m in self.measurements_with_load) / len(self.measurements_with_load)
+        return self.stats_with_load.mean_current
+
+    def get_std_voltage(self, phase: str = 'with_load') -> float:
+        """Odchylenie standardowe napięcia w etapie ('no_load' / 'with_load')"""
+        stats = self.stats_no_load if phase == 'no_load' else self.stats_with_load
+        return stats.std
+
+    def get_out_of_range_count(self, phase: str = None) -> int:
+        """Liczba próbek poza zakresem profilu (None = oba etapy)"""
+        if phase == 'no_load':
+            return self.stats_no_load.out_of_range
+        if phase == 'with_load':
+            return self.stats_with_load.out_of_range
+        return self.stats_no_load.out_of_range + self.stats_with_load.out_of_range
 
 
 @dataclass
@@ -93,6 +114,7 @@ class FullTestResult:
     profile_results: Dict[str, ProfileTestResult]
     final_status: str
     test_duration: float
+    cycle_profile: Dict[str, float] = field(default_factory=dict)   # czas [s] per faza cyklu
 
     # test_runner.py - w klasie FullTestResult
     def to_csv_row(self) -> List[str]:
@@ -108,7 +130,12 @@ class FullTestResult:
         # Dla każdego profilu: Wynik, Min, Max
         for name in profile_names:
             result = self.profile_results.get(name)
-            if result and result.status not in ["TIMEOUT", "CANCELLED", "ERROR", "NO_DATA"]:
+            if result and result.aborted and not result.stats_with_load.count:
+                # fail-fast przed etapem z obciążeniem - brak min/max
+                row.append(result.status)
+                row.append("N/A")
+                row.append("N/A")
+            elif result and result.status not in ["TIMEOUT", "CANCELLED", "ERROR", "NO_DATA", SKIPPED_FAIL_FAST]:
                 row.append(result.status)
                 # PRZECINEK zamiast KROPKI
                 row.append(f"{result.get_min_voltage():.2f}".replace('.', ','))
@@ -133,54 +160,60 @@ class TestRunner:
         self.hardware = hardware
         self.current_result: Optional[FullTestResult] = None
         self.test_timeout = 60
+        self.profiler = CycleProfiler()
 
-    def test_single_profile(
-            self,
-            profile: VoltageProfile,
-            progress_callback=None
-    ) -> ProfileTestResult:
+    def _adaptive_settle(self) -> bool:
+        return self.config.settle_mode == "adaptive"
+
+    def _settle(self, result: ProfileTestResult, transition: str, fixed_delay: float,
+                expected_range=None):
         """
-        Test jednego profilu - DWUETAPOWY z INSTANT LOAD
+        Poczekaj na ustalenie napięcia po zmianie profilu/obciążenia
+        i zapisz faktyczny czas w result.settle_times[transition]
         """
-        result = ProfileTestResult(
-            profile_name=profile.name,
-            nominal_voltage=profile.nominal
-        )
-
-        print(f"\n{'=' * 60}")
-        print(f"Test profilu: {profile.name}")
-        print(f"Zakres: {profile.min_voltage}V - {profile.max_voltage}V")
-        print(f"Obciążenie: {profile.load_current_ma}mA")
-        print(f"{'=' * 60}")
-
-        if not self.hardware.set_profile(profile.index):
-            result.status = "PROFILE_ERROR"
-            print(f"✗ Błąd ustawiania profilu #{profile.index}")
-            return result
-
-        time.sleep(0.5)
-
-        # ===== ETAP 1: BEZ OBCIĄŻENIA =====
-        print(f"\n--- ETAP 1: BEZ OBCIĄŻENIA (0mA) ---")
-
-        self.hardware.set_load(0, instant=True)
-        time.sleep(0.1)
+        if not self._adaptive_settle():
+            with self.profiler.phase('settle'):
+                time.sleep(fixed_delay)
+            result.settle_times[transition] = fixed_delay
+            return
 
-        start_time = time.time()
+        with self.profiler.phase('settle'):
+            settle = wait_for_settle(
+                self.hardware.read_measurements,
+                band_v=self.config.settle_band_v,
+                stable_samples=self.config.settle_stable_samples,
+                max_wait=self.config.settle_max_wait,
+                poll_interval=self.config.settle_poll_interval,
+                expected_range=expected_range
+            )
+        result.settle_times[transition] = settle.settle_time
+        status_str = "✓" if settle.settled else "⚠ przekroczony max czas"
+        print(f"Stabilizacja ({transition}): {settle.settle_time:.3f}s {status_str}")
+
+    def _sample_phase(self, profile: VoltageProfile, result: ProfileTestResult, phase: str,
+                      duration: float, label: str, progress_callback=None) -> bool:
+        """
+        Próbkowanie jednego etapu w stałym rytmie measurement_interval
+        (siatka perf_counter - czas odczytu nie wydłuża okresu)
+        Zwraca True jeśli etap przerwano przez fail-fast
+        """
+        fail_fast = self.config.fail_fast != "off"
+        aborted = False
+        scheduler = FixedRateScheduler(self.config.measurement_interval, duration)
 
         print(f"{'Czas[s]':<10} {'Napięcie[V]':<15} {'Prąd[A]':<12} {'Status'}")
         print("-" * 50)
 
-        while time.time() - start_time < profile.test_duration_no_load:
-            elapsed = time.time() - start_time
-
+        sampling_start = time.perf_counter()
+        for elapsed in scheduler:
             measurements = self.hardware.read_measurements()
+            scheduler.record(measurements is not None)
 
             if measurements:
                 voltage = measurements['voltage']
                 current = measurements['current']
 
-                result.add_measurement(elapsed, voltage, current, 'no_load')
+                result.add_measurement(elapsed, voltage, current, phase)
 
                 in_range = profile.is_in_range(voltage)
                 status_str = "✓ OK" if in_range else "✗ FAIL"
@@ -192,55 +225,91 @@ class TestRunner:
                         elapsed=elapsed,
                         voltage=voltage,
                         current=current,
-                        profile_name=f"{profile.name} (0mA)",
-                        in_range=in_range
+                        profile_name=label,
+                        in_range=in_range,
+                        phase=phase,
+                        min_voltage=profile.min_voltage,
+                        max_voltage=profile.max_voltage
                     )
 
-            time.sleep(self.config.measurement_interval)
+                if fail_fast and not in_range:
+                    print(f"✗ FAIL-FAST: {voltage:.2f}V poza zakresem - przerywam profil")
+                    scheduler.stop()
+                    aborted = True
+                    break
 
-        # ===== ETAP 2: Z OBCIĄŻENIEM =====
-        print(f"\n--- ETAP 2: Z OBCIĄŻENIEM ({profile.load_current_ma}mA) ---")
-        print(f"⚡ INSTANT skok na {profile.load_current_ma}mA...")
+        self.profiler.add('sampling', time.perf_counter() - sampling_start)
+        stats = scheduler.stats()
+        result.sampling_stats[phase] = stats
+        if stats.missed_slots:
+            print(f"⚠ Pominięte sloty: {stats.missed_slots} "
+                  f"(odczyt dłuższy niż {self.config.measurement_interval}s)")
+        return aborted
 
-        if not self.hardware.set_load(profile.load_current_ma, instant=True):
-            result.status = "LOAD_ERROR"
-            print(f"✗ Błąd ustawiania obciążenia")
-            return result
+    def test_single_profile(
+            self,
+            profile: VoltageProfile,
+            progress_callback=None
+    ) -> ProfileTestResult:
+        """
+        Test jednego profilu - DWUETAPOWY z INSTANT LOAD
+        """
+        result = ProfileTestResult(
+            profile_name=profile.name,
+            nominal_voltage=profile.nominal,
+            min_limit=profile.min_voltage,
+            max_limit=profile.max_voltage
+        )
 
-        time.sleep(0.05)
+        print(f"\n{'=' * 60}")
+        print(f"Test profilu: {profile.name}")
+        print(f"Zakres: {profile.min_voltage}V - {profile.max_voltage}V")
+        print(f"Obciążenie: {profile.load_current_ma}mA")
+        print(f"{'=' * 60}")
 
-        start_time = time.time()
+        adaptive = self._adaptive_settle()
 
-        print(f"{'Czas[s]':<10} {'Napięcie[V]':<15} {'Prąd[A]':<12} {'Status'}")
-        print("-" * 50)
+        with self.profiler.phase('profile_switch'):
+            profile_set = self.hardware.set_profile(profile.index, settle_delay=0 if adaptive else 0.5)
+        if not profile_set:
+            result.status = "PROFILE_ERROR"
+            print(f"✗ Błąd ustawiania profilu #{profile.index}")
+            return result
 
-        while time.time() - start_time < profile.test_duration_with_load:
-            elapsed = time.time() - start_time
+        # ===== ETAP 1: BEZ OBCIĄŻENIA =====
+        print(f"\n--- ETAP 1: BEZ OBCIĄŻENIA (0mA) ---")
 
-            measurements = self.hardware.read_measurements()
+        with self.profiler.phase('load_step'):
+            self.hardware.set_load(0, instant=True, settle_delay=0 if adaptive else None)
+        self._settle(result, 'profile', 0.6, expected_range=(profile.min_voltage, profile.max_voltage))
 
-            if measurements:
-                voltage = measurements['voltage']
-                current = measurements['current']
+        result.aborted = self._sample_phase(profile, result, 'no_load', profile.test_duration_no_load,
+                                            f"{profile.name} (0mA)", progress_callback)
+        if result.aborted:
+            return self._finish_profile(profile, result)
 
-                result.add_measurement(elapsed, voltage, current, 'with_load')
+        # ===== ETAP 2: Z OBCIĄŻENIEM =====
+        print(f"\n--- ETAP 2: Z OBCIĄŻENIEM ({profile.load_current_ma}mA) ---")
+        print(f"⚡ INSTANT skok na {profile.load_current_ma}mA...")
 
-                in_range = profile.is_in_range(voltage)
-                status_str = "✓ OK" if in_range else "✗ FAIL"
+        with self.profiler.phase('load_step'):
+            load_set = self.hardware.set_load(profile.load_current_ma, instant=True,
+                                              settle_delay=0 if adaptive else None)
+        if not load_set:
+            result.status = "LOAD_ERROR"
+            print(f"✗ Błąd ustawiania obciążenia")
+            return result
 
-                print(f"{elapsed:<10.2f} {voltage:<15.2f} {current:<12.3f} {status_str}")
+        self._settle(result, 'load', 0.05)
 
-                if progress_callback:
-                    progress_callback(
-                        elapsed=elapsed,
-                        voltage=voltage,
-                        current=current,
-                        profile_name=f"{profile.name} ({profile.load_current_ma}mA)",
-                        in_range=in_range
-                    )
+        result.aborted = self._sample_phase(profile, result, 'with_load', profile.test_duration_with_load,
+                                            f"{profile.name} ({profile.load_current_ma}mA)", progress_callback)
 
-            time.sleep(self.config.measurement_interval)
+        return self._finish_profile(profile, result)
 
+    def _finish_profile(self, profile: VoltageProfile, result: ProfileTestResult) -> ProfileTestResult:
+        """Ocena PASS/FAIL, statystyki i zdjęcie obciążenia po profilu"""
+        adaptive = self._adaptive_settle()
         result.finalize(profile.min_voltage, profile.max_voltage)
 
         # Statystyki
@@ -251,10 +320,21 @@ class TestRunner:
         print(f"  Min napięcie: {result.get_min_voltage():.2f}V")
         print(f"  Max napięcie: {result.get_max_voltage():.2f}V")
         print(f"  Średni prąd: {result.get_average_current():.3f}A")
+        print(f"  Odchylenie std: {result.get_std_voltage('no_load') * 1000:.1f}mV (0mA), "
+              f"{result.get_std_voltage('with_load') * 1000:.1f}mV (obciążenie)")
+        print(f"  Poza zakresem: {result.get_out_of_range_count('no_load')} (0mA), "
+              f"{result.get_out_of_range_count('with_load')} (obciążenie)")
+        for phase, stats in result.sampling_stats.items():
+            print(f"  Próbkowanie {phase}: {stats.achieved_rate:.1f}/{stats.requested_rate:.1f} próbek/s "
+                  f"(pominięte sloty: {stats.missed_slots}, błędy odczytu: {stats.failed_reads})")
+        print(f"  Stabilizacja: " + ", ".join(f"{k} {v:.3f}s" for k, v in result.settle_times.items()))
         print(f"  Wynik: {result.status}")
 
-        self.hardware.set_load(0, instant=True)
-        time.sleep(0.1)
+        # Zdjęcie obciążenia - w trybie adaptive następny etap i tak czeka na ustalenie
+        with self.profiler.phase('load_step'):
+            self.hardware.set_load(0, instant=True, settle_delay=0 if adaptive else None)
+            if not adaptive:
+                time.sleep(0.1)
 
         return result
 
@@ -262,11 +342,17 @@ class TestRunner:
             self,
             hrid: str,
             serial_number: str,
-            progress_callback=None
+            progress_callback=None,
+            profiler: CycleProfiler = None
     ) -> FullTestResult:
-        """Wykonaj pełny test wszystkich profili z TIMEOUT"""
+        """
+        Wykonaj pełny test wszystkich profili z TIMEOUT
+        profiler: rozkład czasu cyklu (np. z GUI, żeby doliczyć zapis i okna); None = nowy
+        """
+        self.profiler = profiler if profiler is not None else CycleProfiler()
         start_time = time.time()
         profile_results = {}
+        cancelled = False
 
         print("\n" + "=" * 60)
         print(f"START TESTU (timeout: {self.test_timeout}s)")
@@ -286,6 +372,18 @@ class TestRunner:
                 result = self.test_single_profile(profile, progress_callback)
                 profile_results[profile.name] = result
 
+                if self.config.fail_fast == "unit" and result.aborted:
+                    print(f"\n✗ FAIL-FAST: pomijam pozostałe profile")
+                    for skipped in profiles:
+                        if skipped.name not in profile_results:
+                            skipped_result = ProfileTestResult(
+                                profile_name=skipped.name,
+                                nominal_voltage=skipped.nominal
+                            )
+                            skipped_result.status = SKIPPED_FAIL_FAST
+                            profile_results[skipped.name] = skipped_result
+                    break
+
         except TimeoutException as e:
             print(f"\n✗ TIMEOUT: {e}")
             for profile in profiles:
@@ -299,6 +397,7 @@ class TestRunner:
 
         except KeyboardInterrupt:
             print(f"\n✗ Test przerwany przez użytkownika")
+            cancelled = True
             for profile in profiles:
                 if profile.name not in profile_results:
                     cancelled_result = ProfileTestResult(
@@ -326,7 +425,8 @@ class TestRunner:
             r.status == "PASS"
             for r in profile_results.values()
         )
-        final_status = "PASS" if all_pass else "FAIL"
+        # CANCELLED - przerwany Ctrl-C; wołający decyduje, czy taki wynik zapisać
+        final_status = "CANCELLED" if cancelled else "PASS" if all_pass else "FAIL"
 
         test_duration = time.time() - start_time
 
@@ -344,9 +444,14 @@ class TestRunner:
         print("RESET: Powrót na profil 5V, 0mA")
         print("=" * 60)
         try:
-            self.hardware.set_profile(1)
-            time.sleep(0.3)
-            self.hardware.set_load(0, instant=True)
+            with self.profiler.phase('reset'):
+                if self._adaptive_settle():
+                    self.hardware.set_profile(1, settle_delay=0)
+                    self.hardware.set_load(0, instant=True, settle_delay=0)
+                else:
+                    self.hardware.set_profile(1)
+                    time.sleep(0.3)
+                    self.hardware.set_load(0, instant=True)
         except Exception as e:
             print(f"⚠ Błąd resetu hardware: {e}")
 
@@ -361,6 +466,8 @@ class TestRunner:
                 print(f"⊗ {name}: CANCELLED")
             elif result.status == "ERROR":
                 print(f"✗ {name}: ERROR")
+            elif result.status == SKIPPED_FAIL_FAST:
+                print(f"⊘ {name}: POMINIĘTY (fail-fast)")
             else:
                 status_symbol = "✓" if result.status == "PASS" else "✗"
                 print(f"{status_symbol} {name}: {result.status} "
@@ -371,5 +478,6 @@ class TestRunner:
         print(f"Czas trwania: {test_duration:.2f}s")
         print("=" * 60 + "\n")
 
+        test_result.cycle_profile = self.profiler.breakdown()
         self.current_result = test_result
         return test_result
@@ -0,0 +1,63 @@
+# test_serial_index.py - Test limitu prób per numer seryjny przez create_database (bez testera)
+#
+# Uruchom:  python test_serial_index.py
+# Zapisuje wyniki w katalogu tymczasowym i sprawdza, że licznik rośnie zarówno
+# z plikiem indeksu, jak i z serial_index_path="" (licznik tylko w pamięci).
+import os
+import sys
+import tempfile
+
+from config import TestConfig
+from database import create_database, find_store
+from serial_index import SerialIndex
+from test_runner import FullTestResult
+
+
+def check(name: str, condition: bool) -> bool:
+    print(f"  {'✓' if condition else '✗'} {name}")
+    return condition
+
+
+def make_result(serial: str) -> FullTestResult:
+    return FullTestResult(timestamp="2026-10-17 12:00:00", hrid="TEST", serial_number=serial,
+                          profile_results={}, final_status="FAIL", test_duration=1.0)
+
+
+def count_after_saves(serial_index_path: str, saves: int) -> int:
+    config = TestConfig(serial_index_path=serial_index_path, waveform_archive_dir="")
+    database = create_database(config)
+    try:
+        for _ in range(saves):
+            database.save_result(make_result("SN001"), max_retries=1, retry_delay=0)
+        index = find_store(database, SerialIndex)
+        return index["SN001"] if index is not None else -1
+    finally:
+        database.close()
+
+
+def main() -> int:
+    print("=== TEST INDEKSU NUMERÓW SERYJNYCH ===\n")
+    cwd = os.getcwd()
+    results = []
+    # każdy scenariusz w osobnym katalogu - raporty z poprzedniego liczyłyby się do limitu
+    with tempfile.TemporaryDirectory() as memory_dir, tempfile.TemporaryDirectory() as file_dir:
+        try:
+            os.chdir(memory_dir)
+            results.append(check("serial_index_path=\"\": 2 zapisy -> 2 próby", count_after_saves("", 2) == 2))
+            results.append(check("serial_index_path=\"\": bez pliku indeksu",
+                                 not os.path.exists("serial_index.json")))
+
+            os.chdir(file_dir)
+            results.append(check("plik indeksu: 2 zapisy -> 2 próby",
+                                 count_after_saves("serial_index.json", 2) == 2))
+            results.append(check("plik indeksu: po restarcie 2 + 1",
+                                 count_after_saves("serial_index.json", 1) == 3))
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n{sum(results)}/{len(results)} OK")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# test_usbpd_api.py - Test transportu "api" na atrapie USBPDAPI (Linux, bez testera)
+#
+# Uruchom:  python test_usbpd_api.py
+# Buduje stubs/libusbpdapi.so z stubs/usbpdapi_stub.c (gcc) i przechodzi przez
+# PM125Interface te same kroki co test_pm125.py. Sprawdza tylko zastępcze ABI
+# z usbpd_api.py - nie zgodność z prawdziwą USBPDAPI.dll.
+import os
+import subprocess
+import sys
+
+from hardware_interface import PM125Interface
+from usbpd_api import USBPDApiTransport
+
+STUB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs")
+STUB_SOURCE = os.path.join(STUB_DIR, "usbpdapi_stub.c")
+STUB_LIBRARY = os.path.join(STUB_DIR, "libusbpdapi.so")
+
+
+def build_stub() -> str:
+    """Zbuduj atrapę, jeśli nie ma .so albo źródło jest nowsze"""
+    if not os.path.exists(STUB_LIBRARY) or os.path.getmtime(STUB_LIBRARY) < os.path.getmtime(STUB_SOURCE):
+        subprocess.run(["gcc", "-shared", "-fPIC", "-o", STUB_LIBRARY, STUB_SOURCE], check=True)
+    return STUB_LIBRARY
+
+
+def check(name: str, condition: bool) -> bool:
+    print(f"  {'✓' if condition else '✗'} {name}")
+    return condition
+
+
+def main() -> int:
+    print("=== TEST TRANSPORTU API (atrapa USBPDAPI) ===\n")
+    pm125 = PM125Interface(transport=USBPDApiTransport(build_stub(), "PMPD123456"))
+
+    results = [
+        check("serial urządzenia", pm125.get_device_info().get('serial') == "PMPD123456"),
+        check("status połączenia", pm125.get_connection_status()['connected']),
+        check("4 profile", [p['voltage_mv'] for p in pm125.get_available_profiles()] == [5000, 9000, 12000, 15000]),
+        check("zmiana profilu 9V", pm125.set_profile(2, settle_delay=0)),
+    ]
+
+    measurements = pm125.read_measurements()
+    results.append(check("odczyt 9V bez obciążenia",
+                         measurements is not None and abs(measurements['voltage'] - 9.0) < 0.01))
+
+    results.append(check("obciążenie 2000mA", pm125.set_load(2000, settle_delay=0)))
+    measurements = pm125.read_measurements()
+    results.append(check("prąd 2A, spadek 0.1V",
+                         measurements is not None and abs(measurements['current'] - 2.0) < 0.001
+                         and abs(measurements['voltage'] - 8.9) < 0.01))
+
+    results.append(check("odrzucenie profilu spoza zakresu", not pm125.transport.set_profile(9)))
+    results.append(check("wyszukiwanie urządzeń", len(pm125.find_all_devices()) > 0))
+
+    pm125.disconnect()
+    results.append(check("rozłączenie", not pm125.transport.test_connection()))
+
+    print(f"\n{sum(results)}/{len(results)} OK")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
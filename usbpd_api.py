@@ -0,0 +1,167 @@
+# usbpd_api.py - USBPDAPI w procesie przez ctypes (bez USBPDConsole.exe)
+import ctypes
+import os
+import sys
+import threading
+from typing import Optional, List, Dict
+
+from hardware_interface import PM125Transport
+
+# UWAGA: ABI ZASTĘPCZE. Poniższe nazwy i sygnatury NIE pochodzą z USBPDAPI.h PassMark -
+# implementuje je tylko atrapa stubs/usbpdapi_stub.c. Z prawdziwą USBPDAPI.dll transport
+# "api" nie zadziała, dopóki SIGNATURES nie zostaną przepisane wg nagłówka producenta
+# (wtedy _bind zgłasza brakujące eksporty). Na linii produkcyjnej: transport "console".
+#
+# Funkcje biblioteki (konwencja cdecl, 0 = OK, <0 = błąd):
+#   void* USBPD_Open(const char* serial)            - "Any" = pierwsze urządzenie, NULL = błąd
+#   void  USBPD_Close(void* handle)
+#   int   USBPD_IsConnected(void* handle)           - 1 = połączony
+#   int   USBPD_SetProfile(void* handle, int index)
+#   int   USBPD_SetLoad(void* handle, int current_ma, int instant)
+#   int   USBPD_ReadMeasurements(void* handle, int* voltage_mv, int* current_ma)
+#   int   USBPD_GetStatus(void* handle, int* set_voltage_mv, int* max_current_ma)
+#   int   USBPD_GetSerial(void* handle, char* buffer, int size)
+#   int   USBPD_GetProfileCount(void* handle)
+#   int   USBPD_GetProfile(void* handle, int index, int* voltage_mv, int* current_ma)
+#   int   USBPD_FindDevices(char* buffer, int size) - seriale rozdzielone przecinkami, zwraca liczbę
+
+if sys.platform == 'win32':
+    DEFAULT_LIBRARY_NAME = "USBPDAPI.dll"
+else:
+    DEFAULT_LIBRARY_NAME = "libusbpdapi.so"
+
+
+_HANDLE = ctypes.c_void_p
+_INT_P = ctypes.POINTER(ctypes.c_int)
+
+# Zastępcze ABI (patrz nagłówek modułu): nazwa -> (argtypes, restype)
+SIGNATURES = {
+    'USBPD_Open': ([ctypes.c_char_p], _HANDLE),
+    'USBPD_Close': ([_HANDLE], None),
+    'USBPD_IsConnected': ([_HANDLE], ctypes.c_int),
+    'USBPD_SetProfile': ([_HANDLE, ctypes.c_int], ctypes.c_int),
+    'USBPD_SetLoad': ([_HANDLE, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'USBPD_ReadMeasurements': ([_HANDLE, _INT_P, _INT_P], ctypes.c_int),
+    'USBPD_GetStatus': ([_HANDLE, _INT_P, _INT_P], ctypes.c_int),
+    'USBPD_GetSerial': ([_HANDLE, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
+    'USBPD_GetProfileCount': ([_HANDLE], ctypes.c_int),
+    'USBPD_GetProfile': ([_HANDLE, ctypes.c_int, _INT_P, _INT_P], ctypes.c_int),
+    'USBPD_FindDevices': ([ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
+}
+
+
+def default_library_path(console_path: str) -> str:
+    """Biblioteka USBPDAPI leży w katalogu obok USBPDConsole.exe"""
+    return os.path.join(os.path.dirname(console_path), DEFAULT_LIBRARY_NAME)
+
+
+class USBPDApiTransport(PM125Transport):
+    """Transport wywołujący USBPDAPI bezpośrednio - bez procesu i parsowania tekstu"""
+
+    def __init__(self, library_path: str, device_serial: str = "Any"):
+        if not os.path.exists(library_path):
+            raise FileNotFoundError(f"Nie znaleziono biblioteki USBPDAPI: {library_path}")
+
+        self.library_path = library_path
+        self.device_serial = device_serial
+        self._lock = threading.Lock()
+        self._lib = ctypes.CDLL(library_path)
+        self._bind()
+
+        self._handle = self._lib.USBPD_Open(device_serial.encode('ascii'))
+        if not self._handle:
+            raise ConnectionError(f"USBPD_Open nie otworzył urządzenia: {device_serial}")
+
+    def _bind(self):
+        """Ustaw sygnatury funkcji - bez tego ctypes obetnie wskaźniki do int"""
+        missing = [name for name in SIGNATURES if not hasattr(self._lib, name)]
+        if missing:
+            raise OSError(
+                f"{self.library_path} nie eksportuje {', '.join(missing)}.\n"
+                f"usbpd_api.py używa zastępczego ABI (stubs/usbpdapi_stub.c) - "
+                f"uzupełnij SIGNATURES wg USBPDAPI.h albo użyj transportu 'console'"
+            )
+        for name, (argtypes, restype) in SIGNATURES.items():
+            func = getattr(self._lib, name)
+            func.argtypes = argtypes
+            func.restype = restype
+
+    def _call(self, name: str, *args) -> Optional[int]:
+        """Wywołaj funkcję API pod lockiem; None jeśli urządzenie zamknięte"""
+        with self._lock:
+            if not self._handle:
+                return None
+            return getattr(self._lib, name)(self._handle, *args)
+
+    def test_connection(self) -> bool:
+        return self._call('USBPD_IsConnected') == 1
+
+    def set_profile(self, profile_index: int) -> bool:
+        return self._call('USBPD_SetProfile', profile_index) == 0
+
+    def set_load(self, current_ma: int, instant: bool = True) -> bool:
+        return self._call('USBPD_SetLoad', current_ma, 1 if instant else 0) == 0
+
+    def read_measurements(self) -> Optional[Dict[str, float]]:
+        voltage_mv = ctypes.c_int()
+        current_ma = ctypes.c_int()
+        if self._call('USBPD_ReadMeasurements', ctypes.byref(voltage_mv), ctypes.byref(current_ma)) != 0:
+            return None
+        return {
+            'voltage': voltage_mv.value / 1000.0,
+            'current': current_ma.value / 1000.0
+        }
+
+    def get_device_info(self) -> Dict[str, str]:
+        info = {'serial': self.device_serial}
+        buffer = ctypes.create_string_buffer(64)
+        if self._call('USBPD_GetSerial', buffer, len(buffer)) == 0:
+            info['serial'] = buffer.value.decode('ascii', errors='replace')
+        return info
+
+    def get_connection_status(self) -> Dict[str, any]:
+        if not self.test_connection():
+            return {'connected': False}
+
+        status = {'connected': True}
+        set_voltage_mv = ctypes.c_int()
+        max_current_ma = ctypes.c_int()
+        if self._call('USBPD_GetStatus', ctypes.byref(set_voltage_mv), ctypes.byref(max_current_ma)) == 0:
+            status['set_voltage_mv'] = set_voltage_mv.value
+            status['set_voltage_v'] = set_voltage_mv.value / 1000.0
+            status['max_current_ma'] = max_current_ma.value
+            status['max_current_a'] = max_current_ma.value / 1000.0
+        return status
+
+    def get_available_profiles(self) -> List[Dict[str, any]]:
+        count = self._call('USBPD_GetProfileCount')
+        if not count or count < 0:
+            print("Błąd pobierania profili")
+            return []
+
+        profiles = []
+        for idx in range(1, count + 1):
+            voltage_mv = ctypes.c_int()
+            current_ma = ctypes.c_int()
+            if self._call('USBPD_GetProfile', idx, ctypes.byref(voltage_mv), ctypes.byref(current_ma)) == 0:
+                profiles.append({
+                    'index': idx,
+                    'voltage_mv': voltage_mv.value,
+                    'current_ma': current_ma.value,
+                    'type': 'FIXED'
+                })
+        return profiles
+
+    def find_all_devices(self) -> List[str]:
+        buffer = ctypes.create_string_buffer(1024)
+        with self._lock:
+            count = self._lib.USBPD_FindDevices(buffer, len(buffer))
+        if count <= 0:
+            return []
+        return [s for s in buffer.value.decode('ascii', errors='replace').split(',') if s]
+
+    def close(self):
+        with self._lock:
+            if self._handle:
+                self._lib.USBPD_Close(self._handle)
+                self._handle = None
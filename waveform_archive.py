@@ -0,0 +1,159 @@
+# waveform_archive.py - archiwum surowych próbek (float32, kolumnowo, z indeksem)
+import json
+import os
+import struct
+import threading
+import logging
+from array import array
+from datetime import datetime
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # numpy opcjonalny - odczyt przez array.fromfile
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Nagłówek pliku danych: magic, wersja, liczba kolumn, rozmiar wartości [B]
+MAGIC = b"PM125WF\0"
+HEADER = struct.Struct("<8sHHI")
+VERSION = 1
+COLUMNS = ('time', 'voltage', 'current')
+VALUE_SIZE = 4  # float32
+
+PHASES = (('no_load', 'measurements_no_load'), ('with_load', 'measurements_with_load'))
+
+
+class WaveformArchive:
+    """
+    Dzienne archiwum przebiegów: waveforms_YYYYMMDD.bin + waveforms_YYYYMMDD.idx
+
+    .bin - nagłówek, potem segmenty; segment = jeden etap profilu zapisany
+           kolumnowo: count x float32 czasu, count x float32 napięcia, count x float32 prądu
+    .idx - JSON lines, jedna linia na jednostkę: serial, timestamp, HRID, wynik
+           i lista segmentów (profil, etap, offset w bajtach, count)
+
+    Odczyt jednostki czyta tylko indeks i jej segmenty (np.memmap),
+    nie cały plik dnia.
+    """
+
+    def __init__(self, directory: str = "waveforms"):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, day: str):
+        base = os.path.join(self.directory, f"waveforms_{day}")
+        return base + ".bin", base + ".idx"
+
+    @staticmethod
+    def _day(timestamp: str) -> str:
+        try:
+            return datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%Y%m%d")
+        except (TypeError, ValueError):
+            return datetime.now().strftime("%Y%m%d")
+
+    def append(self, test_result) -> bool:
+        """Dopisz wszystkie próbki jednostki (FullTestResult); False przy błędzie zapisu"""
+        bin_path, idx_path = self._paths(self._day(test_result.timestamp))
+
+        try:
+            with self._lock:
+                with open(bin_path, 'ab') as f:
+                    if f.tell() == 0:
+                        f.write(HEADER.pack(MAGIC, VERSION, len(COLUMNS), VALUE_SIZE))
+
+                    segments = []
+                    for profile_name, result in test_result.profile_results.items():
+                        for phase, attribute in PHASES:
+                            buffer = getattr(result, attribute)
+                            if not len(buffer):
+                                continue
+                            segments.append({'profile': profile_name, 'phase': phase,
+                                             'offset': f.tell(), 'count': len(buffer)})
+                            for column in COLUMNS:
+                                f.write(array('f', getattr(buffer, column)).tobytes())
+
+                entry = {
+                    'serial': test_result.serial_number,
+                    'timestamp': test_result.timestamp,
+                    'hrid': test_result.hrid,
+                    'final_status': test_result.final_status,
+                    'segments': segments
+                }
+                # indeks po danych - przerwany zapis zostawia tylko nieużywane bajty w .bin
+                with open(idx_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            return True
+
+        except Exception as e:
+            logger.error(f"Błąd zapisu archiwum przebiegów {bin_path}: {e}", exc_info=True)
+            return False
+
+    def save_result(self, test_result, max_retries: int = 3, retry_delay: float = 1.0) -> bool:
+        """Interfejs magazynu wyników (MultiDatabase)"""
+        return self.append(test_result)
+
+    def close(self):
+        pass
+
+    def days(self) -> List[str]:
+        """Dni (YYYYMMDD) obecne w archiwum"""
+        return sorted(name[len("waveforms_"):-len(".idx")] for name in os.listdir(self.directory)
+                      if name.startswith("waveforms_") and name.endswith(".idx"))
+
+    def index(self, day: str) -> List[dict]:
+        """Wszystkie wpisy indeksu z danego dnia"""
+        _, idx_path = self._paths(day)
+        entries = []
+        try:
+            with open(idx_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entries.append(json.loads(line))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def find(self, serial: str, day: str = None) -> List[dict]:
+        """Wpisy jednostki (z dniem w polu 'day'); day=None - wszystkie dni"""
+        found = []
+        for d in ([day] if day else self.days()):
+            for entry in self.index(d):
+                if entry['serial'] == serial:
+                    entry['day'] = d
+                    found.append(entry)
+        return found
+
+    def load(self, entry: dict) -> Dict[str, Dict[str, Dict[str, "np.ndarray"]]]:
+        """
+        Próbki jednostki: {profil: {etap: {'time','voltage','current'}}}
+        Z numpy kolumny są widokami np.memmap (bez wczytywania pliku), bez numpy - array('f')
+        """
+        bin_path, _ = self._paths(entry.get('day') or self._day(entry['timestamp']))
+        self._check_header(bin_path)
+
+        waveforms = {}
+        for segment in entry['segments']:
+            offset, count = segment['offset'], segment['count']
+            if np is not None:
+                block = np.memmap(bin_path, dtype='<f4', mode='r', offset=offset, shape=(len(COLUMNS), count))
+                columns = dict(zip(COLUMNS, block))
+            else:
+                columns = {}
+                with open(bin_path, 'rb') as f:
+                    f.seek(offset)
+                    for column in COLUMNS:
+                        values = array('f')
+                        values.fromfile(f, count)
+                        columns[column] = values
+            waveforms.setdefault(segment['profile'], {})[segment['phase']] = columns
+        return waveforms
+
+    @staticmethod
+    def _check_header(bin_path: str):
+        with open(bin_path, 'rb') as f:
+            magic, version, columns, value_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or columns != len(COLUMNS) or value_size != VALUE_SIZE:
+            raise ValueError(f"Nieobsługiwany format archiwum: {bin_path}")